@@ -96,6 +96,9 @@ from numba.np.ufunc import (vectorize, guvectorize, threading_layer,
 # Re-export Numpy helpers
 from numba.np.numpy_support import carray, farray, from_dtype
 
+# Call counters of instrumented functions
+from numba.misc.instrumentation import runtime_stats
+
 # Re-export experimental
 from numba import experimental
 
@@ -139,6 +142,7 @@ __all__ = """
     set_parallel_chunksize
     get_parallel_chunksize
     parallel_chunksize
+    runtime_stats
     """.split() + types.__all__ + errors.__all__
 
 
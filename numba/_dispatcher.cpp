@@ -384,6 +384,7 @@ else                                                            \
 
 typedef std::vector<Type> TypeTable;
 typedef std::vector<PyObject*> Functions;
+typedef std::vector<unsigned long long> UseTable;
 
 /* The Dispatcher class is the base class of all dispatchers in the CPU and
    CUDA targets. Its main responsibilities are:
@@ -426,6 +427,10 @@ public:
     /* A flattened array of argument types to all overloads
      * (invariant: sizeof(overloads) == argct * sizeof(functions)) */
     TypeTable overloads;
+    /* The value of use_clock when each overload was last selected
+       (used for least recently used eviction of overloads) */
+    mutable UseTable last_used;
+    mutable unsigned long long use_clock;
 
     /* Add a new overload. Parameters:
 
@@ -437,6 +442,18 @@ public:
             overloads.push_back(args[i]);
         }
         functions.push_back(callable);
+        last_used.push_back(++use_clock);
+    }
+
+    /* Remove the overload at the given index */
+    void removeDefinition(int index) {
+        if (functions[index] == fallbackdef) {
+            fallbackdef = NULL;
+        }
+        functions.erase(functions.begin() + index);
+        last_used.erase(last_used.begin() + index);
+        overloads.erase(overloads.begin() + index * argct,
+                        overloads.begin() + (index + 1) * argct);
     }
 
     /* Given a list of types, find the overloads that have a matching signature.
@@ -472,6 +489,7 @@ public:
                                          exact_match_required);
         }
         if (matches == 1) {
+            last_used[selected] = ++use_clock;
             return functions[selected];
         }
         return NULL;
@@ -481,6 +499,7 @@ public:
     void clear() {
         functions.clear();
         overloads.clear();
+        last_used.clear();
     }
 
 };
@@ -543,6 +562,40 @@ Dispatcher_clear(Dispatcher *self, PyObject *args)
     Py_RETURN_NONE;
 }
 
+static PyObject *
+Dispatcher_remove(Dispatcher *self, PyObject *args)
+{
+    int index;
+    if (!PyArg_ParseTuple(args, "i", &index)) {
+        return NULL;
+    }
+    if (index < 0 || index >= (int) self->functions.size()) {
+        PyErr_SetString(PyExc_IndexError, "overload index out of range");
+        return NULL;
+    }
+    self->removeDefinition(index);
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+Dispatcher_last_used(Dispatcher *self, PyObject *args)
+{
+    Py_ssize_t i, n = self->last_used.size();
+    PyObject *res = PyList_New(n);
+    if (res == NULL) {
+        return NULL;
+    }
+    for (i = 0; i < n; ++i) {
+        PyObject *tick = PyLong_FromUnsignedLongLong(self->last_used[i]);
+        if (tick == NULL) {
+            Py_DECREF(res);
+            return NULL;
+        }
+        PyList_SET_ITEM(res, i, tick);
+    }
+    return res;
+}
+
 static
 PyObject*
 Dispatcher_Insert(Dispatcher *self, PyObject *args, PyObject *kwds)
@@ -1526,6 +1579,10 @@ import_devicearray(void)
 
 static PyMethodDef Dispatcher_methods[] = {
     { "_clear", (PyCFunction)Dispatcher_clear, METH_NOARGS, NULL },
+    { "_remove", (PyCFunction)Dispatcher_remove, METH_VARARGS,
+      "remove the definition at the given index"},
+    { "_last_used", (PyCFunction)Dispatcher_last_used, METH_NOARGS,
+      "the use clock value of the last selection of each definition"},
     { "_insert", (PyCFunction)Dispatcher_Insert, METH_VARARGS | METH_KEYWORDS,
       "insert new definition"},
     { "_cuda_call", (PyCFunction)Dispatcher_cuda_call,
@@ -22,6 +22,9 @@ Include C-extension here
 /* Numba C helpers */
 #include "_helperlib.c"
 
+/* Line profiler sampling */
+#include "_lineprof.c"
+
 static PyObject *
 build_c_helpers_dict(void)
 {
@@ -43,6 +46,9 @@ build_c_helpers_dict(void)
 
 #define declpointer(ptr) _declpointer(#ptr, &numba_##ptr)
 
+    _declpointer("line_profiler_current",
+                 (void *) &numba_line_profiler_current);
+
     declmethod(fixed_fmod);
     declmethod(fixed_fmodf);
     declmethod(set_fnclex);
@@ -195,6 +201,9 @@ static PyMethodDef ext_methods[] = {
     { "rnd_seed", (PyCFunction) _numba_rnd_seed, METH_VARARGS, NULL },
     { "rnd_set_state", (PyCFunction) _numba_rnd_set_state, METH_VARARGS, NULL },
     { "rnd_shuffle", (PyCFunction) _numba_rnd_shuffle, METH_O, NULL },
+    { "line_profiler_start", (PyCFunction) _numba_line_profiler_start, METH_VARARGS, NULL },
+    { "line_profiler_stop", (PyCFunction) _numba_line_profiler_stop, METH_NOARGS, NULL },
+    { "line_profiler_results", (PyCFunction) _numba_line_profiler_results, METH_NOARGS, NULL },
     { "_import_cython_function", (PyCFunction) _numba_import_cython_function, METH_VARARGS, NULL },
     { NULL },
 };
@@ -0,0 +1,179 @@
+/*
+ * Sampling support for the line profiler (numba.misc.line_profiler).
+ *
+ * Functions compiled with the ``line_profile`` option store an identifier
+ * of the source line they are executing into ``numba_line_profiler_current``
+ * (zero meaning "not in profiled code").  While sampling is active, a
+ * SIGPROF handler driven by an ITIMER_PROF timer reads that slot and
+ * bumps the matching counter of a fixed-size open addressing table.  The
+ * handler only touches preallocated memory, so it is async-signal-safe.
+ */
+
+#ifndef _WIN32
+#include <signal.h>
+#include <string.h>
+#include <sys/time.h>
+#endif
+
+#define LINEPROF_TABLE_SIZE 8192  /* must be a power of two */
+
+/* The line currently executing in profiled code */
+volatile int64_t numba_line_profiler_current = 0;
+
+#ifndef _WIN32
+
+static volatile int64_t lineprof_keys[LINEPROF_TABLE_SIZE];
+static volatile int64_t lineprof_counts[LINEPROF_TABLE_SIZE];
+/* Samples taken outside of profiled code, and samples that could not be
+   recorded because the table was full */
+static volatile int64_t lineprof_idle = 0;
+static volatile int64_t lineprof_dropped = 0;
+static int lineprof_running = 0;
+static struct sigaction lineprof_old_action;
+
+static void
+lineprof_handler(int signum)
+{
+    int64_t key = numba_line_profiler_current;
+    uint64_t i, probe;
+    (void) signum;
+    if (key == 0) {
+        lineprof_idle++;
+        return;
+    }
+    i = ((uint64_t) key * 0x9E3779B97F4A7C15ULL) >> 51;
+    for (probe = 0; probe < LINEPROF_TABLE_SIZE; probe++) {
+        uint64_t slot = (i + probe) & (LINEPROF_TABLE_SIZE - 1);
+        if (lineprof_keys[slot] == key) {
+            lineprof_counts[slot]++;
+            return;
+        }
+        if (lineprof_keys[slot] == 0) {
+            lineprof_keys[slot] = key;
+            lineprof_counts[slot] = 1;
+            return;
+        }
+    }
+    lineprof_dropped++;
+}
+
+static void
+lineprof_clear(void)
+{
+    memset((void *) lineprof_keys, 0, sizeof(lineprof_keys));
+    memset((void *) lineprof_counts, 0, sizeof(lineprof_counts));
+    lineprof_idle = 0;
+    lineprof_dropped = 0;
+}
+
+static PyObject *
+_numba_line_profiler_start(PyObject *self, PyObject *args)
+{
+    long interval_us;
+    struct sigaction action;
+    struct itimerval timer;
+
+    if (!PyArg_ParseTuple(args, "l:line_profiler_start", &interval_us))
+        return NULL;
+    if (interval_us <= 0) {
+        PyErr_SetString(PyExc_ValueError, "sampling interval must be positive");
+        return NULL;
+    }
+    if (lineprof_running) {
+        PyErr_SetString(PyExc_RuntimeError, "line profiler already running");
+        return NULL;
+    }
+    lineprof_clear();
+
+    memset(&action, 0, sizeof(action));
+    action.sa_handler = lineprof_handler;
+    action.sa_flags = SA_RESTART;
+    sigemptyset(&action.sa_mask);
+    if (sigaction(SIGPROF, &action, &lineprof_old_action))
+        return PyErr_SetFromErrno(PyExc_OSError);
+
+    timer.it_interval.tv_sec = interval_us / 1000000;
+    timer.it_interval.tv_usec = interval_us % 1000000;
+    timer.it_value = timer.it_interval;
+    if (setitimer(ITIMER_PROF, &timer, NULL)) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        sigaction(SIGPROF, &lineprof_old_action, NULL);
+        return NULL;
+    }
+    lineprof_running = 1;
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+_numba_line_profiler_stop(PyObject *self, PyObject *args)
+{
+    struct itimerval timer;
+
+    if (!lineprof_running)
+        Py_RETURN_NONE;
+    memset(&timer, 0, sizeof(timer));
+    setitimer(ITIMER_PROF, &timer, NULL);
+    sigaction(SIGPROF, &lineprof_old_action, NULL);
+    lineprof_running = 0;
+    Py_RETURN_NONE;
+}
+
+/*
+ * Return a tuple (counts, idle, dropped) where *counts* is a dict mapping
+ * line identifiers to their number of samples.
+ */
+static PyObject *
+_numba_line_profiler_results(PyObject *self, PyObject *args)
+{
+    Py_ssize_t i;
+    PyObject *counts = PyDict_New();
+    if (counts == NULL)
+        return NULL;
+    for (i = 0; i < LINEPROF_TABLE_SIZE; i++) {
+        PyObject *key, *value;
+        int err;
+        if (lineprof_keys[i] == 0)
+            continue;
+        key = PyLong_FromLongLong(lineprof_keys[i]);
+        value = PyLong_FromLongLong(lineprof_counts[i]);
+        if (key == NULL || value == NULL) {
+            Py_XDECREF(key);
+            Py_XDECREF(value);
+            Py_DECREF(counts);
+            return NULL;
+        }
+        err = PyDict_SetItem(counts, key, value);
+        Py_DECREF(key);
+        Py_DECREF(value);
+        if (err) {
+            Py_DECREF(counts);
+            return NULL;
+        }
+    }
+    return Py_BuildValue("NLL", counts, (long long) lineprof_idle,
+                         (long long) lineprof_dropped);
+}
+
+#else  /* _WIN32 */
+
+static PyObject *
+_numba_line_profiler_start(PyObject *self, PyObject *args)
+{
+    PyErr_SetString(PyExc_NotImplementedError,
+                    "the line profiler is not supported on Windows");
+    return NULL;
+}
+
+static PyObject *
+_numba_line_profiler_stop(PyObject *self, PyObject *args)
+{
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+_numba_line_profiler_results(PyObject *self, PyObject *args)
+{
+    return Py_BuildValue("NLL", PyDict_New(), 0LL, 0LL);
+}
+
+#endif  /* _WIN32 */
@@ -198,6 +198,21 @@ class BaseContext(object):
     def enable_boundscheck(self, value):
         self._boundscheck = value
 
+    # An i1 value telling that the indices of the array access being
+    # lowered were checked before the enclosing loops, see
+    # numba.np.boundscheck_hoisting
+    boundscheck_guard = None
+
+    # Whether negative array indices are wrapped around
+    enable_wraparound = True
+
+    # Whether integer division and modulo follow C semantics
+    cdivision = False
+
+    # Whether the functions that cannot raise get a variant returning their
+    # value directly, which is then called instead of them
+    enable_nounwind_variants = False
+
     # NRT
     enable_nrt = False
 
@@ -420,6 +435,35 @@ class BaseContext(object):
             fn.attributes.discard('optnone')
         return fn
 
+    def declare_nounwind_variant(self, module, fndesc):
+        """
+        Declare the variant of the function *fndesc* returning its value
+        directly, see create_nounwind_variant().
+        """
+        arginfo = self.get_arg_packer(fndesc.argtypes)
+        fnty = llvmir.FunctionType(self.get_value_type(fndesc.restype),
+                                   arginfo.argument_types)
+        return cgutils.get_or_insert_function(
+            module, fnty, fndesc.llvm_nounwind_func_name)
+
+    def create_nounwind_variant(self, module, fndesc):
+        """
+        Define in *module* the variant of the function *fndesc*, which cannot
+        raise, taking its arguments and returning its value directly.  Unlike
+        the function, it needs neither a return value pointer nor a status
+        check from its callers.
+        """
+        fn = self.declare_function(module, fndesc)
+        variant = self.declare_nounwind_variant(module, fndesc)
+        variant.attributes.add('nounwind')
+        builder = llvmir.IRBuilder(variant.append_basic_block('entry'))
+        arginfo = self.get_arg_packer(fndesc.argtypes)
+        args = arginfo.from_arguments(builder, variant.args)
+        _, retval = self.call_conv.call_function(
+            builder, fn, fndesc.restype, fndesc.argtypes, args)
+        builder.ret(retval)
+        return variant
+
     def declare_external_function(self, module, fndesc):
         fnty = self.get_external_function_type(fndesc)
         fn = cgutils.get_or_insert_function(module, fnty, fndesc.mangled_name)
@@ -1115,8 +1159,7 @@ class BaseContext(object):
         """
         Get preferred array alignment for Numba type *ty*.
         """
-        # AVX prefers 32-byte alignment
-        return 32
+        return config.ARRAY_ALIGNMENT
 
     def post_lowering(self, mod, library):
         """Run target specific post-lowering transformation here.
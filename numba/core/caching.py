@@ -538,6 +538,12 @@ class IndexDataCacheFile(object):
             # File could have been removed while the index still refers it.
             return
 
+    def keys(self):
+        """
+        Return the keys of the cache entries.
+        """
+        return list(self._load_index())
+
     def _load_index(self):
         """
         Load the cache index and return it as a dictionary (possibly
@@ -684,12 +690,36 @@ class Cache(_Cache):
     def _load_overload(self, sig, target_context):
         if not self._enabled:
             return
-        key = self._index_key(sig, target_context.codegen())
+        codegen = target_context.codegen()
+        key = self._index_key(sig, codegen)
         data = self._cache_file.load(key)
+        if data is None:
+            # Fall back to portable code compiled for another CPU model
+            key = self._select_portable_key(key, codegen)
+            if key is not None:
+                data = self._cache_file.load(key)
         if data is not None:
             data = self._impl.rebuild(target_context, data)
         return data
 
+    def _select_portable_key(self, key, codegen):
+        """
+        Select the entry for the same signature and function as *key*,
+        compiled for the portable CPU model that uses the most features
+        supported by *codegen*.  None is returned if there isn't any.
+        """
+        sig, _, hashes = key
+        best_level, best_key = -1, None
+        for other in self._cache_file.keys():
+            if other[0] != sig or other[2] != hashes:
+                continue
+            level = codegen.portable_code_level(other[1])
+            if level is not None and level > best_level:
+                best_level, best_key = level, other
+        if best_key is not None:
+            _cache_log("[cache] using code compiled for %r", best_key[1])
+        return best_key
+
     def save_overload(self, sig, data):
         """
         Save the data for the given signature in the cache.
@@ -11,6 +11,7 @@ from llvmlite import ir
 
 from numba.core import types, cgutils, errors
 from numba.core.base import PYOBJECT, GENERIC_POINTER
+from numba.core.cpu_options import NoAliasOptions
 
 
 TryStatus = namedtuple('TryStatus', ['in_try', 'excinfo'])
@@ -98,6 +99,20 @@ class BaseCallConv(object):
     def return_stop_iteration(self, builder):
         self._return_errcode_raw(builder, RETCODE_STOPIT)
 
+    def is_nounwind(self, func):
+        """
+        Return whether the LLVM function *func*, following this calling
+        convention, always returns RETCODE_OK, i.e. it cannot raise.
+        """
+        for block in func.blocks:
+            term = block.terminator
+            if isinstance(term, ir.Ret):
+                code = term.return_value
+                if not (isinstance(code, ir.Constant)
+                        and code.constant == RETCODE_OK.constant):
+                    return False
+        return True
+
     def get_return_type(self, ty):
         """
         Get the actual type of the return argument for Numba type *ty*.
@@ -830,11 +845,15 @@ class CPUCallConv(BaseCallConv):
         excarg.add_attribute("noalias")
 
         if noalias:
-            args = self.get_arguments(fn)
-            for a in args:
-                if isinstance(a.type, ir.PointerType):
-                    a.add_attribute("nocapture")
-                    a.add_attribute("noalias")
+            # Mark the data pointers of the array arguments, their other
+            # pointers (meminfo, parent) may be shared by views of an array
+            noalias = NoAliasOptions(noalias)
+            dmm = self.context.data_model_manager
+            valtree = arginfo.unflatten_arguments(self.get_arguments(fn))
+            for name, ty, aval in zip(args, fe_argtypes, valtree):
+                if isinstance(ty, types.Array) and noalias.applies_to(name):
+                    data = aval[dmm[ty].get_field_position('data')]
+                    data.add_attribute("noalias")
 
         # Add metadata to mark functions that may need NRT
         # thus disabling aggressive refct pruning in removerefctpass.py
@@ -457,6 +457,15 @@ def is_not_null(builder, val):
     return builder.icmp_unsigned('!=', null, val)
 
 
+def assume_aligned(builder, ptr, align):
+    """
+    Tell LLVM that pointer *ptr* is aligned to *align* bytes, a power of two.
+    """
+    misalign = builder.and_(builder.ptrtoint(ptr, intp_t),
+                            intp_t(align - 1))
+    builder.assume(builder.icmp_unsigned('==', misalign, intp_t(0)))
+
+
 def if_unlikely(builder, pred):
     return builder.if_then(pred, likely=False)
 
@@ -698,9 +707,33 @@ def get_item_pointer(context, builder, aryty, ary, inds, wraparound=False,
     # actual boundschecking based on the user config.
     shapes = unpack_tuple(builder, ary.shape, count=aryty.ndim)
     strides = unpack_tuple(builder, ary.strides, count=aryty.ndim)
+    item_strides = get_item_strides(context, builder, aryty, strides)
+    if item_strides is not None:
+        strides = item_strides
     return get_item_pointer2(context, builder, data=ary.data, shape=shapes,
                              strides=strides, layout=aryty.layout, inds=inds,
-                             wraparound=wraparound, boundscheck=boundscheck)
+                             wraparound=wraparound, boundscheck=boundscheck,
+                             itemstrides=item_strides is not None)
+
+
+def get_item_strides(context, builder, aryty, strides):
+    """
+    Convert the byte *strides* of a non-contiguous array of type *aryty* to
+    strides in items.  None is returned if they are not known to be
+    multiples of the item size.
+
+    Indexing in items rather than in bytes lets LLVM version the loops over
+    such arrays for unit strides and vectorize the contiguous version.
+    """
+    if aryty.layout != 'A' or not getattr(aryty, 'aligned', False):
+        return None
+    # The strides of an aligned array are multiples of the alignment of
+    # its items
+    itemty = context.get_data_type(aryty.dtype)
+    itemsize = context.get_abi_sizeof(itemty)
+    if itemsize != context.get_abi_alignment(itemty):
+        return None
+    return [builder.sdiv(s, s.type(itemsize)) for s in strides]
 
 
 def do_boundscheck(context, builder, ind, dimlen, axis=None):
@@ -721,23 +754,27 @@ def do_boundscheck(context, builder, ind, dimlen, axis=None):
                    ind, dimlen)
 
     msg = "index is out of bounds"
-    out_of_bounds_upper = builder.icmp_signed('>=', ind, dimlen)
-    with if_unlikely(builder, out_of_bounds_upper):
-        if config.FULL_TRACEBACKS:
-            _dbg()
-        context.call_conv.return_user_exc(builder, IndexError, (msg,))
-    out_of_bounds_lower = builder.icmp_signed('<', ind, ind.type(0))
-    with if_unlikely(builder, out_of_bounds_lower):
+    # As the extent is non-negative, an unsigned comparison also catches
+    # the negative indices
+    out_of_bounds = builder.icmp_unsigned('>=', ind, dimlen)
+    guard = context.boundscheck_guard
+    # The guard only applies to the function being lowered, not to the
+    # functions compiled while lowering the array access
+    if guard is not None and guard.function is builder.function:
+        out_of_bounds = builder.and_(builder.not_(guard), out_of_bounds)
+    with if_unlikely(builder, out_of_bounds):
         if config.FULL_TRACEBACKS:
             _dbg()
         context.call_conv.return_user_exc(builder, IndexError, (msg,))
 
 
 def get_item_pointer2(context, builder, data, shape, strides, layout, inds,
-                      wraparound=False, boundscheck=False):
+                      wraparound=False, boundscheck=False, itemstrides=False):
     # Set boundscheck=True for any pointer access that should be
     # boundschecked. do_boundscheck() will handle enabling or disabling the
     # actual boundschecking based on the user config.
+    # Set itemstrides=True if the strides are given in items rather than in
+    # bytes.
     if wraparound:
         # Wraparound
         indices = []
@@ -788,12 +825,14 @@ def get_item_pointer2(context, builder, data, shape, strides, layout, inds,
         # Any layout
         dimoffs = [builder.mul(s, i) for s, i in zip(strides, indices)]
         offset = functools.reduce(builder.add, dimoffs)
+        if itemstrides:
+            return builder.gep(data, [offset])
         return pointer_add(builder, data, offset)
 
 
 def _scalar_pred_against_zero(builder, value, fpred, icond):
     nullval = value.type(0)
-    if isinstance(value.type, (ir.FloatType, ir.DoubleType)):
+    if isinstance(value.type, (ir.HalfType, ir.FloatType, ir.DoubleType)):
         isnull = fpred(value, nullval)
     elif isinstance(value.type, ir.IntType):
         isnull = builder.icmp_signed(icond, value, nullval)
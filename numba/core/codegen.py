@@ -13,11 +13,13 @@ from abc import abstractmethod, ABCMeta
 from numba.core import utils, config, cgutils
 from numba.core.llvm_bindings import create_pass_manager_builder
 from numba.core.runtime.nrtopt import remove_redundant_nrt_refct
+from numba.core.vectormath import use_vector_math
 from numba.core.runtime import rtsys
 from numba.core.compiler_lock import require_global_compiler_lock
 from numba.core.errors import NumbaInvalidConfigWarning
 from numba.misc.inspection import disassemble_elf_to_cfg
 from numba.misc.llvm_pass_timings import PassTimingsCollection
+from numba.misc import perf_map
 
 
 _x86arch = frozenset(['x86', 'i386', 'i486', 'i586', 'i686', 'i786',
@@ -29,6 +31,34 @@ def _is_x86(triple):
     return arch in _x86arch
 
 
+# The CPU features required by the portable CPU models, i.e. the x86-64
+# microarchitecture levels, as named by LLVM.  Code compiled for these models
+# (without additional features) can be shared between hosts, see
+# CPUCodegen.portable_code_level().
+_x86_64_v2_features = frozenset(['cx16', 'sahf', 'popcnt', 'sse3', 'sse4.1',
+                                 'sse4.2', 'ssse3'])
+_x86_64_v3_features = _x86_64_v2_features | frozenset([
+    'avx', 'avx2', 'bmi', 'bmi2', 'f16c', 'fma', 'lzcnt', 'movbe', 'xsave'])
+_x86_64_v4_features = _x86_64_v3_features | frozenset([
+    'avx512f', 'avx512bw', 'avx512cd', 'avx512dq', 'avx512vl'])
+
+_portable_cpu_features = {
+    'generic': frozenset(),
+    'x86-64': frozenset(),
+    'x86-64-v2': _x86_64_v2_features,
+    'x86-64-v3': _x86_64_v3_features,
+    'x86-64-v4': _x86_64_v4_features,
+}
+
+
+def _enabled_features(features):
+    """
+    Return the set of features enabled by the LLVM feature string *features*,
+    e.g. ``"+avx,-avx512f"``.
+    """
+    return frozenset(f[1:] for f in features.split(',') if f.startswith('+'))
+
+
 def _parse_refprune_flags():
     """Parse refprune flags from the `config`.
 
@@ -525,6 +555,8 @@ class CodeLibrary(metaclass=ABCMeta):
     _finalized = False
     _object_caching_enabled = False
     _disable_inspection = False
+    # Object code kept for writing the perf map, see NUMBA_PERF_MAP
+    _perf_map_object = None
 
     def __init__(self, codegen: "CPUCodegen", name: str):
         self._codegen = codegen
@@ -533,6 +565,8 @@ class CodeLibrary(metaclass=ABCMeta):
         self._recorded_timings = PassTimingsCollection(ptc_name)
         # Track names of the dynamic globals
         self._dynamic_globals = []
+        # Human-readable descriptions of the symbols, see describe_symbol()
+        self._symbol_descriptions = {}
 
     @property
     def has_dynamic_globals(self):
@@ -566,6 +600,14 @@ class CodeLibrary(metaclass=ABCMeta):
         if not self._finalized:
             self.finalize()
 
+    def describe_symbol(self, name, description):
+        """
+        Record a human-readable *description* of the symbol *name* defined
+        by this library, used when reporting the symbol to external tools
+        such as profilers.
+        """
+        self._symbol_descriptions[name] = description
+
     def create_ir_module(self, name):
         """
         Create an LLVM IR module for use by this library.
@@ -637,6 +679,16 @@ class CodeLibrary(metaclass=ABCMeta):
         self._compiled_object = value
         self._disable_inspection = True
 
+    def _release_inspection_data(self):
+        """
+        Release data that is only needed for inspection or serialization
+        of the finalized library.  The library remains usable for execution
+        and linking.
+        """
+        self._ensure_finalized()
+        if self._object_caching_enabled:
+            self._compiled_object = None
+
 
 class CPUCodeLibrary(CodeLibrary):
 
@@ -688,6 +740,9 @@ class CPUCodeLibrary(CodeLibrary):
         with self._recorded_timings.record(full_name):
             # The full optimisation suite is then run on the refop pruned IR
             mpm_full.run(self._final_module)
+        # The vectorized calls of approximate math functions are replaced
+        # with vector implementations
+        self._final_module = use_vector_math(self._final_module)
 
     def _get_module_for_linking(self):
         """
@@ -897,6 +952,8 @@ class CPUCodeLibrary(CodeLibrary):
         if self._object_caching_enabled:
             self._compiled = True
             self._compiled_object = buf
+        if config.PERF_MAP:
+            self._perf_map_object = buf
 
     @classmethod
     def _object_getbuffer_hook(cls, ll_module):
@@ -910,6 +967,8 @@ class CPUCodeLibrary(CodeLibrary):
         if self._object_caching_enabled and self._compiled_object:
             buf = self._compiled_object
             self._compiled_object = None
+            if config.PERF_MAP:
+                self._perf_map_object = buf
             return buf
 
     def serialize_using_bitcode(self):
@@ -1005,6 +1064,28 @@ class JITCodeLibrary(CPUCodeLibrary):
         self._codegen._scan_and_fix_unresolved_refs(self._final_module)
         with self._recorded_timings.record("Finalize object"):
             self._codegen._engine.finalize_object()
+        if config.PERF_MAP:
+            self._write_perf_map()
+
+    def _write_perf_map(self):
+        """
+        Write the address ranges of the functions defined by this library to
+        the perf map file, see numba.misc.perf_map.
+        """
+        buf = self._perf_map_object
+        self._perf_map_object = None
+        if buf is None:
+            return
+        ee = self._codegen._engine
+        entries = []
+        for name, size in perf_map.elf_function_symbols(buf):
+            if not ee.is_symbol_defined(name):
+                continue
+            addr = ee.get_function_address(name)
+            if addr:
+                desc = self._symbol_descriptions.get(name, name)
+                entries.append(perf_map.PerfMapEntry(addr, size, desc))
+        perf_map.write_entries(entries)
 
 
 class RuntimeLinker(object):
@@ -1165,6 +1246,15 @@ class Codegen(metaclass=ABCMeta):
     def unserialize_library(self, serialized):
         return self._library_class._unserialize(self, serialized)
 
+    def portable_code_level(self, magic_tuple):
+        """
+        Given the *magic_tuple* of another codegen, return a level, the
+        higher the better, if this codegen can run its code, None otherwise.
+        By default, cached code is only loaded by a codegen with the same
+        magic tuple.
+        """
+        return None
+
 
 class CPUCodegen(Codegen):
 
@@ -1313,6 +1403,29 @@ class CPUCodegen(Codegen):
         return (self._llvm_module.triple, self._get_host_cpu_name(),
                 self._tm_features)
 
+    def portable_code_level(self, magic_tuple):
+        """
+        Given the *magic_tuple* of another codegen, return the number of CPU
+        features its code requires if it is portable code this codegen's
+        CPU can run, None otherwise.  Portable code is compiled for one of
+        the CPU models of ``_portable_cpu_features``, which imply the
+        features they require.
+        """
+        triple, cpu_name, features = magic_tuple
+        if triple != self._llvm_module.triple:
+            return None
+        try:
+            required = _portable_cpu_features[cpu_name]
+        except KeyError:
+            return None
+        required = required | _enabled_features(features)
+        own_cpu_name, own_features = self.magic_tuple()[1:]
+        supported = (_portable_cpu_features.get(own_cpu_name, frozenset())
+                     | _enabled_features(own_features))
+        if not required <= supported:
+            return None
+        return len(required)
+
     def _scan_and_fix_unresolved_refs(self, module):
         self._rtlinker.scan_unresolved_symbols(module, self._engine)
         self._rtlinker.scan_defined_symbols(module)
@@ -1379,6 +1492,13 @@ class JITCPUCodegen(CPUCodegen):
 
     _library_class = JITCodeLibrary
 
+    def __init__(self, module_name, cpu_name=None):
+        # By default, specialize for the host CPU.  The code compiled for
+        # another CPU model is only meant to be cached, see
+        # Dispatcher._save_cpu_variants().
+        self._cpu_name = cpu_name
+        CPUCodegen.__init__(self, module_name)
+
     def _customize_tm_options(self, options):
         # As long as we don't want to ship the code to another machine,
         # we can specialize for this CPU.
@@ -1407,9 +1527,17 @@ class JITCPUCodegen(CPUCodegen):
             options['jit'] = True
 
     def _customize_tm_features(self):
+        if self._cpu_name is not None:
+            # The features are implied by the CPU model
+            return ''
         # For JIT target, we will use LLVM to get the feature map
         return self._get_host_cpu_features()
 
+    def _get_host_cpu_name(self):
+        if self._cpu_name is not None:
+            return self._cpu_name
+        return super()._get_host_cpu_name()
+
     def _add_module(self, module):
         self._engine.add_module(module)
         # XXX: disabling remove module due to MCJIT engine leakage in
@@ -16,6 +16,7 @@ from numba.core.untyped_passes import (ExtractByteCode, TranslateByteCode,
                                        RewriteSemanticConstants,
                                        InlineClosureLikes, GenericRewrites,
                                        WithLifting, InlineInlinables,
+                                       InlineGenerators,
                                        FindLiterallyCalls,
                                        MakeFunctionToJitFunction,
                                        CanonicalizeLoopExit,
@@ -92,6 +93,16 @@ class Flags(TargetConfig):
         default=False,
         doc="Force inlining of the function. Overrides _dbg_optnone.",
     )
+    wraparound = Option(
+        type=bool,
+        default=True,
+        doc="Wrap negative array indices around",
+    )
+    cdivision = Option(
+        type=bool,
+        default=False,
+        doc="Use C semantics for integer division and modulo",
+    )
     no_cpython_wrapper = Option(
         type=bool,
         default=False,
@@ -130,9 +141,19 @@ detail""",
         doc="TODO",
     )
     noalias = Option(
+        type=cpu.NoAliasOptions,
+        default=cpu.NoAliasOptions(False),
+        doc="Assert that the data of array arguments does not overlap",
+    )
+    instrument = Option(
         type=bool,
         default=False,
-        doc="TODO",
+        doc="Count the calls and the cycles spent in the function",
+    )
+    line_profile = Option(
+        type=bool,
+        default=False,
+        doc="Record the executed source lines for the sampling line profiler",
     )
     inline = Option(
         type=cpu.InlineOptions,
@@ -262,12 +283,44 @@ class CompileResult(namedtuple("_CompileResult", CR_FIELDS)):
     def codegen(self):
         return self.target_context.codegen()
 
+    # Whether the inspection data has been stripped, see _make_lean().
+    is_lean = False
+
+    def _make_lean(self):
+        """
+        Return a copy of this CompileResult retaining only what is needed to
+        execute the compiled function and to link it into other libraries.
+        Data only used for inspection (type annotation, metadata, typemaps,
+        call helper and the compiled object code) is dropped.
+        """
+        fndesc = self.fndesc
+        if fndesc is not None:
+            # Those are only used by lowering
+            fndesc.typemap = fndesc.calltypes = None
+        if self.library is not None:
+            self.library._release_inspection_data()
+        return LeanCompileResult._make(self)._replace(type_annotation=None,
+                                                      typing_error=None,
+                                                      call_helper=None,
+                                                      metadata=None)
+
     def dump(self, tab=''):
         print(f'{tab}DUMP {type(self).__name__} {self.entry_point}')
         self.signature.dump(tab=tab + '  ')
         print(f'{tab}END DUMP')
 
 
+class LeanCompileResult(CompileResult):
+    """
+    A CompileResult stripped of its inspection data, see
+    CompileResult._make_lean().
+    """
+
+    __slots__ = ()
+
+    is_lean = True
+
+
 _LowerResult = namedtuple("_LowerResult", [
     "fndesc",
     "call_helper",
@@ -377,6 +430,10 @@ def _make_subtarget(targetctx, flags):
         subtargetoptions['auto_parallel'] = flags.auto_parallel
     if flags.fastmath:
         subtargetoptions['fastmath'] = flags.fastmath
+    # Always set, so that the functions compiled while lowering a function
+    # keep the Python semantics
+    subtargetoptions['enable_wraparound'] = flags.wraparound
+    subtargetoptions['cdivision'] = flags.cdivision
     error_model = callconv.create_error_model(flags.error_model, targetctx)
     subtargetoptions['error_model'] = error_model
 
@@ -663,6 +720,8 @@ class DefaultPassBuilder(object):
         # the IR repr of a closure masks call sites if an inlinable is called
         # inside a closure
         pm.add_pass(InlineInlinables, "inline inlinable functions")
+        pm.add_pass(InlineGenerators,
+                    "inline generators consumed by for loops")
         if not state.flags.no_rewrites:
             pm.add_pass(DeadBranchPrune, "dead branch pruning")
 
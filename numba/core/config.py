@@ -102,6 +102,19 @@ class _OptLevel(int):
         return f"_OptLevel({arg})"
 
 
+def _process_array_alignment(value):
+    align = int(value)
+    if align < 1 or align & (align - 1):
+        msg = ("Environment variable `NUMBA_ARRAY_ALIGNMENT` is set to an "
+               f"unsupported value '{value}', it must be a power of two")
+        raise ValueError(msg)
+    return align
+
+
+def _parse_cpu_names(text):
+    return tuple(name.strip() for name in text.split(',') if name.strip())
+
+
 def _process_opt_level(opt_level):
 
     if opt_level not in ('0', '1', '2', '3', 'max'):
@@ -267,10 +280,30 @@ class _EnvReloader(object):
         # Enable NRT statistics counters
         NRT_STATS = _readenv("NUMBA_NRT_STATS", int, 0)
 
+        # Serve small NRT allocations from per-thread size-class freelists
+        NRT_POOL_ALLOCATOR = _readenv("NUMBA_NRT_POOL_ALLOCATOR", int, 0)
+
+        # Maximum size in bytes of the non-escaping arrays allocated on the
+        # stack, 0 disables stack allocation
+        STACK_ARRAY_MAX_BYTES = _readenv("NUMBA_STACK_ARRAY_MAX_BYTES", int,
+                                         1024)
+
+        # Alignment in bytes of the data of the arrays allocated by the NRT
+        ARRAY_ALIGNMENT = _readenv("NUMBA_ARRAY_ALIGNMENT",
+                                   _process_array_alignment, 32)
+
         # How many recently deserialized functions to retain regardless
         # of external references
         FUNCTION_CACHE_SIZE = _readenv("NUMBA_FUNCTION_CACHE_SIZE", int, 128)
 
+        # Only keep the data needed for execution and caching in the compile
+        # results held by dispatchers, inspection data is recomputed on demand
+        LEAN_COMPILE_RESULTS = _readenv("NUMBA_LEAN_COMPILE_RESULTS", int, 0)
+
+        # Maximum number of specializations retained by a dispatcher, the
+        # least recently used ones are evicted. 0 means unbounded.
+        MAX_OVERLOADS = _readenv("NUMBA_MAX_OVERLOADS", int, 0)
+
         # Maximum tuple size that parfors will unpack and pass to
         # internal gufunc.
         PARFOR_MAX_TUPLE_SIZE = _readenv("NUMBA_PARFOR_MAX_TUPLE_SIZE",
@@ -283,6 +316,13 @@ class _EnvReloader(object):
         # Contains path to the directory
         CACHE_DIR = _readenv("NUMBA_CACHE_DIR", str, "")
 
+        # Write the address ranges of jitted functions to /tmp/perf-<pid>.map
+        # for the Linux perf profiler
+        PERF_MAP = _readenv("NUMBA_PERF_MAP", int, 0)
+
+        # Compile functions with call counters and timers by default
+        INSTRUMENT = _readenv("NUMBA_INSTRUMENT", int, 0)
+
         # Enable tracing support
         TRACE = _readenv("NUMBA_TRACE", int, 0)
 
@@ -296,9 +336,16 @@ class _EnvReloader(object):
         # and CPU feature as the host information.
         # Note: this overrides "host" option for AOT compilation.
         CPU_NAME = _readenv("NUMBA_CPU_NAME", optional_str, None)
+        # The features default to those implied by the portable CPU models.
         CPU_FEATURES = _readenv("NUMBA_CPU_FEATURES", optional_str,
-                                ("" if str(CPU_NAME).lower() == 'generic'
+                                ("" if str(CPU_NAME).lower() in
+                                 ('generic', 'x86-64', 'x86-64-v2',
+                                  'x86-64-v3', 'x86-64-v4')
                                  else None))
+        # Additional CPU models for which the functions with cache=True are
+        # compiled and cached, as a comma-separated list
+        CACHE_CPU_NAMES = _readenv("NUMBA_CACHE_CPU_NAMES", _parse_cpu_names,
+                                   ())
         # Optimization level
         OPT = _readenv("NUMBA_OPT", _process_opt_level, _OptLevel(3))
 
@@ -15,7 +15,8 @@ import numba.core.entrypoints
 # Re-export these options, they are used from the cpu module throughout the code
 # base.
 from numba.core.cpu_options import (ParallelOptions, # noqa F401
-                                    FastMathOptions, InlineOptions) # noqa F401
+                                    FastMathOptions, InlineOptions, # noqa F401
+                                    NoAliasOptions) # noqa F401
 from numba.np import ufunc_db
 
 # Keep those structures in sync with _dynfunc.c.
@@ -37,6 +38,7 @@ class CPUContext(BaseContext):
     Changes BaseContext calling convention
     """
     allow_dynamic_globals = True
+    enable_nounwind_variants = True
 
     def __init__(self, typingctx, target='cpu'):
         super().__init__(typingctx, target)
@@ -49,6 +51,7 @@ class CPUContext(BaseContext):
     def init(self):
         self.is32bit = (utils.MACHINE_BITS == 32)
         self._internal_codegen = codegen.JITCPUCodegen("numba.exec")
+        self._cpu_codegens = {}
 
         # Add ARM ABI functions from libgcc_s
         if platform.machine() == 'armv7l':
@@ -110,6 +113,19 @@ class CPUContext(BaseContext):
         return self.subtarget(_internal_codegen=aot_codegen,
                               aot_mode=True)
 
+    def with_cpu_codegen(self, cpu_name):
+        """
+        Return a context compiling for the CPU model *cpu_name* rather than
+        the host CPU.  Its code is not meant to be run in this process.
+        """
+        try:
+            cpu_codegen = self._cpu_codegens[cpu_name]
+        except KeyError:
+            cpu_codegen = codegen.JITCPUCodegen("numba.exec",
+                                                cpu_name=cpu_name)
+            self._cpu_codegens[cpu_name] = cpu_codegen
+        return self.subtarget(_internal_codegen=cpu_codegen)
+
     def codegen(self):
         return self._internal_codegen
 
@@ -273,15 +289,20 @@ _options_mixin = include_default_options(
     "_nrt",
     "debug",
     "boundscheck",
+    "wraparound",
+    "cdivision",
     "nogil",
     "no_rewrites",
     "no_cpython_wrapper",
     "no_cfunc_wrapper",
     "parallel",
     "fastmath",
+    "noalias",
     "error_model",
     "inline",
     "forceinline",
+    "line_profile",
+    "instrument",
     "_dbg_extend_lifetimes",
     "_dbg_optnone",
 )
@@ -320,6 +341,9 @@ class CPUTargetOptions(_options_mixin, TargetOptions):
 
         flags.inherit_if_not_set("forceinline")
 
+        if not flags.is_set("instrument"):
+            flags.instrument = config.INSTRUMENT
+
         if flags.forceinline:
             # forceinline turns off optnone, just like clang.
             flags.dbg_optnone = False
@@ -64,6 +64,51 @@ class FastMathOptions(AbstractOptionValue):
         return NotImplemented
 
 
+class NoAliasOptions(AbstractOptionValue):
+    """
+    Options asserting that the data of array arguments does not overlap
+    the data of any other argument.
+    """
+
+    def __init__(self, value):
+        # The names of the arguments the assertion applies to, None stands
+        # for all the array arguments
+        if isinstance(value, NoAliasOptions):
+            self.args = value.args
+        elif value is True:
+            self.args = None
+        elif value is False:
+            self.args = frozenset()
+        elif (isinstance(value, (tuple, list, set, frozenset)) and
+                all(isinstance(v, str) for v in value)):
+            self.args = frozenset(value)
+        else:
+            msg = ("Expected noalias option to be either a bool or a "
+                   "sequence of argument names")
+            raise ValueError(msg)
+
+    def __bool__(self):
+        return self.args is None or bool(self.args)
+
+    __nonzero__ = __bool__
+
+    def applies_to(self, name):
+        """
+        Whether the argument *name* is asserted not to alias.
+        """
+        return self.args is None or name in self.args
+
+    def encode(self) -> str:
+        if self.args is None:
+            return "True"
+        return str(sorted(self.args))
+
+    def __eq__(self, other):
+        if type(other) is type(self):
+            return self.args == other.args
+        return NotImplemented
+
+
 class ParallelOptions(AbstractOptionValue):
     """
     Options for controlling auto parallelization.
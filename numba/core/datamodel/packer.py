@@ -112,6 +112,12 @@ class ArgPacker(object):
 
         return values
 
+    def unflatten_arguments(self, args):
+        """Group the flattened argument values by high-level argument,
+        following the nesting of their types.
+        """
+        return self._unflattener.unflatten(args)
+
     def assign_names(self, args, names):
         """Assign names for each flattened argument values.
         """
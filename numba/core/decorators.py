@@ -24,7 +24,7 @@ _msg_deprecated_signature_arg = ("Deprecated keyword argument `{0}`. "
 
 
 def jit(signature_or_function=None, locals={}, cache=False,
-        pipeline_class=None, boundscheck=None, **options):
+        pipeline_class=None, boundscheck=None, max_overloads=None, **options):
     """
     This decorator is used to compile a Python function into native code.
 
@@ -44,6 +44,12 @@ def jit(signature_or_function=None, locals={}, cache=False,
     pipeline_class: type numba.compiler.CompilerBase
             The compiler pipeline type for customizing the compilation stages.
 
+    max_overloads: int
+        The maximum number of specializations to retain.  When exceeded, the
+        least recently used specializations are evicted (and recompiled or
+        reloaded from the cache if needed again).  Defaults to the value of
+        the NUMBA_MAX_OVERLOADS environment variable, 0 means unbounded.
+
     options:
         For a cpu target, valid options are:
             nopython: bool
@@ -187,14 +193,16 @@ def jit(signature_or_function=None, locals={}, cache=False,
     if pipeline_class is not None:
         dispatcher_args['pipeline_class'] = pipeline_class
     wrapper = _jit(sigs, locals=locals, target=target, cache=cache,
-                   targetoptions=options, **dispatcher_args)
+                   targetoptions=options, max_overloads=max_overloads,
+                   **dispatcher_args)
     if pyfunc is not None:
         return wrapper(pyfunc)
     else:
         return wrapper
 
 
-def _jit(sigs, locals, target, cache, targetoptions, **dispatcher_args):
+def _jit(sigs, locals, target, cache, targetoptions, max_overloads=None,
+         **dispatcher_args):
 
     from numba.core.target_extension import resolve_dispatcher_from_str
     dispatcher = resolve_dispatcher_from_str(target)
@@ -231,6 +239,10 @@ def _jit(sigs, locals, target, cache, targetoptions, **dispatcher_args):
                 for sig in sigs:
                     disp.compile(sig)
                 disp.disable_compile()
+        if max_overloads is not None:
+            # Set once the explicit signatures are compiled, they are never
+            # evicted.
+            disp.set_max_overloads(max_overloads)
         return disp
 
     return wrapper
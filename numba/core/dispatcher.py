@@ -22,6 +22,7 @@ from numba.core.bytecode import get_code_object
 from numba.core.caching import NullCache, FunctionCache
 from numba.core import entrypoints
 import numba.core.event as ev
+from numba.misc import instrumentation
 
 
 class OmittedArg(object):
@@ -98,14 +99,24 @@ class _FunctionCompiler(object):
         else:
             return True, retval
 
-    def _compile_core(self, args, return_type):
+    def compile_for_cpu(self, args, return_type, cpu_name):
+        """
+        Compile for the CPU model *cpu_name* rather than the host CPU.  The
+        result is only meant to be cached.
+        """
+        targetctx = self.targetdescr.target_context.with_cpu_codegen(cpu_name)
+        return self._compile_core(args, return_type, targetctx)
+
+    def _compile_core(self, args, return_type, targetctx=None):
         flags = compiler.Flags()
         self.targetdescr.options.parse_as_flags(flags, self.targetoptions)
         flags = self._customize_flags(flags)
+        if targetctx is None:
+            targetctx = self.targetdescr.target_context
 
         impl = self._get_implementation(args, {})
         cres = compiler.compile_extra(self.targetdescr.typing_context,
-                                      self.targetdescr.target_context,
+                                      targetctx,
                                       impl,
                                       args=args, return_type=return_type,
                                       flags=flags, locals=self.locals,
@@ -164,7 +175,8 @@ class _GeneratedFunctionCompiler(_FunctionCompiler):
 
 
 _CompileStats = collections.namedtuple(
-    '_CompileStats', ('cache_path', 'cache_hits', 'cache_misses'))
+    '_CompileStats', ('cache_path', 'cache_hits', 'cache_misses',
+                      'evictions'))
 
 
 class CompilingCounter(object):
@@ -296,6 +308,8 @@ class _DispatcherBase(_dispatcher.Dispatcher):
         sig = [a._code for a in args]
         self._insert(sig, cres.entry_point, cres.objectmode)
         self.overloads[args] = cres
+        if not cres.objectmode:
+            instrumentation.register(cres)
 
     def fold_argument_types(self, args, kws):
         return self._compiler.fold_argument_types(args, kws)
@@ -333,6 +347,27 @@ class _DispatcherBase(_dispatcher.Dispatcher):
         args, return_type = sigutils.normalize_signature(sig)
         return self.overloads[tuple(args)].entry_point
 
+    def _get_inspection_result(self, signature):
+        """
+        Return the compile result for *signature* with its inspection data
+        available.  Lean compile results (see NUMBA_LEAN_COMPILE_RESULTS)
+        are recompiled on demand, the recompiled result is not added to the
+        overloads.
+        """
+        cres = self.overloads[signature]
+        if not cres.is_lean:
+            return cres
+        with global_compiler_lock:
+            full = self._compiler.compile(tuple(signature),
+                                          cres.signature.return_type)
+        # Do not keep the temporary result alive via the target context
+        if not full.objectmode:
+            try:
+                self.targetctx.remove_user_function(full.entry_point)
+            except KeyError:
+                pass
+        return full
+
     @property
     def is_compiling(self):
         """
@@ -461,7 +496,7 @@ class _DispatcherBase(_dispatcher.Dispatcher):
             strings.
         """
         if signature is not None:
-            lib = self.overloads[signature].library
+            lib = self._get_inspection_result(signature).library
             return lib.get_llvm_str()
 
         return dict((sig, self.inspect_llvm(sig)) for sig in self.signatures)
@@ -483,7 +518,7 @@ class _DispatcherBase(_dispatcher.Dispatcher):
             code.
         """
         if signature is not None:
-            lib = self.overloads[signature].library
+            lib = self._get_inspection_result(signature).library
             return lib.get_asm_str()
 
         return dict((sig, self.inspect_asm(sig)) for sig in self.signatures)
@@ -518,9 +553,11 @@ class _DispatcherBase(_dispatcher.Dispatcher):
             used for its printing side effect. If ``pretty=True``, an Annotate
             object is returned that can render itself in Jupyter and IPython.
         """
-        overloads = self.overloads
         if signature is not None:
-            overloads = {signature: self.overloads[signature]}
+            overloads = {signature: self._get_inspection_result(signature)}
+        else:
+            overloads = {sig: self._get_inspection_result(sig)
+                         for sig in self.signatures}
 
         if not pretty:
             if file is None:
@@ -585,7 +622,7 @@ class _DispatcherBase(_dispatcher.Dispatcher):
             Default is 8. Set the fontsize in the output to this value.
         """
         if signature is not None:
-            cres = self.overloads[signature]
+            cres = self._get_inspection_result(signature)
             lib = cres.library
             if show_wrapper == 'python':
                 fname = cres.fndesc.llvm_cpython_wrapper_name
@@ -611,7 +648,7 @@ class _DispatcherBase(_dispatcher.Dispatcher):
             If None, the IR is printed for all available signatures.
         """
         if signature is not None:
-            cres = self.overloads[signature]
+            cres = self._get_inspection_result(signature)
             lib = cres.library
             return lib.get_disasm_cfg(cres.fndesc.mangled_name)
 
@@ -627,7 +664,7 @@ class _DispatcherBase(_dispatcher.Dispatcher):
         signatures = self.signatures if signature is None else [signature]
         out = collections.OrderedDict()
         for sig in signatures:
-            cres = self.overloads[sig]
+            cres = self._get_inspection_result(sig)
             ta = cres.type_annotation
             key = (ta.func_id.filename + ':' + str(ta.func_id.firstlineno + 1),
                    ta.signature)
@@ -789,6 +826,10 @@ class Dispatcher(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
                                         targetoptions, locals, pipeline_class)
         self._cache_hits = collections.Counter()
         self._cache_misses = collections.Counter()
+        self._evictions = collections.Counter()
+        # Maximum number of overloads to retain, None defers to
+        # config.MAX_OVERLOADS
+        self._max_overloads = None
 
         self._type = types.Dispatcher(self)
         self.typingctx.insert_global(self, self._type)
@@ -807,6 +848,51 @@ class Dispatcher(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
     def enable_caching(self):
         self._cache = FunctionCache(self.py_func)
 
+    def set_max_overloads(self, max_overloads):
+        """
+        Set the maximum number of overloads retained by this dispatcher,
+        0 means unbounded.  The least recently used overloads are evicted
+        when a new overload exceeds the limit.
+        """
+        if max_overloads < 0:
+            raise ValueError("max_overloads must be a non-negative integer")
+        self._max_overloads = max_overloads
+        self._evict_overloads()
+
+    def _evict_overloads(self):
+        """
+        Evict the least recently used overloads in excess of the
+        maximum number of overloads.
+
+        Evicted overloads are removed from the dispatch table and the target
+        context so that their compile result, library and environment can be
+        released.  They are recompiled, or reloaded from the cache, when
+        requested again.
+        """
+        limit = self._max_overloads
+        if limit is None:
+            limit = config.MAX_OVERLOADS
+        # Eviction of the signatures of a dispatcher with compilation
+        # disabled would make them unavailable.
+        if not limit or not self._can_compile:
+            return
+        excess = len(self.overloads) - limit
+        if excess <= 0:
+            return
+        sigs = list(self.overloads)
+        last_used = self._last_used()
+        lru = sorted(range(len(sigs)), key=last_used.__getitem__)[:excess]
+        # Remove from the highest index so the lower ones stay valid
+        for idx in sorted(lru, reverse=True):
+            self._remove(idx)
+            cres = self.overloads.pop(sigs[idx])
+            if not cres.objectmode:
+                try:
+                    self.targetctx.remove_user_function(cres.entry_point)
+                except KeyError:
+                    pass
+            self._evictions[sigs[idx]] += 1
+
     def __get__(self, obj, objtype=None):
         '''Allow a JIT function to be bound as a method to an object'''
         if obj is None:  # Unbound method
@@ -834,11 +920,12 @@ class Dispatcher(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
             targetoptions=self.targetoptions,
             can_compile=self._can_compile,
             sigs=sigs,
+            max_overloads=self._max_overloads,
         )
 
     @classmethod
     def _rebuild(cls, uuid, py_func, locals, targetoptions,
-                 can_compile, sigs):
+                 can_compile, sigs, max_overloads=None):
         """
         Rebuild an Dispatcher instance after it was __reduce__'d.
 
@@ -851,6 +938,7 @@ class Dispatcher(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
         self = cls(py_func, locals, targetoptions)
         # Make sure this deserialization will be merged with subsequent ones
         self._set_uuid(uuid)
+        self._max_overloads = max_overloads
         for sig in sigs:
             self.compile(sig)
         self._can_compile = can_compile
@@ -892,6 +980,7 @@ class Dispatcher(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
                                                             cres.fndesc,
                                                             [cres.library])
                     self.add_overload(cres)
+                    self._evict_overloads()
                     return cres.entry_point
 
                 self._cache_misses[sig] += 1
@@ -910,8 +999,29 @@ class Dispatcher(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
                         raise e.bind_fold_arguments(folded)
                     self.add_overload(cres)
                 self._cache.save_overload(sig, cres)
+                self._save_cpu_variants(sig)
+                if config.LEAN_COMPILE_RESULTS:
+                    # Inspection data is recomputed on demand, see
+                    # _get_inspection_result()
+                    self.overloads[tuple(args)] = cres._make_lean()
+                self._evict_overloads()
                 return cres.entry_point
 
+    def _save_cpu_variants(self, sig):
+        """
+        Compile and cache the overload for the CPU models of
+        NUMBA_CACHE_CPU_NAMES, so that the cache can be loaded by other
+        hosts supporting them.
+        """
+        if (isinstance(self._cache, NullCache)
+                or not hasattr(self.targetctx, 'with_cpu_codegen')):
+            return
+        args, return_type = sigutils.normalize_signature(sig)
+        for cpu_name in config.CACHE_CPU_NAMES:
+            variant = self._compiler.compile_for_cpu(args, return_type,
+                                                     cpu_name)
+            self._cache.save_overload(sig, variant)
+
     def get_compile_result(self, sig):
         """Compile (if needed) and return the compilation result with the
         given signature.
@@ -953,6 +1063,7 @@ class Dispatcher(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
             cache_path=self._cache.cache_path,
             cache_hits=self._cache_hits,
             cache_misses=self._cache_misses,
+            evictions=self._evictions,
         )
 
     def parallel_diagnostics(self, signature=None, level=1):
@@ -963,7 +1074,7 @@ class Dispatcher(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
         and 2, 3, and 4 provide increasing levels of verbosity.
         """
         def dump(sig):
-            ol = self.overloads[sig]
+            ol = self._get_inspection_result(sig)
             pfdiag = ol.metadata.get('parfor_diagnostics', None)
             if pfdiag is None:
                 msg = "No parfors diagnostic available, is 'parallel=True' set?"
@@ -979,10 +1090,11 @@ class Dispatcher(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
         Obtain the compilation metadata for a given signature.
         """
         if signature is not None:
-            return self.overloads[signature].metadata
+            return self._get_inspection_result(signature).metadata
         else:
             return dict(
-                (sig,self.overloads[sig].metadata) for sig in self.signatures
+                (sig, self._get_inspection_result(sig).metadata)
+                for sig in self.signatures
             )
 
     def get_function_type(self):
@@ -28,6 +28,11 @@ The following events are built in:
     - ``"args"``: argument types.
     - ``"return_type"`` return type.
 
+- ``"numba:runtime_stats"`` is broadcast when the call counters of the
+  functions compiled with ``instrument=True`` are collected by
+  ``numba.runtime_stats()``. The end event has ``data`` defined to be the
+  returned ``dict`` of stats.
+
 Applications can register callbacks that are listening for specific events using
 ``register(kind: str, listener: Listener)``, where ``listener`` is an instance
 of ``Listener`` that defines custom actions on occurrence of the specific event.
@@ -60,6 +65,7 @@ _builtin_kinds = frozenset([
     "numba:compile",
     "numba:llvm_lock",
     "numba:run_pass",
+    "numba:runtime_stats",
 ])
 
 
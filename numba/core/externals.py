@@ -101,6 +101,87 @@ def compile_multi3(context):
     return library
 
 
+def compile_half_conversions(context):
+    """
+    Compile the helper functions used by LLVM to convert between float16
+    and the wider floating-point types, when the target has no instructions
+    for them (e.g. x86 without F16C, or double to half on any x86).
+    """
+    codegen = context.codegen()
+    library = codegen.create_library("half_conversions")
+
+    ir_mod = library.create_ir_module("half_conversions")
+
+    i16 = ir.IntType(16)
+    i32 = ir.IntType(32)
+    i64 = ir.IntType(64)
+    half = ir.HalfType()
+    flt = ir.FloatType()
+    dbl = ir.DoubleType()
+
+    # extendhfsf2(): half -> float, which is always exact
+    fn = ir.Function(ir_mod, ir.FunctionType(flt, [half]), name="extendhfsf2")
+    builder = ir.IRBuilder(fn.append_basic_block())
+    h = builder.zext(builder.bitcast(fn.args[0], i16), i32)
+    sign = builder.shl(builder.and_(h, i32(0x8000)), i32(16))
+    # Move the exponent and mantissa into place and rebias the exponent
+    bits = builder.shl(builder.and_(h, i32(0x7fff)), i32(13))
+    exp = builder.and_(bits, i32(0x1f << 23))
+    bits = builder.add(bits, i32((127 - 15) << 23))
+    # Infinities and NaNs keep the maximum exponent
+    is_special = builder.icmp_unsigned('==', exp, i32(0x1f << 23))
+    bits = builder.select(is_special,
+                          builder.add(bits, i32((128 - 16) << 23)), bits)
+    # Subnormals are renormalized by subtracting the implicit leading one
+    is_subnormal = builder.icmp_unsigned('==', exp, i32(0))
+    renormed = builder.fsub(builder.bitcast(builder.add(bits, i32(1 << 23)),
+                                            flt),
+                            builder.bitcast(i32(113 << 23), flt))
+    bits = builder.select(is_subnormal, builder.bitcast(renormed, i32), bits)
+    builder.ret(builder.bitcast(builder.or_(bits, sign), flt))
+
+    # truncdfhf2(): double -> half, rounding to nearest even.  This mimics
+    # the float implementation of compiler-rt, directly from double to
+    # avoid rounding twice.
+    truncdfhf2 = ir.Function(ir_mod, ir.FunctionType(half, [dbl]),
+                             name="truncdfhf2")
+    builder = ir.IRBuilder(truncdfhf2.append_basic_block())
+    bits = builder.bitcast(truncdfhf2.args[0], i64)
+    sign = builder.trunc(builder.lshr(bits, i64(48)), i16)
+    sign = builder.and_(sign, i16(0x8000))
+    bits = builder.and_(bits, i64(0x7fffffffffffffff))
+    # NaNs become quiet NaNs, and too large numbers become infinities
+    is_nan = builder.icmp_unsigned('>', bits, i64(0x7ff << 52))
+    special = builder.select(is_nan, i16(0x7e00), i16(0x7c00))
+    is_special = builder.icmp_unsigned('>=', bits, i64((1023 + 16) << 52))
+    # Subnormals and zeros: adding 2**28 rounds away the bits below the
+    # smallest subnormal, 2**-24, and leaves the mantissa in the low bits
+    magic = builder.bitcast(i64((1023 + 28) << 52), dbl)
+    subnormal = builder.sub(
+        builder.bitcast(builder.fadd(builder.bitcast(bits, dbl), magic), i64),
+        builder.bitcast(magic, i64))
+    is_subnormal = builder.icmp_unsigned('<', bits, i64((1023 - 14) << 52))
+    # Normal numbers: rebias the exponent and round the mantissa, a carry
+    # out of it correctly increments the exponent
+    odd = builder.and_(builder.lshr(bits, i64(42)), i64(1))
+    rebias = (((15 - 1023) << 52) + (1 << 41) - 1) & 0xffffffffffffffff
+    normal = builder.add(builder.add(bits, i64(rebias)), odd)
+    normal = builder.lshr(normal, i64(42))
+    res = builder.trunc(builder.select(is_subnormal, subnormal, normal), i16)
+    res = builder.select(is_special, special, res)
+    builder.ret(builder.bitcast(builder.or_(res, sign), half))
+
+    # truncsfhf2(): float -> half, exact conversion to double first
+    fn = ir.Function(ir_mod, ir.FunctionType(half, [flt]), name="truncsfhf2")
+    builder = ir.IRBuilder(fn.append_basic_block())
+    builder.ret(builder.call(truncdfhf2, [builder.fpext(fn.args[0], dbl)]))
+
+    library.add_ir_module(ir_mod)
+    library.finalize()
+
+    return library
+
+
 class _Installer(object):
 
     _installed = False
@@ -143,6 +224,15 @@ class _ExternalMathFunctions(_Installer):
             assert ptr
             _add_missing_symbol("__multi3", ptr)
 
+        # Make the library immortal.  The symbols are always replaced, as
+        # the runtime libraries may pass float16 values differently from
+        # the LLVM version in use.
+        self._half_lib = compile_half_conversions(context)
+        for fname in ("extendhfsf2", "truncsfhf2", "truncdfhf2"):
+            ptr = self._half_lib.get_pointer_to_function(fname)
+            assert ptr
+            ll.add_symbol("__" + fname, ptr)
+
         # List available C-math
         for fname in intrinsics.INTR_MATH:
             # Force binding from CPython's C runtime library.
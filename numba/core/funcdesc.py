@@ -33,7 +33,7 @@ class FunctionDescriptor(object):
     __slots__ = ('native', 'modname', 'qualname', 'doc', 'typemap',
                  'calltypes', 'args', 'kws', 'restype', 'argtypes',
                  'mangled_name', 'unique_name', 'env_name', 'global_dict',
-                 'inline', 'noalias', 'abi_tags', 'uid')
+                 'inline', 'noalias', 'abi_tags', 'uid', 'nounwind')
 
     def __init__(self, native, modname, qualname, unique_name, doc,
                  typemap, restype, calltypes, args, kws, mangler=None,
@@ -75,6 +75,8 @@ class FunctionDescriptor(object):
         self.inline = inline
         self.noalias = noalias
         self.abi_tags = abi_tags
+        # Whether the function cannot raise, set when lowering it
+        self.nounwind = False
 
     def lookup_globals(self):
         """
@@ -131,6 +133,14 @@ class FunctionDescriptor(object):
         """
         return 'cfunc.' + self.mangled_name
 
+    @property
+    def llvm_nounwind_func_name(self):
+        """
+        The LLVM-registered name for the variant of the raw function that
+        returns its value directly, for functions that cannot raise.
+        """
+        return 'nounwind.' + self.mangled_name
+
     def __repr__(self):
         return "<function descriptor %r>" % (self.unique_name)
 
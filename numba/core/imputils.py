@@ -190,15 +190,23 @@ def user_function(fndesc, libs):
     """
 
     def imp(context, builder, sig, args):
-        func = context.declare_function(builder.module, fndesc)
-        # env=None assumes this is a nopython function
-        status, retval = context.call_conv.call_function(
-            builder, func, fndesc.restype, fndesc.argtypes, args)
-        with cgutils.if_unlikely(builder, status.is_error):
-            context.call_conv.return_status_propagate(builder, status)
         assert sig.return_type == fndesc.restype
-        # Reconstruct optional return type
-        retval = fix_returning_optional(context, builder, sig, status, retval)
+        if fndesc.nounwind:
+            # The function cannot raise, its variant returning the value
+            # directly is called
+            func = context.declare_nounwind_variant(builder.module, fndesc)
+            arginfo = context.get_arg_packer(fndesc.argtypes)
+            retval = builder.call(func, arginfo.as_arguments(builder, args))
+        else:
+            func = context.declare_function(builder.module, fndesc)
+            # env=None assumes this is a nopython function
+            status, retval = context.call_conv.call_function(
+                builder, func, fndesc.restype, fndesc.argtypes, args)
+            with cgutils.if_unlikely(builder, status.is_error):
+                context.call_conv.return_status_propagate(builder, status)
+            # Reconstruct optional return type
+            retval = fix_returning_optional(context, builder, sig, status,
+                                            retval)
         # If the data representations don't match up
         if retval.type != context.get_value_type(sig.return_type):
             msg = "function returned {0} but expect {1}"
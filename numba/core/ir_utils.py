@@ -773,6 +773,9 @@ def has_no_side_effect(rhs, lives, call_table):
         return False
     if isinstance(rhs, ir.Expr) and rhs.op == 'inplace_binop':
         return rhs.lhs.name not in lives
+    if isinstance(rhs, ir.Expr) and rhs.op == 'arrayexpr':
+        # Array expressions may be evaluated into an existing array
+        return rhs._kws.get('out') is None
     if isinstance(rhs, ir.Yield):
         return False
     if isinstance(rhs, ir.Expr) and rhs.op == 'pair_first':
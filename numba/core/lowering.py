@@ -11,12 +11,15 @@ from numba.core import (typing, utils, types, ir, debuginfo, funcdesc,
                         targetconfig)
 from numba.core.errors import (LoweringError, new_error_context, TypingError,
                                LiteralTypingError, UnsupportedError,
-                               NumbaDebugInfoWarning)
-from numba.core.funcdesc import default_mangler
+                               NumbaDebugInfoWarning, NumbaValueError,
+                               NumbaError)
+from numba.core.cpu_options import NoAliasOptions
+from numba.core.funcdesc import default_mangler, qualifying_prefix
 from numba.core.environment import Environment
 from numba.core.analysis import compute_use_defs, must_use_alloca
 from numba.misc.firstlinefinder import get_func_body_first_lineno
 from numba.misc.coverage_support import get_registered_loc_notify
+from numba.misc import instrumentation, line_profiler
 
 
 _VarArgItem = namedtuple("_VarArgItem", ("vararg", "index"))
@@ -138,6 +141,13 @@ class BaseLower(object):
         if full_debug and 'alwaysinline' not in attributes:
             attributes.add('noinline')
 
+    def array_reuse_slot(self, expr):
+        """
+        Return a pointer to the result of the previous execution of the
+        array expression *expr* if its buffer can be reused, else None.
+        """
+        return None
+
     def post_lower(self):
         """
         Called after all blocks are lowered
@@ -212,9 +222,37 @@ class BaseLower(object):
         # Run target specific post lowering transformation
         self.context.post_lowering(self.module, self.library)
 
+        # Functions that cannot raise get a variant without the status
+        # plumbing, which their callers use
+        if (self.genlower is None and self.context.enable_nounwind_variants
+                and not isinstance(self.fndesc.restype, types.Optional)):
+            fn = self.module.get_global(self.fndesc.llvm_func_name)
+            if self.call_conv.is_nounwind(fn):
+                self.context.create_nounwind_variant(self.module, self.fndesc)
+                self.fndesc.nounwind = True
+
+        self.describe_symbols()
+
         # Materialize LLVM Module
         self.library.add_ir_module(self.module)
 
+    def describe_symbols(self):
+        """
+        Describe the symbols of the function (and its wrappers) to the
+        library with the Python qualified name and the signature.
+        """
+        fndesc = self.fndesc
+        desc = "%s(%s)" % (qualifying_prefix(fndesc.modname, fndesc.qualname),
+                           ", ".join(map(str, fndesc.argtypes)))
+        self.library.describe_symbol(fndesc.llvm_func_name, desc)
+        self.library.describe_symbol(fndesc.llvm_cpython_wrapper_name,
+                                     desc + " [cpython wrapper]")
+        self.library.describe_symbol(fndesc.llvm_cfunc_wrapper_name,
+                                     desc + " [cfunc wrapper]")
+        if fndesc.nounwind:
+            self.library.describe_symbol(fndesc.llvm_nounwind_func_name,
+                                         desc + " [nounwind variant]")
+
     def extract_function_arguments(self):
         self.fnargs = self.call_conv.decode_arguments(self.builder,
                                                       self.fndesc.argtypes,
@@ -225,7 +263,11 @@ class BaseLower(object):
         """
         Lower non-generator *fndesc*.
         """
-        self.setup_function(fndesc)
+        if self.flags.instrument:
+            # The body is called through a stub updating the call counters
+            self.setup_function(instrumentation.body_fndesc(fndesc))
+        else:
+            self.setup_function(fndesc)
 
         # Init argument values
         self.extract_function_arguments()
@@ -238,6 +280,10 @@ class BaseLower(object):
             self.builder.position_at_end(entry_block_tail)
             self.builder.branch(self.blkmap[self.firstblk])
 
+        if self.flags.instrument:
+            instrumentation.lower_stub(self.context, self.module, fndesc,
+                                       self.function)
+
     def lower_function_body(self):
         """
         Lower the current function's body, and return the entry block.
@@ -352,10 +398,142 @@ class BaseLower(object):
 class Lower(BaseLower):
     GeneratorLower = generators.GeneratorLower
 
+    # The maximum number of functions called directly at a call site of a
+    # first-class function
+    _max_devirtualized_calls = 4
+
     def init(self):
         super().init()
         # find all singly assigned variables
         self._find_singly_assigned_variable()
+        self._line_profile = self.flags is not None and self.flags.line_profile
+        # find the small arrays that can be allocated on the stack
+        self._stack_arrays = {}
+        if self.context.enable_nrt:
+            from numba.np.stack_arrays import find_stack_arrays
+            self._stack_arrays = find_stack_arrays(self.func_ir,
+                                                   self.fndesc.typemap)
+        # find the array expressions in loops whose buffer can be reused
+        self._reused_array_exprs = []
+        if self.context.enable_nrt:
+            from numba.np.ufunc.array_exprs import find_reusable_array_exprs
+            self._reused_array_exprs = find_reusable_array_exprs(
+                self.func_ir, self.fndesc.typemap)
+        # find the bounds checks of array accesses that can be hoisted out
+        # of the enclosing loops
+        self._loop_boundschecks = {}
+        self._access_boundschecks = {}
+        if self.context.enable_boundscheck and self.generator_info is None:
+            from numba.np.boundscheck_hoisting import (
+                find_hoisted_boundschecks)
+            self._loop_boundschecks, self._access_boundschecks = \
+                find_hoisted_boundschecks(self.func_ir, self.fndesc.typemap)
+
+    def pre_lower(self):
+        super().pre_lower()
+        # Create the slots holding a reference to the last result of the
+        # array expressions whose buffer is reused
+        self._array_reuse_slots = {}
+        for stmt in self._reused_array_exprs:
+            ty = self.typeof(stmt.target.name)
+            slot = cgutils.alloca_once(self.builder,
+                                       self.context.get_value_type(ty),
+                                       name="reuse." + stmt.target.name)
+            self._array_reuse_slots[id(stmt.value)] = ty, slot
+        # Create the slots holding the results of the bounds checks hoisted
+        # out of loops
+        self._boundscheck_slots = {}
+        for iterator, checks in self._loop_boundschecks.items():
+            for check in checks:
+                slot = cgutils.alloca_once(self.builder,
+                                           llvmlite.ir.IntType(1),
+                                           name="boundscheck." + iterator)
+                self._boundscheck_slots[iterator, check] = slot
+        if self.fndesc.noalias and self.generator_info is None:
+            self.lower_noalias_check()
+
+    def lower_loop_boundschecks(self, inst):
+        """
+        Evaluate the bounds checks hoisted out of the loop iterating over
+        the range iterator created by *inst*.
+        """
+        from numba.np.boundscheck_hoisting import lower_loop_boundscheck
+
+        iterator = inst.target.name
+        rangevar = inst.value.value
+        state = self.context.make_helper(self.builder,
+                                         self.typeof(rangevar.name),
+                                         self.loadvar(rangevar.name))
+        for check in self._loop_boundschecks[iterator]:
+            arrty = self.typeof(check.array)
+            ary = self.context.make_array(arrty)(self.context, self.builder,
+                                                 self.loadvar(check.array))
+            ok = lower_loop_boundscheck(self.context, self.builder, arrty,
+                                        ary, state, check)
+            self.builder.store(ok, self._boundscheck_slots[iterator, check])
+
+    def lower_noalias_check(self):
+        """
+        Check that the data of the array arguments declared noalias does
+        not overlap.  The check is only emitted when bounds checking is
+        enabled.
+        """
+        from numba.np.arrayobj import (get_array_memory_extents,
+                                       extents_may_overlap)
+
+        noalias = NoAliasOptions(self.fndesc.noalias)
+        if noalias.args:
+            unknown = noalias.args - set(self.fndesc.args)
+            if unknown:
+                msg = "noalias names unknown arguments: %s"
+                raise NumbaValueError(msg % ", ".join(sorted(unknown)))
+        if not self.context.enable_boundscheck:
+            return
+
+        builder = self.builder
+        extents = []
+        for name, ty, val in zip(self.fndesc.args, self.fndesc.argtypes,
+                                 self.fnargs):
+            if not isinstance(ty, types.Array):
+                continue
+            ary = self.context.make_array(ty)(self.context, builder, val)
+            shapes = cgutils.unpack_tuple(builder, ary.shape, ty.ndim)
+            strides = cgutils.unpack_tuple(builder, ary.strides, ty.ndim)
+            start, end = get_array_memory_extents(self.context, builder, ty,
+                                                  ary, shapes, strides,
+                                                  ary.data)
+            extents.append((name, start, end))
+        # A noalias array must not overlap any other array argument, empty
+        # arrays do not overlap anything
+        for i, (a_name, a_start, a_end) in enumerate(extents):
+            for b_name, b_start, b_end in extents[i + 1:]:
+                if not (noalias.applies_to(a_name) or
+                        noalias.applies_to(b_name)):
+                    continue
+                overlap = extents_may_overlap(self.context, builder,
+                                              a_start, a_end, b_start, b_end)
+                nonempty = builder.and_(
+                    builder.icmp_unsigned('<', a_start, a_end),
+                    builder.icmp_unsigned('<', b_start, b_end))
+                with cgutils.if_unlikely(builder,
+                                         builder.and_(overlap, nonempty)):
+                    msg = ("noalias arguments %s and %s overlap in memory"
+                           % (a_name, b_name))
+                    self.call_conv.return_user_exc(builder, ValueError,
+                                                   (msg,))
+
+    def array_reuse_slot(self, expr):
+        ty_slot = self._array_reuse_slots.get(id(expr))
+        return None if ty_slot is None else ty_slot[1]
+
+    def release_array_reuse_slots(self):
+        """
+        Release the references held by the array reuse slots.  This is
+        done when returning, the slots are leaked (like the live variables)
+        when an exception is raised.
+        """
+        for ty, slot in self._array_reuse_slots.values():
+            self.decref(ty, self.builder.load(slot))
 
     @property
     def _disable_sroa_like_opt(self):
@@ -412,6 +590,9 @@ class Lower(BaseLower):
 
         super(Lower, self).pre_block(block)
         self._cur_ir_block = block
+        # The line recorded for the line profiler is not known on block entry
+        self._profiled_key = None
+        self._profiled_inst = None
 
         if block == self.firstblk:
             # create slots for all the vars, irrespective of whether they are
@@ -453,10 +634,25 @@ class Lower(BaseLower):
             pass
 
     def lower_inst(self, inst):
+        checks = self._access_boundschecks.get(id(inst))
+        if checks and self.context.boundscheck_guard is None:
+            # The array access only checks its indices if the checks hoisted
+            # out of the enclosing loops fail
+            slots = [self._boundscheck_slots[key] for key in checks]
+            guard = self.builder.load(slots[0])
+            for slot in slots[1:]:
+                guard = self.builder.and_(guard, self.builder.load(slot))
+            self.context.boundscheck_guard = guard
+            try:
+                return self.lower_inst(inst)
+            finally:
+                self.context.boundscheck_guard = None
         # Set debug location for all subsequent LL instructions
         self.debuginfo.mark_location(self.builder, self.loc.line)
         self.notify_loc(self.loc)
         self.debug_print(str(inst))
+        if self._line_profile:
+            self.lower_line_profile(inst)
         if isinstance(inst, ir.Assign):
             ty = self.typeof(inst.target.name)
             val = self.lower_assign(ty, inst)
@@ -468,6 +664,8 @@ class Lower(BaseLower):
                 self.debuginfo.mark_location(self.builder, self.defn_loc.line)
                 argidx = inst.value.index + 1 # args start at 1
             self.storevar(val, inst.target.name, argidx=argidx)
+            if inst.target.name in self._loop_boundschecks:
+                self.lower_loop_boundschecks(inst)
 
         elif isinstance(inst, ir.Branch):
             cond = self.loadvar(inst.cond.name)
@@ -489,6 +687,7 @@ class Lower(BaseLower):
                 # StopIteration
                 self.genlower.return_from_generator(self)
                 return
+            self.release_array_reuse_slots()
             val = self.loadvar(inst.value.name)
             oty = self.typeof(inst.value.name)
             ty = self.fndesc.restype
@@ -592,6 +791,34 @@ class Lower(BaseLower):
         else:
             raise NotImplementedError(type(inst))
 
+    def lower_line_profile(self, inst):
+        """
+        Record the line of *inst* for the sampling line profiler (see
+        numba.misc.line_profiler), unless it is already recorded.  The
+        line is cleared when leaving the function, so it is stored again
+        after any instruction that may call a profiled function.
+        """
+        if isinstance(inst, (ir.Return, ir.Raise, ir.StaticRaise,
+                             ir.DynamicRaise)):
+            key = 0
+        elif isinstance(self.loc.line, int) and self.loc.line > 0:
+            key = line_profiler.line_key(self.loc.filename, self.loc.line)
+        else:
+            return
+        prev = self._profiled_inst
+        may_call = prev is not None and (
+            type(prev).__module__ != ir.__name__ or
+            (isinstance(prev, ir.Assign) and isinstance(prev.value, ir.Expr)
+             and prev.value.op == 'call'))
+        self._profiled_inst = inst
+        if key == self._profiled_key and not may_call:
+            return
+        self._profiled_key = key
+        slot = self.context.get_c_value(self.builder, llvmlite.ir.IntType(64),
+                                        "numba_line_profiler_current")
+        self.builder.store_atomic(llvmlite.ir.IntType(64)(key), slot,
+                                  ordering='monotonic', align=8)
+
     def lower_setitem(self, target_var, index_var, value_var, signature):
         target = self.loadvar(target_var.name)
         value = self.loadvar(value_var.name)
@@ -663,6 +890,11 @@ class Lower(BaseLower):
 
     def lower_assign(self, ty, inst):
         value = inst.value
+        if inst.target.name in self._stack_arrays:
+            from numba.np.stack_arrays import make_stack_array
+            kind, shape = self._stack_arrays[inst.target.name]
+            return make_stack_array(self.context, self.builder, ty, shape,
+                                    kind)
         # In nopython mode, closure vars are frozen like globals
         if isinstance(value, (ir.Const, ir.Global, ir.FreeVar)):
             res = self.context.get_constant_generic(self.builder, ty,
@@ -671,7 +903,16 @@ class Lower(BaseLower):
             return res
 
         elif isinstance(value, ir.Expr):
-            return self.lower_expr(ty, value)
+            res = self.lower_expr(ty, value)
+            if value.op == 'call':
+                # The alignment of the arrays allocated by a callee is not
+                # visible once the callee is compiled
+                from numba.np.arrayobj import (allocates_aligned_array,
+                                               assume_aligned_array)
+                fnty = self.typeof(value.func.name)
+                if allocates_aligned_array(fnty, ty):
+                    assume_aligned_array(self.context, self.builder, ty, res)
+            return res
 
         elif isinstance(value, ir.Var):
             val = self.loadvar(value.name)
@@ -1145,6 +1386,24 @@ class Lower(BaseLower):
         res_slot = cgutils.alloca_once(builder,
                                        ctx.get_value_type(sig.return_type))
 
+        # The functions this value may have been created from in this
+        # function are called directly when their address matches, so that
+        # they can be inlined
+        bb_end = builder.append_basic_block(f'end_call_of_{fname}')
+        for cres in self.__get_first_class_function_candidates(fname, sig):
+            fn = ctx.declare_function(builder.module, cres.fndesc)
+            ctx.active_code_library.add_linking_library(cres.library)
+            is_fn = builder.icmp_unsigned(
+                '==', jit_addr, builder.bitcast(fn, jit_addr.type))
+            bb_direct = builder.append_basic_block()
+            bb_next = builder.append_basic_block()
+            builder.cbranch(is_fn, bb_direct, bb_next)
+            builder.position_at_end(bb_direct)
+            res = ctx.call_internal(builder, cres.fndesc, sig, argvals)
+            builder.store(res, res_slot)
+            builder.branch(bb_end)
+            builder.position_at_end(bb_next)
+
         if_jit_addr_is_null = builder.if_else(
             cgutils.is_null(builder, jit_addr),
             likely=False
@@ -1169,8 +1428,53 @@ class Lower(BaseLower):
                 with cgutils.if_unlikely(builder, status.is_error):
                     context.call_conv.return_status_propagate(builder, status)
                 builder.store(res, res_slot)
+        builder.branch(bb_end)
+        builder.position_at_end(bb_end)
         return builder.load(res_slot)
 
+    def __get_first_class_function_candidates(self, fname, sig):
+        """
+        Returns the compile results, for the signature `sig`, of the
+        dispatchers from which the first-class function variable `fname` may
+        have been created in this function. These are found by following the
+        definitions of the variable through copies, tuples and their
+        indexing. Values of unknown origin, e.g. arguments, are ignored, so
+        the function may be another one.
+        """
+        from numba.core.dispatcher import Dispatcher
+
+        dispatchers = []
+        seen = set()
+        work_list = [ir.Var(None, fname, self.loc)]
+        while work_list:
+            value = work_list.pop()
+            if isinstance(value, ir.Var):
+                if value.name not in seen:
+                    seen.add(value.name)
+                    work_list.extend(
+                        self.func_ir._definitions.get(value.name, ()))
+            elif isinstance(value, (ir.Global, ir.FreeVar)):
+                if (isinstance(value.value, Dispatcher)
+                        and value.value not in dispatchers):
+                    dispatchers.append(value.value)
+            elif isinstance(value, ir.Expr):
+                if value.op == 'build_tuple':
+                    work_list.extend(value.items)
+                elif value.op in ('getitem', 'static_getitem',
+                                  'typed_getitem', 'cast'):
+                    work_list.append(value.value)
+
+        candidates = []
+        for dispatcher in dispatchers[:self._max_devirtualized_calls]:
+            try:
+                cres = dispatcher.get_compile_result(sig)
+            except NumbaError:
+                continue
+            if cres.objectmode:
+                continue
+            candidates.append(cres)
+        return candidates
+
     def __get_first_class_function_pointer(self, ftype, fname, sig):
         from numba.experimental.function_type import lower_get_wrapper_address
 
@@ -78,6 +78,8 @@ class DefaultOptions:
     _nrt = _mapping("nrt")
     debug = _mapping("debuginfo")
     boundscheck = _mapping("boundscheck")
+    wraparound = _mapping("wraparound")
+    cdivision = _mapping("cdivision")
     nogil = _mapping("release_gil")
     writable_args = _mapping("writable_args")
 
@@ -87,9 +89,12 @@ class DefaultOptions:
 
     parallel = _mapping("auto_parallel")
     fastmath = _mapping("fastmath")
+    noalias = _mapping("noalias")
     error_model = _mapping("error_model")
     inline = _mapping("inline")
     forceinline = _mapping("forceinline")
+    line_profile = _mapping("line_profile")
+    instrument = _mapping("instrument")
 
     _dbg_extend_lifetimes = _mapping("dbg_extend_lifetimes")
     _dbg_optnone = _mapping("dbg_optnone")
@@ -17,6 +17,21 @@ memsys_use_cpython_allocator(PyObject *self, PyObject *args) {
     Py_RETURN_NONE;
 }
 
+static PyObject *
+memsys_use_pool_allocator(PyObject *self, PyObject *args) {
+    NRT_MemSys_use_pool_allocator();
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+memsys_pool_allocator_enabled(PyObject *self, PyObject *args) {
+    if (NRT_MemSys_pool_allocator_enabled()) {
+        Py_RETURN_TRUE;
+    } else {
+        Py_RETURN_FALSE;
+    }
+}
+
 static PyObject *
 memsys_get_stats_alloc(PyObject *self, PyObject *args) {
     if(!NRT_MemSys_stats_enabled()) {
@@ -53,6 +68,24 @@ memsys_get_stats_mi_free(PyObject *self, PyObject *args) {
     return PyLong_FromSize_t(NRT_MemSys_get_stats_mi_free());
 }
 
+static PyObject *
+memsys_get_stats_pool_hits(PyObject *self, PyObject *args) {
+    if(!NRT_MemSys_stats_enabled()) {
+        PyErr_SetString(PyExc_RuntimeError, "NRT stats are disabled.");
+        return NULL;
+    }
+    return PyLong_FromSize_t(NRT_MemSys_get_stats_pool_hits());
+}
+
+static PyObject *
+memsys_get_stats_pool_misses(PyObject *self, PyObject *args) {
+    if(!NRT_MemSys_stats_enabled()) {
+        PyErr_SetString(PyExc_RuntimeError, "NRT stats are disabled.");
+        return NULL;
+    }
+    return PyLong_FromSize_t(NRT_MemSys_get_stats_pool_misses());
+}
+
 static PyObject *
 memsys_stats_enabled(PyObject *self, PyObject *args) {
     if (NRT_MemSys_stats_enabled()) {
@@ -74,6 +107,68 @@ memsys_disable_stats(PyObject *self, PyObject *args) {
     Py_RETURN_NONE;
 }
 
+static PyObject *
+memsys_enable_site_stats(PyObject *self, PyObject *args) {
+    PyObject *addr;
+    void *current;
+    if (!PyArg_ParseTuple(args, "O", &addr)) {
+        return NULL;
+    }
+    current = PyLong_AsVoidPtr(addr);
+    if (current == NULL) {
+        if (!PyErr_Occurred())
+            PyErr_SetString(PyExc_ValueError, "invalid line slot address");
+        return NULL;
+    }
+    NRT_MemSys_enable_site_stats((const volatile int64_t *)current);
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+memsys_disable_site_stats(PyObject *self, PyObject *args) {
+    NRT_MemSys_disable_site_stats();
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+memsys_reset_site_stats(PyObject *self, PyObject *args) {
+    NRT_MemSys_reset_site_stats();
+    Py_RETURN_NONE;
+}
+
+/*
+ * Return a tuple (entries, dropped) where *entries* is a list of
+ * (site, count, bytes, live, peak) tuples.
+ */
+static PyObject *
+memsys_get_site_stats(PyObject *self, PyObject *args) {
+    int64_t site;
+    size_t index, count, bytes, live, peak;
+    PyObject *entries = PyList_New(0);
+    if (entries == NULL) {
+        return NULL;
+    }
+    for (index = 0;
+         NRT_MemSys_get_site_stats(index, &site, &count, &bytes, &live, &peak);
+         index++) {
+        PyObject *entry;
+        if (site == 0) {
+            continue;
+        }
+        entry = Py_BuildValue("Lnnnn", (long long)site, (Py_ssize_t)count,
+                              (Py_ssize_t)bytes, (Py_ssize_t)live,
+                              (Py_ssize_t)peak);
+        if (entry == NULL || PyList_Append(entries, entry)) {
+            Py_XDECREF(entry);
+            Py_DECREF(entries);
+            return NULL;
+        }
+        Py_DECREF(entry);
+    }
+    return Py_BuildValue("Nn", entries,
+                         (Py_ssize_t)NRT_MemSys_get_site_stats_dropped());
+}
+
 /*
  * Create a new MemInfo with a owner PyObject
  */
@@ -126,14 +221,22 @@ static PyMethodDef ext_methods[] = {
 #define declmethod(func) { #func , ( PyCFunction )func , METH_VARARGS , NULL }
 #define declmethod_noargs(func) { #func , ( PyCFunction )func , METH_NOARGS, NULL }
     declmethod_noargs(memsys_use_cpython_allocator),
+    declmethod_noargs(memsys_use_pool_allocator),
+    declmethod_noargs(memsys_pool_allocator_enabled),
     declmethod_noargs(memsys_shutdown),
     declmethod_noargs(memsys_get_stats_alloc),
     declmethod_noargs(memsys_get_stats_free),
     declmethod_noargs(memsys_get_stats_mi_alloc),
     declmethod_noargs(memsys_get_stats_mi_free),
+    declmethod_noargs(memsys_get_stats_pool_hits),
+    declmethod_noargs(memsys_get_stats_pool_misses),
     declmethod_noargs(memsys_stats_enabled),
     declmethod_noargs(memsys_enable_stats),
     declmethod_noargs(memsys_disable_stats),
+    declmethod(memsys_enable_site_stats),
+    declmethod_noargs(memsys_disable_site_stats),
+    declmethod_noargs(memsys_reset_site_stats),
+    declmethod_noargs(memsys_get_site_stats),
     declmethod(meminfo_new),
     declmethod(meminfo_alloc),
     declmethod(meminfo_alloc_safe),
@@ -12,6 +12,15 @@
 #include "assert.h"
 
 
+/* Allocation statistics of a source line, see NRT_MemSys_enable_site_stats */
+struct NRT_SiteStats {
+    std::atomic<int64_t>   site;  /* 0 for an unused entry */
+    std::atomic_size_t     count;
+    std::atomic_size_t     bytes;
+    std::atomic_size_t     live;
+    std::atomic_size_t     peak;
+};
+
 /* NOTE: if changing the layout, please update numba.core.runtime.atomicops */
 extern "C" {
 struct MemInfo {
@@ -21,6 +30,7 @@ struct MemInfo {
     void              *data;
     size_t            size;    /* only used for NRT allocated memory */
     NRT_ExternalAllocator *external_allocator;
+    NRT_SiteStats     *site;   /* only set when profiling allocation sites */
 };
 }
 
@@ -54,7 +64,18 @@ struct NRT_MemSys {
         std::atomic_size_t free;
         std::atomic_size_t mi_alloc;
         std::atomic_size_t mi_free;
+        /* Pooled allocator requests served from / missing the pool */
+        std::atomic_size_t pool_hits;
+        std::atomic_size_t pool_misses;
     } stats;
+    /* Allocation site profiling */
+    struct {
+        bool enabled;
+        /* Slot holding the identifier of the executing source line */
+        const volatile int64_t *current;
+        /* Allocations that could not be recorded as the table was full */
+        std::atomic_size_t dropped;
+    } sites;
     /* System allocation functions */
     struct {
         NRT_malloc_func malloc;
@@ -67,6 +88,12 @@ struct NRT_MemSys {
 /* The Memory System object */
 static NRT_MemSys TheMSys;
 
+/* The allocation statistics per source line (open addressing table) */
+#define NRT_SITE_TABLE_SIZE 4096  /* must be a power of two */
+static NRT_SiteStats TheSiteStats[NRT_SITE_TABLE_SIZE];
+/* The key of the allocations made outside of profiled code */
+#define NRT_UNKNOWN_SITE ((int64_t)-1)
+
 
 extern "C" void NRT_MemSys_init(void) {
     TheMSys.shutting = 0;
@@ -76,6 +103,10 @@ extern "C" void NRT_MemSys_init(void) {
     TheMSys.stats.free = 0;
     TheMSys.stats.mi_alloc = 0;
     TheMSys.stats.mi_free = 0;
+    TheMSys.stats.pool_hits = 0;
+    TheMSys.stats.pool_misses = 0;
+    // Allocation site stats are off by default too
+    TheMSys.sites.enabled = false;
     /* Bind to libc allocator */
     TheMSys.allocator.malloc = malloc;
     TheMSys.allocator.realloc = realloc;
@@ -98,6 +129,76 @@ extern "C" size_t NRT_MemSys_stats_enabled(void) {
     return (size_t)TheMSys.stats.enabled;
 }
 
+extern "C" void NRT_MemSys_enable_site_stats(const volatile int64_t *current) {
+    TheMSys.sites.current = current;
+    TheMSys.sites.enabled = true;
+}
+
+extern "C" void NRT_MemSys_disable_site_stats(void) {
+    TheMSys.sites.enabled = false;
+}
+
+extern "C" void NRT_MemSys_reset_site_stats(void) {
+    for (size_t i = 0; i < NRT_SITE_TABLE_SIZE; i++) {
+        /* Live bytes are kept as their blocks are still accounted */
+        TheSiteStats[i].count = 0;
+        TheSiteStats[i].bytes = 0;
+        TheSiteStats[i].peak = TheSiteStats[i].live.load();
+    }
+    TheMSys.sites.dropped = 0;
+}
+
+extern "C" size_t NRT_MemSys_get_site_stats(size_t index, int64_t *site,
+                                            size_t *count, size_t *bytes,
+                                            size_t *live, size_t *peak) {
+    if (index >= NRT_SITE_TABLE_SIZE) {
+        return 0;
+    }
+    NRT_SiteStats *entry = &TheSiteStats[index];
+    *site = entry->site;
+    *count = entry->count;
+    *bytes = entry->bytes;
+    *live = entry->live;
+    *peak = entry->peak;
+    return 1;
+}
+
+extern "C" size_t NRT_MemSys_get_site_stats_dropped(void) {
+    return TheMSys.sites.dropped;
+}
+
+/* Find or insert the statistics entry of the currently executing line */
+static NRT_SiteStats *nrt_site_lookup(void) {
+    int64_t site = *TheMSys.sites.current;
+    if (site == 0)
+        site = NRT_UNKNOWN_SITE;
+    size_t i = (size_t)(((uint64_t)site * 0x9E3779B97F4A7C15ULL) >> 52);
+    for (size_t probe = 0; probe < NRT_SITE_TABLE_SIZE; probe++) {
+        NRT_SiteStats *entry = &TheSiteStats[(i + probe) &
+                                             (NRT_SITE_TABLE_SIZE - 1)];
+        int64_t found = entry->site;
+        if (found == 0) {
+            int64_t expected = 0;
+            if (entry->site.compare_exchange_strong(expected, site))
+                return entry;
+            found = expected;
+        }
+        if (found == site)
+            return entry;
+    }
+    TheMSys.sites.dropped++;
+    return NULL;
+}
+
+/* Account for *size* more bytes allocated at the *entry* site */
+static void nrt_site_add(NRT_SiteStats *entry, size_t size) {
+    size_t live = (entry->live += size);
+    size_t peak = entry->peak;
+    while (live > peak && !entry->peak.compare_exchange_weak(peak, live)) {
+    }
+    entry->bytes += size;
+}
+
 extern "C" void NRT_MemSys_set_allocator(NRT_malloc_func malloc_func,
                               NRT_realloc_func realloc_func,
                               NRT_free_func free_func)
@@ -149,6 +250,24 @@ extern "C" size_t NRT_MemSys_get_stats_mi_alloc() {
     }
 }
 
+extern "C" size_t NRT_MemSys_get_stats_pool_hits() {
+    if (TheMSys.stats.enabled)
+    {
+        return TheMSys.stats.pool_hits.load();
+    } else {
+        return _DISABLED_STATS_VALUE;
+    }
+}
+
+extern "C" size_t NRT_MemSys_get_stats_pool_misses() {
+    if (TheMSys.stats.enabled)
+    {
+        return TheMSys.stats.pool_misses.load();
+    } else {
+        return _DISABLED_STATS_VALUE;
+    }
+}
+
 extern "C" size_t NRT_MemSys_get_stats_mi_free() {
     if (TheMSys.stats.enabled)
     {
@@ -172,6 +291,14 @@ extern "C" void NRT_MemInfo_init(NRT_MemInfo *mi,void *data, size_t size,
     mi->data = data;
     mi->size = size;
     mi->external_allocator = external_allocator;
+    mi->site = NULL;
+    if (TheMSys.sites.enabled) {
+        mi->site = nrt_site_lookup();
+        if (mi->site) {
+            mi->site->count++;
+            nrt_site_add(mi->site, size);
+        }
+    }
     NRT_Debug(nrt_debug_print("NRT_MemInfo_init mi=%p external_allocator=%p\n", mi, external_allocator));
     /* Update stats */
     if (TheMSys.stats.enabled)
@@ -380,6 +507,9 @@ extern "C" void NRT_dealloc(NRT_MemInfo *mi) {
 }
 
 extern "C" void NRT_MemInfo_destroy(NRT_MemInfo *mi) {
+    if (mi->site) {
+        mi->site->live -= mi->size;
+    }
     NRT_dealloc(mi);
     if (TheMSys.stats.enabled)
     {
@@ -482,6 +612,10 @@ extern "C" void *NRT_MemInfo_varsize_alloc(NRT_MemInfo *mi, size_t size)
     mi->data = NRT_Allocate(size);
     if (mi->data == NULL)
         return NULL;
+    if (mi->site) {
+        mi->site->live -= mi->size;
+        nrt_site_add(mi->site, size);
+    }
     mi->size = size;
     NRT_Debug(nrt_debug_print("NRT_MemInfo_varsize_alloc %p size=%zu "
                               "-> data=%p\n", mi, size, mi->data));
@@ -498,6 +632,10 @@ extern "C" void *NRT_MemInfo_varsize_realloc(NRT_MemInfo *mi, size_t size)
     mi->data = NRT_Reallocate(mi->data, size);
     if (mi->data == NULL)
         return NULL;
+    if (mi->site) {
+        mi->site->live -= mi->size;
+        nrt_site_add(mi->site, size);
+    }
     mi->size = size;
     NRT_Debug(nrt_debug_print("NRT_MemInfo_varsize_realloc %p size=%zu "
                               "-> data=%p\n", mi, size, mi->data));
@@ -511,6 +649,150 @@ extern "C" void NRT_MemInfo_varsize_free(NRT_MemInfo *mi, void *ptr)
         mi->data = NULL;
 }
 
+/*
+ * Pooled allocator.
+ *
+ * Blocks of up to NRT_POOL_MAX_SIZE bytes are rounded up to a power of two
+ * size class and, once freed, kept in a per-thread freelist of their class
+ * to serve the next allocations of that class without going through the
+ * system allocator.  Every block is allocated on its own by the system
+ * allocator, with a header recording its size class, so that a block can
+ * be freed by any thread: it then joins the freelist of the freeing thread.
+ * The freelists are bounded, the blocks in excess (and the larger blocks)
+ * are returned to the system allocator.
+ */
+
+#define NRT_POOL_MIN_SHIFT 5    /* smallest class: 32 bytes */
+#define NRT_POOL_NCLASSES 12    /* largest class: 64 KiB */
+#define NRT_POOL_MAX_SIZE ((size_t)1 << (NRT_POOL_MIN_SHIFT + NRT_POOL_NCLASSES - 1))
+#define NRT_POOL_LARGE NRT_POOL_NCLASSES
+/* The header keeps the 16 bytes alignment of the system allocator */
+#define NRT_POOL_HEADER 16
+/* The bytes kept in each freelist of a thread */
+#define NRT_POOL_CACHE_BYTES ((size_t)1 << 20)
+
+/* The allocation functions backing the pool */
+static struct {
+    NRT_malloc_func malloc;
+    NRT_realloc_func realloc;
+    NRT_free_func free;
+} nrt_pool_backing;
+
+struct NRT_PoolBlock {
+    NRT_PoolBlock *next;
+};
+
+struct NRT_PoolCache {
+    NRT_PoolBlock *heads[NRT_POOL_NCLASSES];
+    size_t counts[NRT_POOL_NCLASSES];
+    bool dead;
+
+    ~NRT_PoolCache() {
+        for (size_t cls = 0; cls < NRT_POOL_NCLASSES; cls++) {
+            while (heads[cls]) {
+                NRT_PoolBlock *blk = heads[cls];
+                heads[cls] = blk->next;
+                nrt_pool_backing.free((char *)blk - NRT_POOL_HEADER);
+            }
+        }
+        dead = true;
+    }
+};
+
+static thread_local NRT_PoolCache nrt_pool_cache;
+
+static size_t nrt_pool_class(size_t size) {
+    size_t cls = 0;
+    if (size > NRT_POOL_MAX_SIZE)
+        return NRT_POOL_LARGE;
+    while (((size_t)1 << (cls + NRT_POOL_MIN_SHIFT)) < size)
+        cls++;
+    return cls;
+}
+
+static size_t nrt_pool_class_size(size_t cls) {
+    return (size_t)1 << (cls + NRT_POOL_MIN_SHIFT);
+}
+
+static void *nrt_pool_malloc(size_t size) {
+    size_t cls = nrt_pool_class(size);
+    if (cls != NRT_POOL_LARGE) {
+        NRT_PoolCache &cache = nrt_pool_cache;
+        NRT_PoolBlock *blk = cache.dead ? NULL : cache.heads[cls];
+        if (blk) {
+            cache.heads[cls] = blk->next;
+            cache.counts[cls]--;
+            if (TheMSys.stats.enabled)
+                TheMSys.stats.pool_hits++;
+            return blk;
+        }
+        if (TheMSys.stats.enabled)
+            TheMSys.stats.pool_misses++;
+        size = nrt_pool_class_size(cls);
+    }
+    char *base = (char *)nrt_pool_backing.malloc(size + NRT_POOL_HEADER);
+    if (base == NULL)
+        return NULL;
+    *(size_t *)base = cls;
+    return base + NRT_POOL_HEADER;
+}
+
+static void nrt_pool_free(void *ptr) {
+    if (ptr == NULL)
+        return;
+    char *base = (char *)ptr - NRT_POOL_HEADER;
+    size_t cls = *(size_t *)base;
+    if (cls != NRT_POOL_LARGE) {
+        NRT_PoolCache &cache = nrt_pool_cache;
+        if (!cache.dead && cache.counts[cls] * nrt_pool_class_size(cls)
+                           < NRT_POOL_CACHE_BYTES) {
+            NRT_PoolBlock *blk = (NRT_PoolBlock *)ptr;
+            blk->next = cache.heads[cls];
+            cache.heads[cls] = blk;
+            cache.counts[cls]++;
+            return;
+        }
+    }
+    nrt_pool_backing.free(base);
+}
+
+static void *nrt_pool_realloc(void *ptr, size_t size) {
+    if (ptr == NULL)
+        return nrt_pool_malloc(size);
+    char *base = (char *)ptr - NRT_POOL_HEADER;
+    size_t cls = *(size_t *)base;
+    if (cls == NRT_POOL_LARGE) {
+        base = (char *)nrt_pool_backing.realloc(base, size + NRT_POOL_HEADER);
+        return base ? base + NRT_POOL_HEADER : NULL;
+    }
+    size_t capacity = nrt_pool_class_size(cls);
+    if (size <= capacity)
+        return ptr;
+    void *new_ptr = nrt_pool_malloc(size);
+    if (new_ptr == NULL)
+        return NULL;
+    memcpy(new_ptr, ptr, capacity);
+    nrt_pool_free(ptr);
+    return new_ptr;
+}
+
+extern "C" void NRT_MemSys_use_pool_allocator(void) {
+    if (TheMSys.allocator.malloc == nrt_pool_malloc)
+        return;
+    NRT_malloc_func backing_malloc = TheMSys.allocator.malloc;
+    NRT_realloc_func backing_realloc = TheMSys.allocator.realloc;
+    NRT_free_func backing_free = TheMSys.allocator.free;
+    NRT_MemSys_set_allocator(nrt_pool_malloc, nrt_pool_realloc,
+                             nrt_pool_free);
+    nrt_pool_backing.malloc = backing_malloc;
+    nrt_pool_backing.realloc = backing_realloc;
+    nrt_pool_backing.free = backing_free;
+}
+
+extern "C" size_t NRT_MemSys_pool_allocator_enabled(void) {
+    return TheMSys.allocator.malloc == nrt_pool_malloc;
+}
+
 /*
  * Low-level allocation wrappers.
  */
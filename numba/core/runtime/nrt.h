@@ -8,6 +8,7 @@ All functions described here are threadsafe.
 
 #include <stdlib.h>
 #include <stdio.h>
+#include <stdint.h>
 #include "../../_numba_common.h"
 
 #include "nrt_external.h"
@@ -48,6 +49,19 @@ void NRT_MemSys_shutdown(void);
 VISIBILITY_HIDDEN
 void NRT_MemSys_set_allocator(NRT_malloc_func, NRT_realloc_func, NRT_free_func);
 
+/*
+ * Switch to the pooled allocator, backed by the current system allocation
+ * functions.  This must be done before any allocation is made.
+ */
+VISIBILITY_HIDDEN
+void NRT_MemSys_use_pool_allocator(void);
+
+/*
+ * Query whether the pooled allocator is in use.
+ */
+VISIBILITY_HIDDEN
+size_t NRT_MemSys_pool_allocator_enabled(void);
+
 /*
  * Enable the internal statistics counters.
  */
@@ -78,6 +92,46 @@ VISIBILITY_HIDDEN
 size_t NRT_MemSys_get_stats_mi_alloc(void);
 VISIBILITY_HIDDEN
 size_t NRT_MemSys_get_stats_mi_free(void);
+VISIBILITY_HIDDEN
+size_t NRT_MemSys_get_stats_pool_hits(void);
+VISIBILITY_HIDDEN
+size_t NRT_MemSys_get_stats_pool_misses(void);
+
+/*
+ * Enable the per source line allocation statistics.  *current* points to
+ * the slot holding the identifier of the source line being executed (see
+ * numba.misc.line_profiler), allocations are attributed to that line.
+ */
+VISIBILITY_HIDDEN
+void NRT_MemSys_enable_site_stats(const volatile int64_t *current);
+
+/*
+ * Disable the per source line allocation statistics.
+ */
+VISIBILITY_HIDDEN
+void NRT_MemSys_disable_site_stats(void);
+
+/*
+ * Reset the allocation counts of the per source line statistics.
+ */
+VISIBILITY_HIDDEN
+void NRT_MemSys_reset_site_stats(void);
+
+/*
+ * Get the entry *index* of the per source line statistics table.  Returns 0
+ * if *index* is out of the table, 1 otherwise.  Unused entries have a zero
+ * *site*.
+ */
+VISIBILITY_HIDDEN
+size_t NRT_MemSys_get_site_stats(size_t index, int64_t *site, size_t *count,
+                                 size_t *bytes, size_t *live, size_t *peak);
+
+/*
+ * Get the number of allocations missing from the per source line statistics
+ * as the table was full.
+ */
+VISIBILITY_HIDDEN
+size_t NRT_MemSys_get_site_stats_dropped(void);
 
 /* Memory Info API */
 
@@ -10,6 +10,7 @@ from numba.core import types, config
 from numba.core.runtime import _nrt_python as _nrt
 
 _nrt_mstats = namedtuple("nrt_mstats", ["alloc", "free", "mi_alloc", "mi_free"])
+_nrt_pool_stats = namedtuple("nrt_pool_stats", ["hits", "misses"])
 
 
 class _Runtime(object):
@@ -110,6 +111,14 @@ class _Runtime(object):
                            mi_alloc=_nrt.memsys_get_stats_mi_alloc(),
                            mi_free=_nrt.memsys_get_stats_mi_free())
 
+    def get_pool_stats(self):
+        """
+        Returns a namedtuple of (hits, misses) for the count of allocations
+        served from, and missing, the freelists of the pooled allocator.
+        """
+        return _nrt_pool_stats(hits=_nrt.memsys_get_stats_pool_hits(),
+                               misses=_nrt.memsys_get_stats_pool_misses())
+
 
 # Alias to _nrt_python._MemInfo
 MemInfo = _nrt._MemInfo
@@ -122,6 +131,8 @@ def typeof_meminfo(val, c):
 
 # Create runtime
 _nrt.memsys_use_cpython_allocator()
+if config.NRT_POOL_ALLOCATOR:
+    _nrt.memsys_use_pool_allocator()
 rtsys = _Runtime()
 
 # Install finalizer
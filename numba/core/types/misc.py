@@ -208,6 +208,24 @@ class EphemeralArray(Type):
         return self.dtype, self.count
 
 
+class SIMDVector(Type):
+    """
+    Type class for the SIMD vectors of numba.simd: *count* values of the
+    scalar type *dtype* operated upon at once.  The vectors of booleans
+    are the masks resulting from comparisons.
+    """
+
+    def __init__(self, dtype, count):
+        self.dtype = dtype
+        self.count = count
+        name = "%sx%d" % (dtype, count)
+        super(SIMDVector, self).__init__(name)
+
+    @property
+    def key(self):
+        return self.dtype, self.count
+
+
 class Object(Type):
     # XXX unused?
     mutable = True
@@ -1,6 +1,8 @@
 from collections import defaultdict, namedtuple
 from contextlib import contextmanager
 from copy import deepcopy, copy
+import inspect
+import operator
 import warnings
 
 from numba.core.compiler_machinery import (FunctionPass, AnalysisPass,
@@ -18,6 +20,7 @@ from numba.core.ir_utils import (guard, resolve_func_from_module, simplify_CFG,
                                  compile_to_numba_ir, get_definition,
                                  find_max_label, rename_labels,
                                  transfer_scope, fixup_var_define_in_scope,
+                                 require, next_label,
                                  )
 from numba.core.ssa import reconstruct_ssa
 from numba.core import interpreter
@@ -396,6 +399,212 @@ class InlineInlinables(FunctionPass):
         return False
 
 
+@register_pass(mutates_CFG=True, analysis_only=False)
+class InlineGenerators(FunctionPass):
+    """
+    This pass inlines the jitted generators consumed by a for loop into the
+    loop. The body of the generator replaces the loop header and each
+    ``yield`` assigns the loop variable and runs the loop body, which then
+    resumes the generator where it yielded. The loop thus runs without
+    allocating a generator state or calling the generator to resume it.
+
+    Generators compiled with ``inline='never'`` are not inlined.
+    """
+    _name = "inline_generators"
+
+    def __init__(self):
+        FunctionPass.__init__(self)
+
+    def run_pass(self, state):
+        """Run inlining of generators consumed by for loops
+        """
+        from numba.core.inline_closurecall import InlineWorker
+
+        # yield is what is being inlined, so there is no validator
+        inline_worker = InlineWorker(state.typingctx,
+                                     state.targetctx,
+                                     state.locals,
+                                     state.pipeline,
+                                     state.flags,
+                                     validator=None)
+        func_ir = state.func_ir
+        modified = False
+        # the loops are recomputed after each inlining as the CFG changes
+        while True:
+            cfg = compute_cfg_from_blocks(func_ir.blocks)
+            for loop in cfg.loops().values():
+                if guard(self._inline_loop, state, loop, inline_worker):
+                    modified = True
+                    func_ir._definitions = build_definitions(func_ir.blocks)
+                    break
+            else:
+                break
+
+        if modified:
+            post_proc = postproc.PostProcessor(func_ir)
+            post_proc.run()
+            func_ir.blocks = simplify_CFG(func_ir.blocks)
+        return modified
+
+    def _inline_loop(self, state, loop, inline_worker):
+        func_ir = state.func_ir
+        blocks = func_ir.blocks
+
+        # The loop header is expected to be that of a for loop:
+        #   $next = iternext(value=$iter)
+        #   $value = pair_first(value=$next)
+        #   $valid = pair_second(value=$next)
+        #   ... copies of $value ...
+        #   branch $valid, <body>, <exit>
+        header = blocks[loop.header]
+        require(len(loop.entries) == 1)
+        [entry_label] = loop.entries
+        term = header.terminator
+        require(isinstance(term, ir.Branch))
+        require(len(header.body) >= 4)
+        iternext, pair_first, pair_second = header.body[:3]
+        for stmt, op in ((iternext, 'iternext'), (pair_first, 'pair_first'),
+                         (pair_second, 'pair_second')):
+            require(isinstance(stmt, ir.Assign))
+            require(isinstance(stmt.value, ir.Expr) and stmt.value.op == op)
+        require(pair_first.value.value.name == iternext.target.name)
+        require(pair_second.value.value.name == iternext.target.name)
+        require(term.cond.name == pair_second.target.name)
+        copies = header.body[3:-1]
+        for stmt in copies:
+            require(isinstance(stmt, ir.Assign))
+            require(isinstance(stmt.value, ir.Var))
+            require(stmt.value.name == pair_first.target.name)
+
+        # The iterator is expected to come from a call to a jitted generator
+        # in the block entering the loop:
+        #   $gen = call $func(...)
+        #   $iter = getiter(value=$gen)
+        #   ... copies of $iter ...
+        #   jump <header>
+        entry = blocks[entry_label]
+        require(isinstance(entry.terminator, ir.Jump))
+        getiter = get_definition(func_ir, iternext.value.value)
+        require(isinstance(getiter, ir.Expr) and getiter.op == 'getiter')
+        call = get_definition(func_ir, getiter.value)
+        require(isinstance(call, ir.Expr) and call.op == 'call')
+        call_indices = [i for i, stmt in enumerate(entry.body)
+                        if isinstance(stmt, ir.Assign) and stmt.value is call]
+        require(len(call_indices) == 1)
+        [call_index] = call_indices
+        iter_stmts = entry.body[call_index + 1:-1]
+        require(iter_stmts)
+        require(isinstance(iter_stmts[0], ir.Assign)
+                and iter_stmts[0].value is getiter)
+        for stmt in iter_stmts[1:]:
+            require(isinstance(stmt, ir.Assign))
+            require(isinstance(stmt.value, ir.Var))
+
+        func_def = get_definition(func_ir, call.func)
+        require(isinstance(func_def, (ir.Global, ir.FreeVar)))
+        dispatcher = func_def.value
+        targetoptions = getattr(dispatcher, 'targetoptions', None)
+        py_func = getattr(dispatcher, 'py_func', None)
+        require(targetoptions is not None and py_func is not None)
+        require(inspect.isgeneratorfunction(py_func))
+        require(targetoptions.get('inline', None) != 'never')
+
+        # The generator and the iterator must be used by the loop only
+        stmts = [entry.body[call_index]] + iter_stmts + header.body
+        names = set(stmt.target.name for stmt in stmts[:-1])
+        names.difference_update([pair_first.target.name])
+        names.difference_update(stmt.target.name for stmt in copies)
+        ids = set(map(id, stmts))
+        for block in blocks.values():
+            for stmt in block.body:
+                if id(stmt) not in ids:
+                    used = set(v.name for v in stmt.list_vars())
+                    require(not (used & names))
+
+        callee_ir = inline_worker.run_untyped_passes(py_func)
+        nyields = sum(isinstance(stmt.value, ir.Yield)
+                      for block in callee_ir.blocks.values()
+                      for stmt in block.find_insts(ir.Assign))
+        require(nyields > 0)
+        # When the loop body yields itself, the state saved at its yield would
+        # include the variables of all the places the generator resumes from,
+        # some of which, e.g. iterators, may not be defined yet
+        require(nyields == 1 or not func_ir.is_generator)
+
+        # Inline the generator in place of its call, returning from it exits
+        # the loop
+        entry.body = entry.body[:call_index + 1] + [entry.terminator]
+        _, callee_blocks, _, new_blocks = inline_worker.inline_ir(
+            func_ir, entry, call_index, callee_ir,
+            py_func.__code__.co_freevars)
+        _, after_call = new_blocks[0]
+        after_call.body = [ir.Jump(term.falsebr, term.loc)]
+
+        # Each yield assigns the loop variable and runs the loop body, the
+        # generator is resumed where the loop body continues
+        scope = entry.scope
+        resume_var = scope.redefine('$resume', term.loc)
+        resume_labels = []
+        work_list = list(callee_blocks.values())
+        while work_list:
+            block = work_list.pop()
+            for i, stmt in enumerate(block.body):
+                if (isinstance(stmt, ir.Assign)
+                        and isinstance(stmt.value, ir.Yield)):
+                    break
+            else:
+                continue
+            loc = stmt.loc
+            resume = ir.Block(scope, loc)
+            resume.body = [ir.Assign(ir.Const(None, loc), stmt.target, loc)]
+            resume.body.extend(block.body[i + 1:])
+            block.body = block.body[:i]
+            block.append(ir.Assign(stmt.value.value, pair_first.target, loc))
+            for copy_stmt in copies:
+                block.append(ir.Assign(copy_stmt.value, copy_stmt.target,
+                                       loc))
+            if nyields > 1:
+                block.append(ir.Assign(ir.Const(len(resume_labels), loc),
+                                       resume_var, loc))
+            block.append(ir.Jump(term.truebr, loc))
+            resume_label = next_label()
+            blocks[resume_label] = resume
+            resume_labels.append(resume_label)
+            work_list.append(resume)
+
+        # Continuing the loop resumes the generator, selecting where when it
+        # has several yields
+        continue_label = resume_labels[-1]
+        for i, resume_label in reversed(list(enumerate(resume_labels[:-1]))):
+            loc = term.loc
+            const_var = scope.redefine('$const', loc)
+            cond_var = scope.redefine('$cond', loc)
+            select = ir.Block(scope, loc)
+            select.append(ir.Assign(ir.Const(i, loc), const_var, loc))
+            select.append(ir.Assign(
+                ir.Expr.binop(operator.eq, resume_var, const_var, loc),
+                cond_var, loc))
+            select.append(ir.Branch(cond_var, resume_label, continue_label,
+                                    loc))
+            continue_label = next_label()
+            blocks[continue_label] = select
+
+        for label in loop.body:
+            if label == loop.header:
+                continue
+            block_term = blocks[label].terminator
+            if isinstance(block_term, ir.Jump):
+                if block_term.target == loop.header:
+                    block_term.target = continue_label
+            elif isinstance(block_term, ir.Branch):
+                if block_term.truebr == loop.header:
+                    block_term.truebr = continue_label
+                if block_term.falsebr == loop.header:
+                    block_term.falsebr = continue_label
+        del blocks[loop.header]
+        return True
+
+
 @register_pass(mutates_CFG=False, analysis_only=False)
 class PreserveIR(AnalysisPass):
     """
@@ -0,0 +1,451 @@
+"""
+Vectorized implementations of elementary math functions.
+
+When LLVM vectorizes a loop calling a math function, e.g. ``llvm.exp.f64``,
+it widens the call to the vector intrinsic ``llvm.exp.v4f64``.  Unless a
+vector math library such as Intel SVML is in use, the code generator then
+scalarizes the vector intrinsic into one call of the C library per lane.
+
+The calls to vector intrinsics allowing approximate functions, i.e. with the
+``afn`` or ``fast`` flag as set by ``fastmath=True``, are replaced by the
+implementations of this module instead.  These reduce the argument to a
+small range and evaluate polynomial approximations on all the lanes at once
+with vector instructions.  Their maximum errors, in units in the last place,
+are:
+
+========  =======  =======
+function  float32  float64
+========  =======  =======
+exp       1        1
+log       1        1
+sin, cos  1        2
+pow       1        (none)
+========  =======  =======
+
+The results are exact for the special values (zeros, infinities and NaNs),
+but may have larger errors for subnormal results of ``exp``.  The float32
+``sin``, ``cos`` and ``pow`` are evaluated in float64; the float64 ``pow``
+is left to the C library.
+"""
+import math
+import re
+import struct
+
+import llvmlite.binding as ll
+import llvmlite.ir as ir
+
+from numba.core import cgutils
+
+
+_float_types = {'f32': ir.FloatType(), 'f64': ir.DoubleType()}
+
+# The calls of the vector intrinsics which may be replaced
+_regex_vector_call = re.compile(
+    r'call ((?:[a-z]+ )*)(<(\d+) x (?:float|double)>) '
+    r'@llvm\.(exp|log|sin|cos|pow)\.v\d+(f32|f64)\(')
+
+
+def _implementation_name(name, count, suffix):
+    return 'numba.vectormath.%s.v%d%s' % (name, count, suffix)
+
+
+def _float_bits(value, fltty):
+    """
+    Return the integer with the same bits as the float *value* of LLVM type
+    *fltty*.
+    """
+    if isinstance(fltty, ir.DoubleType):
+        return struct.unpack('<q', struct.pack('<d', value))[0]
+    else:
+        return struct.unpack('<i', struct.pack('<f', value))[0]
+
+
+class _Vectors(object):
+    """
+    Emit operations on vectors of *count* floats of LLVM type *fltty*.
+    """
+
+    def __init__(self, builder, fltty, count):
+        self.builder = builder
+        self.fltty = fltty
+        self.count = count
+        if isinstance(fltty, ir.DoubleType):
+            self.mantissa_bits, self.bias = 52, 1023
+            intty = ir.IntType(64)
+        else:
+            self.mantissa_bits, self.bias = 23, 127
+            intty = ir.IntType(32)
+        self.vecty = ir.VectorType(fltty, count)
+        self.intvecty = ir.VectorType(intty, count)
+
+    def const(self, value):
+        return ir.Constant(self.vecty, value)
+
+    def intconst(self, value):
+        return ir.Constant(self.intvecty, value)
+
+    def call_intrinsic(self, name, *args):
+        """
+        Call the LLVM intrinsic *name*, e.g. ``llvm.fabs``, on the vectors
+        *args*.
+        """
+        suffix = 'f64' if isinstance(self.fltty, ir.DoubleType) else 'f32'
+        fnty = ir.FunctionType(self.vecty, [self.vecty] * len(args))
+        fn = cgutils.get_or_insert_function(
+            self.builder.module, fnty, '%s.v%d%s' % (name, self.count, suffix))
+        return self.builder.call(fn, args)
+
+    def polynomial(self, x, coeffs):
+        """
+        Evaluate the polynomial of coefficients *coeffs*, from the highest
+        degree, with Horner's method.
+        """
+        builder = self.builder
+        res = self.const(coeffs[0])
+        for coeff in coeffs[1:]:
+            res = builder.fadd(builder.fmul(res, x, flags=('contract',)),
+                               self.const(coeff), flags=('contract',))
+        return res
+
+    def select(self, cond, a, b):
+        return self.builder.select(cond, a, b)
+
+    def round(self, x):
+        """
+        Round *x*, of magnitude less than 2**(mantissa bits - 1), to the
+        nearest integer.  The result is returned as floats and as integers.
+        """
+        builder = self.builder
+        # Adding 1.5 * 2**(mantissa bits) leaves no bit for the fraction,
+        # the integer is then read from the mantissa
+        shifter = 1.5 * 2 ** self.mantissa_bits
+        biased = builder.fadd(x, self.const(shifter))
+        rounded = builder.fsub(biased, self.const(shifter))
+        ints = builder.sub(builder.bitcast(biased, self.intvecty),
+                           self.intconst(_float_bits(shifter, self.fltty)))
+        return rounded, ints
+
+    def pow2(self, n):
+        """
+        Return 2 ** *n* for the integers *n* in the range of the normal
+        exponents.
+        """
+        builder = self.builder
+        biased = builder.add(n, self.intconst(self.bias))
+        bits = builder.shl(biased, self.intconst(self.mantissa_bits))
+        return builder.bitcast(bits, self.vecty)
+
+    def ldexp(self, x, n):
+        """
+        Return *x* * 2 ** *n*, for the integers *n* in twice the range of the
+        normal exponents.
+        """
+        builder = self.builder
+        half = builder.ashr(n, self.intconst(1))
+        x = builder.fmul(x, self.pow2(half))
+        return builder.fmul(x, self.pow2(builder.sub(n, half)))
+
+    def frexp(self, x):
+        """
+        Split the positive normal floats *x* into their mantissa in [1, 2)
+        and their (integer) exponent.
+        """
+        builder = self.builder
+        bits = builder.bitcast(x, self.intvecty)
+        exponent = builder.sub(
+            builder.lshr(bits, self.intconst(self.mantissa_bits)),
+            self.intconst(self.bias))
+        mask = (1 << self.mantissa_bits) - 1
+        bits = builder.or_(builder.and_(bits, self.intconst(mask)),
+                           self.intconst(self.bias << self.mantissa_bits))
+        return builder.bitcast(bits, self.vecty), exponent
+
+    def any(self, mask):
+        """
+        Return whether any lane of the boolean vector *mask* is true.
+        """
+        builder = self.builder
+        bits = builder.bitcast(mask, ir.IntType(self.count))
+        return builder.icmp_unsigned('!=', bits, bits.type(0))
+
+    def call_scalar(self, name, args, lanes, res):
+        """
+        Replace the lanes of *res* where *lanes* is true with the results of
+        the C function *name* of the corresponding lanes of *args*.
+        """
+        builder = self.builder
+        fnty = ir.FunctionType(self.fltty, [self.fltty] * len(args))
+        fn = cgutils.get_or_insert_function(builder.module, fnty, name)
+        for i in map(ir.IntType(32), range(self.count)):
+            lane_args = [builder.extract_element(arg, i) for arg in args]
+            lane_res = builder.select(builder.extract_element(lanes, i),
+                                      builder.call(fn, lane_args),
+                                      builder.extract_element(res, i))
+            res = builder.insert_element(res, lane_res, i)
+        return res
+
+
+def _exp_f64(vec, x):
+    builder = vec.builder
+    # Clamp to the range beyond which the result is 0 or infinite, NaNs are
+    # propagated
+    x = vec.select(builder.fcmp_ordered('>', x, vec.const(710.0)),
+                   vec.const(710.0), x)
+    x = vec.select(builder.fcmp_ordered('<', x, vec.const(-746.0)),
+                   vec.const(-746.0), x)
+    # x = n * ln(2) + r, with |r| <= ln(2) / 2.  The high part of ln(2) has
+    # its low bits zero so that n * ln2_hi is exact.
+    n, ints = vec.round(builder.fmul(x, vec.const(1 / math.log(2))))
+    r = builder.fsub(x, builder.fmul(n, vec.const(6.93147180369123816490e-01)))
+    r = builder.fsub(r, builder.fmul(n, vec.const(1.90821492927058770002e-10)))
+    # exp(r) from its Taylor series
+    p = vec.polynomial(r, [1 / math.factorial(k) for k in range(13, -1, -1)])
+    return vec.ldexp(p, ints)
+
+
+def _exp_f32(vec, x):
+    builder = vec.builder
+    x = vec.select(builder.fcmp_ordered('>', x, vec.const(89.0)),
+                   vec.const(89.0), x)
+    x = vec.select(builder.fcmp_ordered('<', x, vec.const(-104.0)),
+                   vec.const(-104.0), x)
+    n, ints = vec.round(builder.fmul(x, vec.const(1 / math.log(2))))
+    r = builder.fsub(x, builder.fmul(n, vec.const(float.fromhex('0x1.63p-1'))))
+    r = builder.fsub(r, builder.fmul(n, vec.const(-2.12194440e-4)))
+    p = vec.polynomial(r, [1 / math.factorial(k) for k in range(8, -1, -1)])
+    return vec.ldexp(p, ints)
+
+
+# The coefficients of log(1 + f) = 2 atanh(s), with s = f / (2 + f), as in
+# the logarithm of fdlibm for float64 and of musl for float32
+_log_coeffs = {
+    'f64': (6.931471803691238e-01, 1.9082149292705877e-10,
+            [1.479819860511658591e-01, 1.531383769920937332e-01,
+             1.818357216161805012e-01, 2.222219843214978396e-01,
+             2.857142874366239149e-01, 3.999999999940941908e-01,
+             6.666666666666735130e-01, 0.0]),
+    'f32': (float.fromhex('0x1.62e3p-1'), float.fromhex('0x1.2fefa2p-17'),
+            [float.fromhex('0xf89e26.0p-26'), float.fromhex('0x91e9ee.0p-25'),
+             float.fromhex('0xccce13.0p-25'), float.fromhex('0xaaaaaa.0p-24'),
+             0.0]),
+}
+
+
+def _log(vec, x, suffix):
+    builder = vec.builder
+    ln2_hi, ln2_lo, coeffs = _log_coeffs[suffix]
+    # Scale the subnormals up to normal floats
+    tiny = 2.0 ** (1 - vec.bias)
+    subnormal = builder.fcmp_ordered('<', x, vec.const(tiny))
+    shift = vec.mantissa_bits + 2
+    scaled = vec.select(subnormal, builder.fmul(x, vec.const(2.0 ** shift)), x)
+    m, k = vec.frexp(scaled)
+    k = builder.sub(k, vec.select(subnormal, vec.intconst(shift),
+                                  vec.intconst(0)))
+    # x = 2**k * (1 + f), with 1 + f in [sqrt(2) / 2, sqrt(2))
+    big = builder.fcmp_ordered('>', m, vec.const(math.sqrt(2)))
+    m = vec.select(big, builder.fmul(m, vec.const(0.5)), m)
+    k = builder.add(k, builder.zext(big, vec.intvecty))
+    dk = builder.sitofp(k, vec.vecty)
+    f = builder.fsub(m, vec.const(1.0))
+    s = builder.fdiv(f, builder.fadd(f, vec.const(2.0)))
+    z = builder.fmul(s, s)
+    R = vec.polynomial(z, coeffs)
+    hfsq = builder.fmul(builder.fmul(f, f), vec.const(0.5))
+    # log(x) = k * ln(2) + f - (hfsq - s * (hfsq + R))
+    res = builder.fmul(s, builder.fadd(hfsq, R))
+    res = builder.fadd(res, builder.fmul(dk, vec.const(ln2_lo)))
+    res = builder.fsub(builder.fsub(hfsq, res), f)
+    res = builder.fsub(builder.fmul(dk, vec.const(ln2_hi)), res)
+    # Special values
+    res = vec.select(builder.fcmp_ordered('==', x, vec.const(math.inf)),
+                     vec.const(math.inf), res)
+    res = vec.select(builder.fcmp_ordered('==', x, vec.const(0.0)),
+                     vec.const(-math.inf), res)
+    res = vec.select(builder.fcmp_unordered('<', x, vec.const(0.0)),
+                     vec.const(math.nan), res)
+    return res
+
+
+def _log_f64(vec, x):
+    return _log(vec, x, 'f64')
+
+
+def _log_f32(vec, x):
+    return _log(vec, x, 'f32')
+
+
+def _sincos_f64(vec, x, name):
+    builder = vec.builder
+    # x = n * pi / 2 + r, with |r| <= pi / 4.  pi / 2 is split in three parts
+    # of 33 bits so that the products with n up to 2**20 are exact.
+    limit = 1e6
+    n, ints = vec.round(builder.fmul(x, vec.const(2 / math.pi)))
+    r = builder.fsub(x, builder.fmul(n, vec.const(1.57079632673412561417e+00)))
+    r = builder.fsub(r, builder.fmul(n, vec.const(6.07710050630396597660e-11)))
+    r = builder.fsub(r, builder.fmul(n, vec.const(2.02226624871116645580e-21)))
+    z = builder.fmul(r, r)
+    # The kernels of fdlibm
+    sin_r = vec.polynomial(z, [1.58969099521155010221e-10,
+                               -2.50507602534068634195e-08,
+                               2.75573137070700676789e-06,
+                               -1.98412698298579493134e-04,
+                               8.33333333332248946124e-03,
+                               -1.66666666666666324348e-01])
+    sin_r = builder.fadd(r, builder.fmul(builder.fmul(z, r), sin_r))
+    cos_r = vec.polynomial(z, [-1.13596475577881948265e-11,
+                               2.08757232129817482790e-09,
+                               -2.75573143513906633035e-07,
+                               2.48015872894767294178e-05,
+                               -1.38888888888741095749e-03,
+                               4.16666666666666019037e-02])
+    cos_r = builder.fmul(builder.fmul(z, z), cos_r)
+    hz = builder.fmul(z, vec.const(0.5))
+    w = builder.fsub(vec.const(1.0), hz)
+    cos_r = builder.fadd(
+        w, builder.fadd(builder.fsub(builder.fsub(vec.const(1.0), w), hz),
+                        cos_r))
+    # cos(x) = sin(x + pi / 2)
+    if name == 'cos':
+        ints = builder.add(ints, vec.intconst(1))
+    quadrant = builder.and_(ints, vec.intconst(3))
+    odd = builder.icmp_unsigned('!=', builder.and_(quadrant, vec.intconst(1)),
+                                vec.intconst(0))
+    res = vec.select(odd, cos_r, sin_r)
+    negative = builder.icmp_unsigned('!=',
+                                     builder.and_(quadrant, vec.intconst(2)),
+                                     vec.intconst(0))
+    res = vec.select(negative, builder.fneg(res), res)
+    # The large and infinite arguments are left to the C library
+    large = builder.fcmp_ordered('>', vec.call_intrinsic('llvm.fabs', x),
+                                 vec.const(limit))
+    block = builder.block
+    with builder.if_then(vec.any(large), likely=False):
+        fixed = vec.call_scalar(name, [x], large, res)
+        fixed_block = builder.block
+    phi = builder.phi(vec.vecty)
+    phi.add_incoming(res, block)
+    phi.add_incoming(fixed, fixed_block)
+    return phi
+
+
+def _sin_f64(vec, x):
+    return _sincos_f64(vec, x, 'sin')
+
+
+def _cos_f64(vec, x):
+    return _sincos_f64(vec, x, 'cos')
+
+
+def _widened(impl):
+    """
+    Implement a float32 function by evaluating the float64 function *impl*.
+    """
+    def widened_impl(vec, *args):
+        builder = vec.builder
+        vec64 = _Vectors(builder, ir.DoubleType(), vec.count)
+        args = [builder.fpext(arg, vec64.vecty) for arg in args]
+        return builder.fptrunc(impl(vec64, *args), vec.vecty)
+    return widened_impl
+
+
+def _pow_f64(vec, x, y):
+    # Only accurate enough for float32 results, see _pow_f32
+    builder = vec.builder
+    ax = vec.call_intrinsic('llvm.fabs', x)
+    res = _exp_f64(vec, builder.fmul(y, _log_f64(vec, ax)))
+    # The sign for negative x, for which y must be an integer
+    integer = builder.fcmp_ordered('==', vec.call_intrinsic('llvm.trunc', y), y)
+    half = builder.fmul(y, vec.const(0.5))
+    odd = builder.and_(integer,
+                       builder.fcmp_unordered('!=',
+                                              vec.call_intrinsic('llvm.trunc', half),
+                                              half))
+    xbits = builder.bitcast(x, vec.intvecty)
+    negative = builder.icmp_signed('<', xbits, vec.intconst(0))
+    res = vec.select(builder.and_(negative, odd), builder.fneg(res), res)
+    # pow(-inf, y) is +-inf or +-0 for any y
+    finite_negative = builder.and_(
+        builder.fcmp_ordered('<', x, vec.const(0.0)),
+        builder.fcmp_ordered('!=', x, vec.const(-math.inf)))
+    res = vec.select(builder.and_(finite_negative, builder.not_(integer)),
+                     vec.const(math.nan), res)
+    # pow(-1, +-inf) is 1, as pow(1, y) and pow(x, 0) for any y and x
+    one = builder.and_(
+        builder.fcmp_ordered('==', x, vec.const(-1.0)),
+        builder.fcmp_ordered('==', vec.call_intrinsic('llvm.fabs', y),
+                             vec.const(math.inf)))
+    one = builder.or_(one, builder.fcmp_ordered('==', x, vec.const(1.0)))
+    one = builder.or_(one, builder.fcmp_ordered('==', y, vec.const(0.0)))
+    return vec.select(one, vec.const(1.0), res)
+
+
+# The implementations by function name and float type
+_implementations = {
+    ('exp', 'f64'): _exp_f64,
+    ('exp', 'f32'): _exp_f32,
+    ('log', 'f64'): _log_f64,
+    ('log', 'f32'): _log_f32,
+    ('sin', 'f64'): _sin_f64,
+    ('sin', 'f32'): _widened(_sin_f64),
+    ('cos', 'f64'): _cos_f64,
+    ('cos', 'f32'): _widened(_cos_f64),
+    ('pow', 'f32'): _widened(_pow_f64),
+}
+
+
+def _define_implementation(module, name, count, suffix):
+    vec = _Vectors(None, _float_types[suffix], count)
+    nargs = 2 if name == 'pow' else 1
+    fnty = ir.FunctionType(vec.vecty, [vec.vecty] * nargs)
+    fn = ir.Function(module, fnty,
+                     _implementation_name(name, count, suffix))
+    fn.linkage = 'linkonce_odr'
+    fn.attributes.add('nounwind')
+    vec.builder = ir.IRBuilder(fn.append_basic_block())
+    impl = _implementations[name, suffix]
+    vec.builder.ret(impl(vec, *fn.args))
+
+
+def use_vector_math(ll_module):
+    """
+    Replace the calls of vector intrinsics with the approximate function
+    flag in the LLVM module *ll_module* with calls to the implementations
+    of this module.  The resulting module is returned.
+    """
+    if not any(fn.name.startswith(('llvm.exp.v', 'llvm.log.v', 'llvm.sin.v',
+                                   'llvm.cos.v', 'llvm.pow.v'))
+               for fn in ll_module.functions):
+        return ll_module
+
+    used = set()
+
+    def replace(m):
+        flags, vecty, count, name, suffix = m.groups()
+        if (not {'fast', 'afn'}.intersection(flags.split())
+                or (name, suffix) not in _implementations):
+            return m.group(0)
+        count = int(count)
+        used.add((name, count, suffix))
+        return 'call %s%s @"%s"(' % (
+            flags, vecty, _implementation_name(name, count, suffix))
+
+    text = _regex_vector_call.sub(replace, str(ll_module))
+    if not used:
+        return ll_module
+
+    impl_module = ir.Module(name='numba.vectormath')
+    impl_module.triple = ll_module.triple
+    impl_module.data_layout = ll_module.data_layout
+    declarations = []
+    for name, count, suffix in sorted(used):
+        _define_implementation(impl_module, name, count, suffix)
+        vecty = ir.VectorType(_float_types[suffix], count)
+        nargs = 2 if name == 'pow' else 1
+        declarations.append('declare %s @"%s"(%s)' % (
+            vecty, _implementation_name(name, count, suffix),
+            ', '.join([str(vecty)] * nargs)))
+    new_module = ll.parse_assembly(text + '\n' + '\n'.join(declarations))
+    new_module.name = ll_module.name
+    new_module.link_in(ll.parse_assembly(str(impl_module)))
+    return new_module
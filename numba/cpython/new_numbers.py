@@ -138,6 +138,18 @@ def _int_divmod_impl(context, builder, sig, args, zerodiv_message):
     quot = cgutils.alloca_once(builder, a.type, name="quot")
     rem = cgutils.alloca_once(builder, a.type, name="rem")
 
+    if context.cdivision:
+        # C semantics: the quotient is truncated towards zero and the
+        # remainder has the sign of the dividend.  Dividing by zero is
+        # undefined.
+        if ty.signed:
+            builder.store(builder.sdiv(a, b), quot)
+            builder.store(builder.srem(a, b), rem)
+        else:
+            builder.store(builder.udiv(a, b), quot)
+            builder.store(builder.urem(a, b), rem)
+        return quot, rem
+
     with builder.if_else(cgutils.is_scalar_zero(builder, b), likely=False
                          ) as (if_zero, if_non_zero):
         with if_zero:
@@ -138,6 +138,18 @@ def _int_divmod_impl(context, builder, sig, args, zerodiv_message):
     quot = cgutils.alloca_once(builder, a.type, name="quot")
     rem = cgutils.alloca_once(builder, a.type, name="rem")
 
+    if context.cdivision:
+        # C semantics: the quotient is truncated towards zero and the
+        # remainder has the sign of the dividend.  Dividing by zero is
+        # undefined.
+        if ty.signed:
+            builder.store(builder.sdiv(a, b), quot)
+            builder.store(builder.srem(a, b), rem)
+        else:
+            builder.store(builder.udiv(a, b), quot)
+            builder.store(builder.urem(a, b), rem)
+        return quot, rem
+
     with builder.if_else(cgutils.is_scalar_zero(builder, b), likely=False
                          ) as (if_zero, if_non_zero):
         with if_zero:
@@ -637,6 +649,13 @@ def real_divmod(context, builder, x, y):
     assert x.type == y.type
     floatty = x.type
 
+    if isinstance(floatty, ir.HalfType):
+        # Like NumPy, compute the float16 results in float32
+        x = builder.fpext(x, ir.FloatType())
+        y = builder.fpext(y, ir.FloatType())
+        div, mod = real_divmod(context, builder, x, y)
+        return builder.fptrunc(div, floatty), builder.fptrunc(mod, floatty)
+
     module = builder.module
     fname = context.mangler(".numba.python.rem", [x.type])
     fnty = ir.FunctionType(floatty, (floatty, floatty, ir.PointerType(floatty)))
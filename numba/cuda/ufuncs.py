@@ -22,6 +22,7 @@ def ufunc_db():
     from numba.cpython import cmathimpl, mathimpl, numbers
     from numba.np import npyfuncs
     from numba.np.numpy_support import numpy_version
+    from numba.np.ufunc_db import add_float16_loops
     from numba.cuda.mathimpl import (get_unary_impl_for_fn_and_ty,
                                      get_binary_impl_for_fn_and_ty)
 
@@ -659,4 +660,6 @@ def ufunc_db():
         'D->D': npyfuncs.np_complex_log10_impl,
     }
 
+    add_float16_loops(db)
+
     return db
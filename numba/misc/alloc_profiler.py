@@ -0,0 +1,110 @@
+"""
+An allocation site profiler for the Numba runtime (NRT).
+
+While an :class:`AllocationProfiler` is running, the NRT attributes every
+MemInfo it creates to the source line being executed, as recorded by the
+functions compiled with ``line_profile=True`` (see
+:mod:`numba.misc.line_profiler`).  Allocations made by library code, e.g. the
+temporaries of array expressions, are attributed to the line calling it.
+For each line, the number of allocations, the bytes allocated and the
+current and peak live bytes are reported.  Allocations made outside of
+profiled code are reported under ``("<unknown>", 0)``.
+"""
+import sys
+from collections import namedtuple
+
+from numba import _helperlib
+from numba.core.runtime import _nrt_python as _nrt
+from numba.misc.line_profiler import decode_line_key
+
+
+AllocationStats = namedtuple("AllocationStats",
+                             ("count", "bytes", "live", "peak"))
+
+# The key of the allocations made outside of profiled code
+_UNKNOWN_SITE = -1
+UNKNOWN_SITE = ("<unknown>", 0)
+
+
+class AllocationProfiler(object):
+    """Record the NRT allocations per source line.
+
+    Only one profiler can be running at a time, starting a profiler resets
+    the allocation counts.
+    """
+
+    _running = False
+
+    def __init__(self):
+        self._stats = {}
+        # Allocations that could not be recorded as too many distinct lines
+        # allocated
+        self.dropped = 0
+
+    def start(self):
+        """Start recording allocations.
+        """
+        if AllocationProfiler._running:
+            raise RuntimeError("allocation profiler already running")
+        _nrt.memsys_reset_site_stats()
+        addr = _helperlib.c_helpers["line_profiler_current"]
+        _nrt.memsys_enable_site_stats(addr)
+        AllocationProfiler._running = True
+
+    def stop(self):
+        """Stop recording allocations and collect the statistics.
+        """
+        _nrt.memsys_disable_site_stats()
+        AllocationProfiler._running = False
+        self._stats = self._collect()
+
+    def _collect(self):
+        entries, self.dropped = _nrt.memsys_get_site_stats()
+        stats = {}
+        for site, count, nbytes, live, peak in entries:
+            if not count:
+                continue
+            if site == _UNKNOWN_SITE:
+                loc = UNKNOWN_SITE
+            else:
+                loc = decode_line_key(site)
+            stats[loc] = AllocationStats(count, nbytes, live, peak)
+        return stats
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def get_stats(self):
+        """Return a dict mapping ``(filename, lineno)`` to the
+        ``AllocationStats(count, bytes, live, peak)`` of that line.
+        *live* is the number of bytes still allocated when the profiler
+        was stopped.
+        """
+        return dict(self._stats)
+
+    def print_stats(self, file=None):
+        """Print the allocation statistics, the lines allocating the most
+        bytes first.
+        """
+        import linecache
+
+        if file is None:
+            file = sys.stdout
+        print("%-40s %10s %14s %14s %14s" % ("Location", "Count", "Bytes",
+                                             "Live", "Peak"), file=file)
+        print("=" * 96, file=file)
+        items = sorted(self._stats.items(), key=lambda kv: -kv[1].bytes)
+        for (filename, lineno), st in items:
+            loc = "%s:%d" % (filename, lineno)
+            print("%-40s %10d %14d %14d %14d" % (loc[-40:], st.count,
+                                                 st.bytes, st.live, st.peak),
+                  file=file)
+            source = linecache.getline(filename, lineno).strip()
+            if source:
+                print("    %s" % source, file=file)
+        if self.dropped:
+            print("Dropped allocations: %d" % self.dropped, file=file)
@@ -0,0 +1,97 @@
+"""
+Benchmark the pooled NRT allocator (see NUMBA_NRT_POOL_ALLOCATOR) against
+the system allocator.
+
+Usage::
+
+    python -m numba.misc.bench_nrt_allocator [--repeat N]
+
+As the allocator is selected on import of Numba, each configuration runs
+in its own subprocess.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+_WORKLOADS = r"""
+import json
+import sys
+import time
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit
+def small_temporaries(a, n):
+    # Array expression temporaries created and freed in a loop
+    s = 0.0
+    for i in range(n):
+        s += (a * 2.0 + 1.0).sum()
+    return s
+
+
+@njit
+def mixed_sizes(n):
+    s = 0.0
+    for i in range(n):
+        s += np.empty(1 + (i * 7919) % 2000).size
+    return s
+
+
+@njit(parallel=True)
+def parallel_temporaries(a, n):
+    out = np.zeros(n)
+    for i in prange(n):
+        out[i] = (a * i).sum()
+    return out
+
+
+a = np.ones(64)
+cases = {
+    "small_temporaries": lambda: small_temporaries(a, 200000),
+    "mixed_sizes": lambda: mixed_sizes(200000),
+    "parallel_temporaries": lambda: parallel_temporaries(a, 200000),
+}
+repeat = int(sys.argv[1])
+results = {}
+for name, case in cases.items():
+    case()  # compile
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        case()
+        best = min(best, time.perf_counter() - t0)
+    results[name] = best
+print(json.dumps(results))
+"""
+
+
+def run(pool, repeat):
+    env = dict(os.environ)
+    env["NUMBA_NRT_POOL_ALLOCATOR"] = "1" if pool else "0"
+    out = subprocess.check_output([sys.executable, "-c", _WORKLOADS,
+                                   str(repeat)], env=env)
+    return json.loads(out.decode().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="number of timed runs per workload")
+    args = parser.parse_args(argv)
+
+    system = run(False, args.repeat)
+    pooled = run(True, args.repeat)
+    print("%-24s %12s %12s %8s" % ("workload", "system (s)", "pooled (s)",
+                                   "speedup"))
+    for name in system:
+        print("%-24s %12.4f %12.4f %7.2fx" % (name, system[name], pooled[name],
+                                              system[name] / pooled[name]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Call counters and timers for jitted functions.
+
+When a function is compiled with ``instrument=True`` (or with
+``NUMBA_INSTRUMENT`` set), its body is called through a stub that counts
+the calls and accumulates the cycles spent in the body (as read by
+``llvm.readcyclecounter``, i.e. ``rdtsc`` on x86) into a pair of 64-bit
+counters stored in the compiled module.  As the stub has the symbol of the
+function, calls from other jitted functions are counted as well as calls
+from the interpreter.  :func:`runtime_stats` collects the counters of all
+the instrumented functions.
+"""
+import copy
+import ctypes
+import threading
+import time
+from collections import namedtuple
+
+from llvmlite import ir
+
+from numba.core import cgutils, event, types
+from numba.core.funcdesc import qualifying_prefix
+
+
+FunctionStats = namedtuple("FunctionStats", ("calls", "cycles", "seconds"))
+
+_lock = threading.Lock()
+# Maps the address of the counters to the description of the function
+_counters = {}
+
+
+def counters_name(fndesc):
+    """Return the name of the global variable holding the counters of the
+    function described by *fndesc*.
+    """
+    return "_numba_counters_" + fndesc.mangled_name
+
+
+def body_fndesc(fndesc):
+    """Return a copy of *fndesc* naming the instrumented body of the
+    function.
+    """
+    body = copy.copy(fndesc)
+    body.mangled_name = fndesc.mangled_name + ".body"
+    return body
+
+
+def lower_stub(context, module, fndesc, body):
+    """Define the function of *fndesc* in *module* as a stub calling the
+    LLVM function *body*, counting the calls and the cycles spent in them.
+    """
+    i64 = ir.IntType(64)
+    counters = cgutils.add_global_variable(module, ir.ArrayType(i64, 2),
+                                           counters_name(fndesc))
+    counters.linkage = 'common'
+    counters.initializer = ir.Constant(counters.type.pointee, None)
+
+    stub = context.declare_function(module, fndesc)
+    builder = ir.IRBuilder(stub.append_basic_block('entry'))
+    readcc = cgutils.get_or_insert_function(module, ir.FunctionType(i64, ()),
+                                            "llvm.readcyclecounter")
+    start = builder.call(readcc, ())
+    status = builder.call(body, stub.args)
+    stop = builder.call(readcc, ())
+    calls = cgutils.gep_inbounds(builder, counters, 0, 0)
+    cycles = cgutils.gep_inbounds(builder, counters, 0, 1)
+    builder.atomic_rmw('add', calls, i64(1), 'monotonic')
+    builder.atomic_rmw('add', cycles, builder.sub(stop, start), 'monotonic')
+    builder.ret(status)
+
+
+def register(cres):
+    """Register the counters of the instrumented compile result *cres*.
+    """
+    fndesc = cres.fndesc
+    engine = getattr(cres.library.codegen, '_engine', None)
+    name = counters_name(fndesc)
+    if engine is None or not engine.is_symbol_defined(name):
+        return
+    addr = engine.get_global_value_address(name)
+    desc = "%s(%s)" % (qualifying_prefix(fndesc.modname, fndesc.qualname),
+                       ", ".join(map(str, fndesc.argtypes)))
+    with _lock:
+        _counters[addr] = desc
+
+
+_cycles_per_second = None
+
+
+def cycles_per_second():
+    """Return the estimated frequency of the cycle counter read by the
+    instrumented functions, or None if it is not supported by the target.
+    """
+    global _cycles_per_second
+    if _cycles_per_second is None:
+        from numba import njit
+        from numba.core.extending import intrinsic
+
+        @intrinsic
+        def read_cycle_counter(typingctx):
+            def codegen(context, builder, signature, args):
+                fnty = ir.FunctionType(ir.IntType(64), ())
+                fn = cgutils.get_or_insert_function(builder.module, fnty,
+                                                    "llvm.readcyclecounter")
+                return builder.call(fn, ())
+            return types.uint64(), codegen
+
+        read = njit(lambda: read_cycle_counter())
+        read()
+        t0, c0 = time.perf_counter(), read()
+        time.sleep(0.02)
+        t1, c1 = time.perf_counter(), read()
+        _cycles_per_second = (c1 - c0) / (t1 - t0) if c1 != c0 else 0
+    return _cycles_per_second or None
+
+
+def runtime_stats(reset=False):
+    """Return a dict mapping the description of each function compiled with
+    ``instrument=True`` to a ``FunctionStats(calls, cycles, seconds)``
+    tuple.  The cycles (and the seconds they are estimated to amount to)
+    include the time spent in callees.  The specializations of a function
+    compiled several times (e.g. after eviction) are aggregated.
+
+    If *reset* is true, the counters are zeroed after being read.
+
+    The stats are also broadcast to the listeners of the
+    ``"numba:runtime_stats"`` event.
+    """
+    event.start_event("numba:runtime_stats")
+    with _lock:
+        counters = list(_counters.items())
+    totals = {}
+    for addr, desc in counters:
+        arr = (ctypes.c_uint64 * 2).from_address(addr)
+        calls, cycles = arr[0], arr[1]
+        if reset:
+            arr[0] = arr[1] = 0
+        prev_calls, prev_cycles = totals.get(desc, (0, 0))
+        totals[desc] = (prev_calls + calls, prev_cycles + cycles)
+    freq = cycles_per_second() if totals else None
+    stats = {desc: FunctionStats(calls, cycles,
+                                 cycles / freq if freq else None)
+             for desc, (calls, cycles) in totals.items()}
+    event.end_event("numba:runtime_stats", data=stats)
+    return stats
@@ -0,0 +1,132 @@
+"""
+A sampling line profiler for functions compiled in nopython mode.
+
+Functions compiled with ``line_profile=True`` record the source line they
+are executing in a global slot (see ``numba/_lineprof.c``).  While a
+:class:`LineProfiler` is running, a ``SIGPROF`` timer samples that slot,
+so the report gives the share of CPU time spent on each source line.  As the
+lines come from the ``Loc`` of the Numba IR, statements of parfor bodies and
+of functions inlined at the IR level are attributed to their own lines, while
+time spent in (non-profiled) overload implementations is attributed to the
+line that calls them.
+
+Example::
+
+    @njit(line_profile=True)
+    def kernel(a):
+        ...
+
+    with LineProfiler() as prof:
+        kernel(a)
+    prof.print_stats()
+"""
+import linecache
+import sys
+import zlib
+from collections import Counter, defaultdict
+
+from numba import _helperlib
+
+
+# Maps the file identifier of a line key to its filename
+_filenames = {}
+
+
+def line_key(filename, lineno):
+    """Return the non-zero integer identifying the source line *lineno* of
+    *filename* in the samples.  Keys are stable across processes, so that
+    cached functions report the same lines.
+    """
+    file_id = zlib.crc32(filename.encode("utf-8", "surrogatepass"))
+    file_id &= 0x7fffffff
+    _filenames.setdefault(file_id, filename)
+    return (file_id << 32) | lineno
+
+
+def decode_line_key(key):
+    """Return the ``(filename, lineno)`` identified by *key*.
+    """
+    file_id, lineno = key >> 32, key & 0xffffffff
+    filename = _filenames.get(file_id, "<unknown file %08x>" % file_id)
+    return filename, lineno
+
+
+class LineProfiler(object):
+    """Sample the source lines executed by functions compiled with the
+    ``line_profile`` option.  Samples are taken every *interval* seconds of
+    CPU time consumed by the process.
+
+    Only one profiler can be running at a time.  The samples of successive
+    runs of the same profiler accumulate.
+    """
+
+    def __init__(self, interval=0.001):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.interval = interval
+        self._counts = Counter()
+        # Samples taken outside of profiled code
+        self.idle_samples = 0
+        # Samples lost because too many distinct lines were executed
+        self.dropped_samples = 0
+        self._running = False
+
+    def start(self):
+        """Start sampling.
+        """
+        if sys.platform.startswith("win32"):
+            raise NotImplementedError("the line profiler is not supported "
+                                      "on Windows")
+        _helperlib.line_profiler_start(max(1, int(self.interval * 1e6)))
+        self._running = True
+
+    def stop(self):
+        """Stop sampling and collect the samples.
+        """
+        if not self._running:
+            return
+        _helperlib.line_profiler_stop()
+        self._running = False
+        counts, idle, dropped = _helperlib.line_profiler_results()
+        for key, count in counts.items():
+            self._counts[decode_line_key(key)] += count
+        self.idle_samples += idle
+        self.dropped_samples += dropped
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def get_stats(self):
+        """Return a dict mapping ``(filename, lineno)`` to the number of
+        samples taken while executing that line.
+        """
+        return dict(self._counts)
+
+    def print_stats(self, file=None):
+        """Print the samples per line, grouped by source file.
+        """
+        if file is None:
+            file = sys.stdout
+        total = sum(self._counts.values())
+        print("Total samples: %d (%d outside profiled code)"
+              % (total, self.idle_samples), file=file)
+        if self.dropped_samples:
+            print("Dropped samples: %d" % self.dropped_samples, file=file)
+        by_file = defaultdict(list)
+        for (filename, lineno), count in self._counts.items():
+            by_file[filename].append((lineno, count))
+        for filename in sorted(by_file):
+            print("", file=file)
+            print("File: %s" % filename, file=file)
+            print("%8s %10s %8s  %s" % ("Line #", "Samples", "% Time",
+                                        "Line Contents"), file=file)
+            print("=" * 72, file=file)
+            for lineno, count in sorted(by_file[filename]):
+                source = linecache.getline(filename, lineno).rstrip()
+                print("%8d %10d %8.1f  %s" % (lineno, count,
+                                              100.0 * count / total, source),
+                      file=file)
@@ -0,0 +1,78 @@
+"""
+Support for the perf map interface of the Linux ``perf`` profiler.
+
+When ``NUMBA_PERF_MAP`` is set, the address range of each jitted function is
+written to ``/tmp/perf-<pid>.map`` so that ``perf`` (and the tools built on
+its output, such as flamegraphs) can attribute samples to jitted code.  See
+https://github.com/torvalds/linux/blob/master/tools/perf/Documentation/jit-interface.txt
+"""
+import os
+import struct
+import threading
+from collections import namedtuple
+
+
+PerfMapEntry = namedtuple("PerfMapEntry", ("address", "size", "name"))
+
+_lock = threading.Lock()
+
+# ELF constants
+_ELFCLASS64 = 2
+_ELFDATA2LSB = 1
+_SHT_SYMTAB = 2
+_SHN_UNDEF = 0
+_STT_FUNC = 2
+_STB_GLOBAL = 1
+
+
+def perf_map_path(pid=None):
+    """Return the path of the perf map file of the process *pid*
+    (defaults to the current process).
+    """
+    if pid is None:
+        pid = os.getpid()
+    return "/tmp/perf-%d.map" % pid
+
+
+def elf_function_symbols(buf):
+    """Yield ``(name, size)`` for the global function symbols defined in the
+    64-bit little-endian ELF object file *buf*.  Nothing is yielded for
+    other object file formats.
+    """
+    buf = bytes(buf)
+    if (buf[:4] != b"\x7fELF" or buf[4] != _ELFCLASS64
+            or buf[5] != _ELFDATA2LSB):
+        return
+    shoff, = struct.unpack_from("<Q", buf, 0x28)
+    shentsize, shnum = struct.unpack_from("<HH", buf, 0x3A)
+
+    def section(idx):
+        # (sh_type, sh_offset, sh_size, sh_link, sh_entsize)
+        fields = struct.unpack_from("<IIQQQQIIQQ", buf, shoff + idx * shentsize)
+        return fields[1], fields[4], fields[5], fields[6], fields[9]
+
+    for idx in range(shnum):
+        sh_type, offset, size, link, entsize = section(idx)
+        if sh_type != _SHT_SYMTAB or not entsize:
+            continue
+        _, stroff, strsize, _, _ = section(link)
+        strtab = buf[stroff:stroff + strsize]
+        for symoff in range(offset, offset + size, entsize):
+            (st_name, st_info, _, st_shndx, _,
+             st_size) = struct.unpack_from("<IBBHQQ", buf, symoff)
+            if (st_info & 0xf != _STT_FUNC or st_info >> 4 != _STB_GLOBAL
+                    or st_shndx == _SHN_UNDEF or not st_size):
+                continue
+            end = strtab.index(b"\0", st_name)
+            yield strtab[st_name:end].decode(), st_size
+
+
+def write_entries(entries, path=None):
+    """Append the PerfMapEntry *entries* to the perf map file.
+    """
+    if not entries:
+        return
+    lines = ["%x %x %s\n" % (e.address, e.size, e.name) for e in entries]
+    with _lock:
+        with open(path or perf_map_path(), "a") as fout:
+            fout.writelines(lines)
@@ -149,10 +149,13 @@ def store_item(context, builder, arrayty, val, ptr):
 def fix_integer_index(context, builder, idxty, idx, size):
     """
     Fix the integer index' type and value for the given dimension size.
+    Negative indices are wrapped around unless the wraparound option is
+    disabled.
     """
     if idxty.signed:
         ind = context.cast(builder, idx, idxty, types.intp)
-        ind = slicing.fix_index(builder, ind, size)
+        if context.enable_wraparound:
+            ind = slicing.fix_index(builder, ind, size)
     else:
         ind = context.cast(builder, idx, idxty, types.uintp)
     return ind
@@ -4204,6 +4207,35 @@ def dtype_eq_impl(context, builder, sig, args):
 # ------------------------------------------------------------------------------
 # Numpy array constructors
 
+# The functions whose array result is allocated by _empty_nd_impl()
+_ALIGNED_ALLOCATORS = frozenset([
+    np.empty, np.zeros, np.ones, np.full, np.empty_like, np.zeros_like,
+    np.ones_like, np.full_like, np.arange, np.linspace, np.eye, np.identity,
+    np.copy,
+])
+
+
+def allocates_aligned_array(fnty, arrtype):
+    """
+    Whether calling the function of type *fnty* returns an array of type
+    *arrtype* whose data is aligned by _empty_nd_impl().
+    """
+    # The allocators of array subclasses may not honour the alignment
+    return (type(arrtype) is types.Array and
+            isinstance(fnty, types.Function) and
+            getattr(fnty, 'typing_key', None) in _ALIGNED_ALLOCATORS)
+
+
+def assume_aligned_array(context, builder, arrtype, ary):
+    """
+    Let LLVM know that the data of array *ary* is aligned as the arrays
+    allocated by the NRT are.
+    """
+    align = context.get_preferred_array_alignment(arrtype.dtype)
+    data = make_array(arrtype)(context, builder, ary).data
+    cgutils.assume_aligned(builder, data, align)
+
+
 def _empty_nd_impl(context, builder, arrtype, shapes):
     """Utility function used for allocating a new array during LLVM code
     generation (lowering).  Given a target context, builder, array
@@ -4268,6 +4300,9 @@ def _empty_nd_impl(context, builder, arrtype, shapes):
 
     meminfo = context.compile_internal(builder, _call_allocator, argtypes, args)
     data = context.nrt.meminfo_data(builder, meminfo)
+    if type(arrtype) is types.Array:
+        # The allocators of array subclasses may not honour the alignment
+        cgutils.assume_aligned(builder, data, align_val)
 
     intp_t = context.get_value_type(types.intp)
     shape_array = cgutils.pack_array(builder, shapes, ty=intp_t)
@@ -0,0 +1,283 @@
+"""
+Hoisting of the bounds checks of array accesses out of ``range()`` loops.
+
+When bounds checking is enabled, every integer index of an array access is
+normally compared with the extent of the indexed axis.  For the accesses
+indexed by the induction variable of a ``range()`` loop, possibly offset by
+a constant, a single check is done instead before the loop: it tests
+whether the indices taken over the whole range lie within the extent of the
+axis.  The accesses only check their indices when this hoisted check fails,
+so that the ``IndexError`` is still raised by the access which is out of
+bounds, after the side effects of the previous iterations.
+
+As the result of the hoisted check is loop invariant, LLVM unswitches the
+loop on it and can vectorize the version without checks.  When the bounds
+of the range are derived from the shape of the array, e.g. in
+``for i in range(1, len(a) - 1): a[i - 1] + a[i + 1]``, the hoisted check
+folds to a constant and the per-access checks disappear altogether.
+"""
+import operator
+from collections import defaultdict, namedtuple
+
+from numba.core import cgutils, ir, types
+from numba.core.analysis import compute_cfg_from_blocks
+
+
+# A condition evaluated before a loop: every index ``i + offset`` (for the
+# values i of the induction variable of the loop) or, if *constant* is true,
+# the index ``offset`` is within the extent of *axis* of the array *array*.
+LoopBoundsCheck = namedtuple('LoopBoundsCheck',
+                             ('array', 'axis', 'offset', 'constant'))
+
+
+class _Definitions(object):
+    """The definitions of the variables of a function, found from its
+    blocks rather than from the possibly stale ``func_ir._definitions``.
+    """
+
+    def __init__(self, blocks):
+        # variable name -> list of (label, statement index, value)
+        self._defs = defaultdict(list)
+        for label, block in blocks.items():
+            for i, stmt in enumerate(block.body):
+                if isinstance(stmt, ir.Assign):
+                    self._defs[stmt.target.name].append((label, i,
+                                                         stmt.value))
+
+    def site(self, name):
+        """Return the (label, statement index) of the single definition of
+        the variable *name*, or None.
+        """
+        defs = self._defs.get(name, ())
+        if len(defs) != 1:
+            return None
+        return defs[0][:2]
+
+    def get(self, var):
+        """Return the value *var* is defined to, following the copies
+        between variables, or None if a variable of the chain is not
+        defined exactly once.  The last variable of the chain is returned
+        along with the value.
+        """
+        while True:
+            defs = self._defs.get(var.name, ())
+            if len(defs) != 1:
+                return var, None
+            value = defs[0][2]
+            if not isinstance(value, ir.Var):
+                return var, value
+            var = value
+
+
+def _is_global(defs, var, value):
+    _, defn = defs.get(var)
+    return isinstance(defn, (ir.Global, ir.FreeVar)) and defn.value is value
+
+
+def _range_loop(defs, blocks, typemap, loop):
+    """If *loop* iterates over a ``range()`` with a unit step, return the
+    name of the variable holding the iterator and the ``pair_first``
+    expression producing the values of the induction variable.
+    """
+    if len(loop.entries) != 1:
+        return None
+    header = blocks[loop.header]
+    for stmt in header.body:
+        if (isinstance(stmt, ir.Assign) and
+                isinstance(stmt.value, ir.Expr) and
+                stmt.value.op == 'pair_first'):
+            pair_first = stmt.value
+            break
+    else:
+        return None
+    _, iternext = defs.get(pair_first.value)
+    if not (isinstance(iternext, ir.Expr) and iternext.op == 'iternext'):
+        return None
+    iterator, getiter = defs.get(iternext.value)
+    if not (isinstance(getiter, ir.Expr) and getiter.op == 'getiter'):
+        return None
+    _, call = defs.get(getiter.value)
+    if not (isinstance(call, ir.Expr) and call.op == 'call' and
+            _is_global(defs, call.func, range) and
+            len(call.args) in (1, 2) and not call.kws and
+            call.vararg is None):
+        return None
+    # Only handle ranges of signed machine integers
+    if typemap[getiter.value.name] != types.RangeType(types.intp):
+        return None
+    return iterator.name, pair_first
+
+
+class _LoopInfo(namedtuple('_LoopInfo', ('loop', 'iterator', 'site'))):
+    """A range() loop, the variable holding its iterator and the definition
+    site of that variable, where its hoisted checks are evaluated.
+    """
+
+
+def _index_term(defs, typemap, var, induction_vars):
+    """Return (loop info, offset) if *var* is an induction variable plus a
+    constant, (None, value) if it is a non-negative constant, else None.
+    """
+    def as_const(v):
+        ty = typemap[v.name]
+        if isinstance(ty, types.IntegerLiteral):
+            return ty.literal_value
+        _, defn = defs.get(v)
+        if isinstance(defn, ir.Const) and isinstance(defn.value, int):
+            return defn.value
+        return None
+
+    def as_induction(v):
+        _, defn = defs.get(v)
+        return induction_vars.get(id(defn))
+
+    if not isinstance(typemap[var.name], types.Integer):
+        return None
+    info = as_induction(var)
+    if info is not None:
+        return info, 0
+    const = as_const(var)
+    if const is not None:
+        return (None, const) if const >= 0 else None
+    _, defn = defs.get(var)
+    if not (isinstance(defn, ir.Expr) and defn.op == 'binop' and
+            defn.fn in (operator.add, operator.sub)):
+        return None
+    lhs_info, rhs_info = as_induction(defn.lhs), as_induction(defn.rhs)
+    if lhs_info is not None:
+        const = as_const(defn.rhs)
+        if const is not None:
+            return lhs_info, const if defn.fn is operator.add else -const
+    elif rhs_info is not None and defn.fn is operator.add:
+        const = as_const(defn.lhs)
+        if const is not None:
+            return rhs_info, const
+    return None
+
+
+def _array_access(stmt):
+    """Return the (array, index) variables of the array access *stmt*, or
+    None if it is not one.
+    """
+    if isinstance(stmt, ir.SetItem):
+        return stmt.target, stmt.index
+    if (isinstance(stmt, ir.Assign) and isinstance(stmt.value, ir.Expr) and
+            stmt.value.op == 'getitem'):
+        return stmt.value.value, stmt.value.index
+    return None
+
+
+def find_hoisted_boundschecks(func_ir, typemap):
+    """
+    Find the array accesses whose bounds checks can be hoisted out of the
+    enclosing ``range()`` loops.
+
+    Return a ``(loop_checks, access_checks)`` tuple: *loop_checks* maps the
+    name of the variable holding the iterator of a loop to the set of
+    LoopBoundsCheck to evaluate after it is defined, *access_checks* maps
+    the id() of an access statement to the list of (iterator name,
+    LoopBoundsCheck) that must all hold for it to skip its bounds checks.
+    """
+    blocks = func_ir.blocks
+    defs = _Definitions(blocks)
+    cfg = compute_cfg_from_blocks(blocks)
+    doms = cfg.dominators()
+
+    def dominates(site, other):
+        # Whether the definition site *site* dominates the statement at
+        # *other*
+        (label, idx), (other_label, other_idx) = site, other
+        if label == other_label:
+            return idx < other_idx
+        return label in doms[other_label]
+
+    # id() of the pair_first expression of a loop -> loop info
+    induction_vars = {}
+    for loop in cfg.loops().values():
+        found = _range_loop(defs, blocks, typemap, loop)
+        if found is None:
+            continue
+        iterator, pair_first = found
+        # The checks are evaluated when the iterator is created, which must
+        # happen before every execution of the loop
+        site = defs.site(iterator)
+        if (site is None or site[0] in loop.body or
+                site[0] not in doms[loop.header]):
+            continue
+        induction_vars[id(pair_first)] = _LoopInfo(loop, iterator, site)
+
+    loop_checks = defaultdict(set)
+    access_checks = {}
+    if not induction_vars:
+        return loop_checks, access_checks
+
+    for label, block in blocks.items():
+        for stmt in block.body:
+            access = _array_access(stmt)
+            if access is None:
+                continue
+            array, index = access
+            arrty = typemap[array.name]
+            if not isinstance(arrty, types.Array):
+                continue
+            indexty = typemap[index.name]
+            if isinstance(indexty, types.BaseTuple):
+                _, tup = defs.get(index)
+                if not (isinstance(tup, ir.Expr) and
+                        tup.op == 'build_tuple'):
+                    continue
+                items = tup.items
+            else:
+                items = [index]
+            if not 0 < len(items) <= arrty.ndim:
+                continue
+            terms = [_index_term(defs, typemap, var, induction_vars)
+                     for var in items]
+            if any(term is None for term in terms):
+                continue
+            loops = [info for info, _ in terms if info is not None]
+            # The accesses must be in the loops of their induction variables
+            # and their array defined before these loops
+            array_site = defs.site(array.name)
+            if (not loops or array_site is None or
+                    any(label not in info.loop.body or
+                        not dominates(array_site, info.site)
+                        for info in loops)):
+                continue
+            checks = []
+            for axis, (info, offset) in enumerate(terms):
+                # The constant indices are checked before the loop of the
+                # first induction variable
+                check = LoopBoundsCheck(array.name, axis, offset,
+                                        info is None)
+                iterator = (info or loops[0]).iterator
+                loop_checks[iterator].add(check)
+                checks.append((iterator, check))
+            access_checks[id(stmt)] = checks
+    return loop_checks, access_checks
+
+
+def lower_loop_boundscheck(context, builder, arrtype, ary, range_state,
+                           check):
+    """
+    Return an i1 value telling whether the LoopBoundsCheck *check* holds
+    for the array *ary* of type *arrtype* and the loop over the range
+    *range_state*.
+    """
+    shape = cgutils.unpack_tuple(builder, ary.shape, arrtype.ndim)
+    extent = shape[check.axis]
+    offset = extent.type(check.offset)
+    if check.constant:
+        return builder.icmp_signed('<', offset, extent)
+    start, stop = range_state.start, range_state.stop
+    empty = builder.icmp_signed('<=', stop, start)
+    lo = builder.sadd_with_overflow(start, offset)
+    hi = builder.sadd_with_overflow(stop, offset)
+    overflow = builder.or_(builder.extract_value(lo, 1),
+                           builder.extract_value(hi, 1))
+    lower = builder.icmp_signed('>=', builder.extract_value(lo, 0),
+                                offset.type(0))
+    upper = builder.icmp_signed('<=', builder.extract_value(hi, 0), extent)
+    in_bounds = builder.and_(builder.not_(overflow),
+                             builder.and_(lower, upper))
+    return builder.or_(empty, in_bounds)
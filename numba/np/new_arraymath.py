@@ -12,8 +12,8 @@ import numpy as np
 
 from numba.core import types, cgutils
 from numba.core.extending import overload, overload_method, register_jitable
-from numba.np.numpy_support import (as_dtype, type_can_asarray, type_is_scalar,
-                                    numpy_version, is_nonelike,
+from numba.np.numpy_support import (as_dtype, from_dtype, type_can_asarray,
+                                    type_is_scalar, numpy_version, is_nonelike,
                                     check_is_integer, lt_floats, lt_complex)
 from numba.core.imputils import (lower_builtin, impl_ret_borrowed,
                                  impl_ret_new_ref, impl_ret_untracked)
@@ -154,6 +154,205 @@ def _gen_index_tuple(tyctx, shape_tuple, value, axis):
     return function_sig, codegen
 
 
+#----------------------------------------------------------------------------
+# Pairwise summation
+
+# NumPy sums contiguous data in chunks of its buffer size, each chunk with
+# a pairwise summation of blocks of at most _PW_BLOCKSIZE real values, each
+# block with eight accumulators of real values.  This is followed here so
+# that the results match the ones of NumPy.
+_PW_CHUNKSIZE = 8192
+_PW_BLOCKSIZE = 128
+_PW_LANES = 8
+
+
+def _get_pairwise_function(context, module, transform, arrty, accty, argty):
+    """
+    Get the LLVM function ``pairwise(data, size, stride, start, n, arg)``
+    summing ``transform(a[start:start + n], arg)`` for the 1D array ``a``
+    with NumPy's (recursive) pairwise summation.
+    """
+    # NumPy sums complex numbers as pairs of real values: the blocks and
+    # the accumulators hold half as many complex numbers, and blocks are
+    # split at a multiple of eight real values.
+    is_complex = isinstance(accty, types.Complex)
+    lanes = _PW_LANES // 2 if is_complex else _PW_LANES
+    blocksize = _PW_BLOCKSIZE // 2 if is_complex else _PW_BLOCKSIZE
+
+    intp_t = context.get_value_type(types.intp)
+    llacc = context.get_value_type(accty)
+    llarg = context.get_value_type(argty)
+    dataptr = context.get_data_type(arrty.dtype).as_pointer()
+    fnty = llvmlite.ir.FunctionType(llacc, [dataptr, intp_t, intp_t, intp_t,
+                                            intp_t, llarg])
+    name = context.mangler("numba_pairwise_sum_%s" % transform.__name__,
+                           [arrty, accty, argty])
+    fn = cgutils.get_or_insert_function(module, fnty, name)
+    if not fn.is_declaration:
+        return fn
+    fn.linkage = 'internal'
+
+    builder = llvmlite.ir.IRBuilder(fn.append_basic_block())
+    data, size, stride, start, n, arg = fn.args
+    add = context.get_function(operator.add, accty(accty, accty))
+    item_sig = accty(arrty.dtype, argty)
+    # The transforms don't raise, there is no status to propagate from
+    # this function
+    item_fndesc = context.compile_subroutine(builder, transform,
+                                             item_sig).fndesc
+
+    def load(idx):
+        ptr = cgutils.get_item_pointer2(context, builder, data, [size],
+                                        [stride], arrty.layout, [idx])
+        val = load_item(context, builder, arrty, ptr)
+        _, res = context.call_internal_no_propagate(builder, item_fndesc,
+                                                    item_sig, (val, arg))
+        return res
+
+    with builder.if_then(builder.icmp_signed('>', n, intp_t(blocksize))):
+        n2 = builder.sdiv(n, intp_t(2))
+        if is_complex:
+            n2 = builder.sdiv(builder.sub(n, builder.srem(n, intp_t(8))),
+                              intp_t(2))
+        else:
+            n2 = builder.sub(n2, builder.srem(n2, intp_t(8)))
+        left = builder.call(fn, [data, size, stride, start, n2, arg])
+        right = builder.call(fn, [data, size, stride, builder.add(start, n2),
+                                  builder.sub(n, n2), arg])
+        builder.ret(add(builder, (left, right)))
+
+    # The accumulator k sums the items k modulo the number of lanes.  For
+    # real sums, the accumulators are the lanes of a vector, so that the
+    # sum is vectorized without reassociating floating point additions.
+    # They start from -0.0, the identity of floating point additions.
+    if is_complex:
+        neg_zero = context.get_constant_generic(builder, accty,
+                                                complex(-0.0, -0.0))
+        accs = [cgutils.alloca_once_value(builder, neg_zero)
+                for _ in range(lanes)]
+    else:
+        neg_zero = context.get_constant_generic(builder, accty, -0.0)
+        vecty = llvmlite.ir.VectorType(llacc, lanes)
+        accs = [cgutils.alloca_once_value(
+            builder, llvmlite.ir.Constant(vecty, [neg_zero] * lanes))]
+    nblocks = builder.sdiv(n, intp_t(lanes))
+    with cgutils.for_range(builder, nblocks) as loop:
+        first = builder.add(start, builder.mul(loop.index, intp_t(lanes)))
+        vals = [load(builder.add(first, intp_t(k))) for k in range(lanes)]
+        if is_complex:
+            for acc, val in zip(accs, vals):
+                builder.store(add(builder, (builder.load(acc), val)), acc)
+        else:
+            [acc] = accs
+            vec = llvmlite.ir.Constant(vecty, None)
+            for k, val in enumerate(vals):
+                vec = builder.insert_element(vec, val, intp_t(k))
+            builder.store(builder.fadd(builder.load(acc), vec), acc)
+    if is_complex:
+        sums = [builder.load(acc) for acc in accs]
+    else:
+        vec = builder.load(accs[0])
+        sums = [builder.extract_element(vec, intp_t(k))
+                for k in range(lanes)]
+    # e.g. ((r0 + r1) + (r2 + r3)) + ((r4 + r5) + (r6 + r7))
+    while len(sums) > 1:
+        sums = [add(builder, (sums[k], sums[k + 1]))
+                for k in range(0, len(sums), 2)]
+    # Blocks of less than one item per accumulator are summed from zero
+    zero = context.get_constant_generic(builder, accty, 0)
+    is_small = builder.icmp_signed('<', n, intp_t(lanes))
+    res = cgutils.alloca_once_value(builder,
+                                    builder.select(is_small, zero, sums[0]))
+    stop = builder.add(start, n)
+    tail = builder.add(start, builder.mul(nblocks, intp_t(lanes)))
+    with cgutils.for_range_slice(builder, tail, stop, intp_t(1),
+                                 intp=intp_t) as (idx, _):
+        builder.store(add(builder, (builder.load(res), load(idx))), res)
+    builder.ret(builder.load(res))
+    return fn
+
+
+def _gen_pairwise_sum(transform):
+    """
+    Generate a function ``pairwise_sum(a, zero, arg)`` summing
+    ``transform(v, arg)`` for the items ``v`` of the 1D array ``a`` with
+    NumPy's pairwise summation.  The sum starts from ``zero``, whose type
+    is the one of the accumulators.
+    """
+    @intrinsic
+    def pairwise_sum(tyctx, a, zero, arg):
+        accty = types.unliteral(zero)
+
+        def codegen(context, builder, sig, args):
+            arrty, zeroty, argty = sig.args
+            arr, zero, arg = args
+            intp_t = context.get_value_type(types.intp)
+            ary = make_array(arrty)(context, builder, arr)
+            [size] = cgutils.unpack_tuple(builder, ary.shape, 1)
+            [stride] = cgutils.unpack_tuple(builder, ary.strides, 1)
+            fn = _get_pairwise_function(context, builder.module, transform,
+                                        arrty, accty, argty)
+            add = context.get_function(operator.add, accty(accty, accty))
+            res = cgutils.alloca_once_value(
+                builder, context.cast(builder, zero, zeroty, accty))
+            chunk = intp_t(_PW_CHUNKSIZE)
+            with cgutils.for_range_slice(builder, intp_t(0), size, chunk,
+                                         intp=intp_t) as (start, _):
+                remaining = builder.sub(size, start)
+                n = builder.select(builder.icmp_signed('<', remaining, chunk),
+                                   remaining, chunk)
+                val = builder.call(fn, [ary.data, size, stride, start, n,
+                                        arg])
+                builder.store(add(builder, (builder.load(res), val)), res)
+            return builder.load(res)
+
+        return accty(a, zero, arg), codegen
+
+    return pairwise_sum
+
+
+def _pairwise_item(v, arg):
+    return v
+
+
+def _pairwise_nan_to_zero(v, zero):
+    return zero if np.isnan(v) else v
+
+
+def _pairwise_sq_diff(v, mean):
+    val = v - mean
+    return np.real(val * np.conj(val))
+
+
+_pairwise_sum = _gen_pairwise_sum(_pairwise_item)
+_pairwise_nansum = _gen_pairwise_sum(_pairwise_nan_to_zero)
+_pairwise_sq_diff_sum = _gen_pairwise_sum(_pairwise_sq_diff)
+
+
+def _can_sum_pairwise(arrty, accty):
+    """
+    Whether the items of the array can be summed with _pairwise_sum(), as
+    a 1D view of the array in memory order, into an accumulator of the
+    given type.
+    """
+    return (isinstance(accty, (types.Float, types.Complex))
+            and (arrty.ndim <= 1 or arrty.layout in 'CF'))
+
+
+def _flat_items(a):
+    pass
+
+
+@overload(_flat_items)
+def _flat_items_impl(a):
+    if a.ndim == 1:
+        return lambda a: a
+    elif a.layout == 'C':
+        return lambda a: a.reshape(a.size)
+    elif a.layout == 'F':
+        return lambda a: a.T.reshape(a.size)
+
+
 #----------------------------------------------------------------------------
 # Basic stats and aggregates
 
@@ -162,11 +361,15 @@ def _gen_index_tuple(tyctx, shape_tuple, value, axis):
 def array_sum(context, builder, sig, args):
     zero = sig.return_type(0)
 
-    def array_sum_impl(arr):
-        c = zero
-        for v in np.nditer(arr):
-            c += v.item()
-        return c
+    if _can_sum_pairwise(sig.args[0], sig.return_type):
+        def array_sum_impl(arr):
+            return _pairwise_sum(_flat_items(arr), zero, None)
+    else:
+        def array_sum_impl(arr):
+            c = zero
+            for v in np.nditer(arr):
+                c += v.item()
+            return c
 
     res = context.compile_internal(builder, array_sum_impl, sig, args,
                                    locals=dict(c=sig.return_type))
@@ -291,11 +494,15 @@ def array_sum_axis_dtype(context, builder, sig, args):
 def array_sum_dtype(context, builder, sig, args):
     zero = sig.return_type(0)
 
-    def array_sum_impl(arr, dtype):
-        c = zero
-        for v in np.nditer(arr):
-            c += v.item()
-        return c
+    if _can_sum_pairwise(sig.args[0], sig.return_type):
+        def array_sum_impl(arr, dtype):
+            return _pairwise_sum(_flat_items(arr), zero, None)
+    else:
+        def array_sum_impl(arr, dtype):
+            c = zero
+            for v in np.nditer(arr):
+                c += v.item()
+            return c
 
     res = context.compile_internal(builder, array_sum_impl, sig, args,
                                    locals=dict(c=sig.return_type))
@@ -433,6 +640,13 @@ def array_mean(a):
 
         acc_init = get_accumulator(dtype, 0)
 
+        if _can_sum_pairwise(a, from_dtype(dtype)):
+            def array_mean_impl(a):
+                # The items are summed as the accumulator's type, so that
+                # integer sums don't overflow
+                return _pairwise_sum(_flat_items(a), acc_init, None) / a.size
+            return array_mean_impl
+
         def array_mean_impl(a):
             # Can't use the naive `arr.sum() / arr.size`, as it would return
             # a wrong result on integer sum overflow.
@@ -448,6 +662,14 @@ def array_mean(a):
 @overload_method(types.Array, "var")
 def array_var(a):
     if isinstance(a, types.Array):
+        if _can_sum_pairwise(a, types.float64):
+            def array_var_impl(a):
+                m = a.mean()
+                # Sum the squared differences without a temporary array
+                ssd = _pairwise_sq_diff_sum(_flat_items(a), 0.0, m)
+                return ssd / a.size
+            return array_var_impl
+
         def array_var_impl(a):
             # Compute the mean
             m = a.mean()
@@ -1263,6 +1485,11 @@ def np_nansum(a):
     zero = retty(0)
     isnan = get_isnan(a.dtype)
 
+    if _can_sum_pairwise(a, retty):
+        def nansum_impl(a):
+            return _pairwise_nansum(_flat_items(a), zero, zero)
+        return nansum_impl
+
     def nansum_impl(a):
         c = zero
         for view in np.nditer(a):
@@ -1652,9 +1652,34 @@ def np_real_copysign_impl(context, builder, sig, args):
 
     return mathimpl.copysign_float_impl(context, builder, sig, args)
 
+def _half_nextafter(builder, x, y):
+    # Like npy_half_nextafter(), step the bits of the float16 *x* by one
+    # towards *y*
+    i16 = llvmlite.ir.IntType(16)
+    zero = x.type(0)
+    xbits = builder.bitcast(x, i16)
+    # Moving away from zero increments the bits
+    away = builder.icmp_unsigned('==', builder.fcmp_ordered('<', x, y),
+                                 builder.fcmp_ordered('>', x, zero))
+    res = builder.select(away, builder.add(xbits, i16(1)),
+                         builder.sub(xbits, i16(1)))
+    # From zero, the result is the smallest subnormal with the sign of *y*
+    ysign = builder.and_(builder.bitcast(y, i16), i16(0x8000))
+    res = builder.select(builder.fcmp_ordered('==', x, zero),
+                         builder.or_(ysign, i16(1)), res)
+    res = builder.bitcast(res, x.type)
+    # Equal values give *x*, NaNs give NaN
+    res = builder.select(builder.fcmp_ordered('==', x, y), x, res)
+    return builder.select(builder.fcmp_unordered('uno', x, y),
+                          builder.fadd(x, y), res)
+
+
 def np_real_nextafter_impl(context, builder, sig, args):
     _check_arity_and_homogeneity(sig, args, 2)
 
+    if sig.args[0] == types.float16:
+        return _half_nextafter(builder, *args)
+
     dispatch_table = {
         types.float32: 'numba_nextafterf',
         types.float64: 'numba_nextafter',
@@ -1672,12 +1697,20 @@ def np_real_spacing_impl(context, builder, sig, args):
     # that there is a lot of redundancy present between the two.
     _check_arity_and_homogeneity(sig, args, 1)
 
+    [ty] = sig.args
+    if ty == types.float16:
+        # Like npy_half_spacing(), the float16 spacing is always towards
+        # +inf, and it is NaN for both infinities
+        [x] = args
+        nextafter = _half_nextafter(builder, x, x.type(np.inf))
+        return builder.select(mathimpl.is_inf(builder, x), x.type(np.nan),
+                              builder.fsub(nextafter, x))
+
     dispatch_table = {
         types.float32: 'numba_nextafterf',
         types.float64: 'numba_nextafter',
     }
 
-    [ty] = sig.args
     inner_sig = typing.signature(sig.return_type, ty, ty)
     ll_ty = args[0].type
     ll_inf = ll_ty(np.inf)
@@ -374,15 +374,31 @@ def _broadcast_onto(src_ndim, src_shape, dest_ndim, dest_shape):
             dest_index += 1
     return dest_index
 
-def _build_array(context, builder, array_ty, input_types, inputs):
-    """Utility function to handle allocation of an implicit output array
-    given the target context, builder, output array type, and a list of
-    _ArrayHelper instances.
+def _reuse_or_empty_nd(context, builder, arrtype, shapes, slot):
+    """Return a new reference to the array held by *slot* if it has the
+    given *shapes*, otherwise allocate a new array and hold it in *slot*
+    in place of the previous one.
+    """
+    prev = arrayobj.make_array(arrtype)(context, builder, ref=slot)
+    prev_shapes = cgutils.unpack_tuple(builder, prev.shape, arrtype.ndim)
+    same = cgutils.is_not_null(builder, prev.meminfo)
+    for prev_dim, dim in zip(prev_shapes, shapes):
+        same = builder.and_(same, builder.icmp_signed('==', prev_dim, dim))
+    with builder.if_then(builder.not_(same), likely=False):
+        new = arrayobj._empty_nd_impl(context, builder, arrtype, shapes)
+        context.nrt.decref(builder, arrtype, builder.load(slot))
+        builder.store(new._getvalue(), slot)
+    array_val = arrayobj.make_array(arrtype)(context, builder,
+                                             value=builder.load(slot))
+    context.nrt.incref(builder, arrtype, array_val._getvalue())
+    return array_val
+
+
+def _broadcast_shape(context, builder, ndim, inputs):
+    """Utility function computing the *ndim*-dimensional shape the
+    _ArrayHelper and _ScalarHelper *inputs* broadcast to, raising a
+    ValueError if they don't.  Returns a tuple of intp values.
     """
-    # First, strip optional types, ufunc loops are typed on concrete types
-    input_types = [x.type if isinstance(x, types.Optional) else x
-                   for x in input_types]
-
     intp_ty = context.get_value_type(types.intp)
     def make_intp_const(val):
         return context.get_constant(types.intp, val)
@@ -390,13 +406,13 @@ def _build_array(context, builder, array_ty, input_types, inputs):
     ZERO = make_intp_const(0)
     ONE = make_intp_const(1)
 
-    src_shape = cgutils.alloca_once(builder, intp_ty, array_ty.ndim,
+    src_shape = cgutils.alloca_once(builder, intp_ty, ndim,
                                     "src_shape")
-    dest_ndim = make_intp_const(array_ty.ndim)
-    dest_shape = cgutils.alloca_once(builder, intp_ty, array_ty.ndim,
+    dest_ndim = make_intp_const(ndim)
+    dest_shape = cgutils.alloca_once(builder, intp_ty, ndim,
                                      "dest_shape")
     dest_shape_addrs = tuple(cgutils.gep_inbounds(builder, dest_shape, index)
-                             for index in range(array_ty.ndim))
+                             for index in range(ndim))
 
     # Initialize the destination shape with all ones.
     for dest_shape_addr in dest_shape_addrs:
@@ -426,12 +442,32 @@ def _build_array(context, builder, array_ty, input_types, inputs):
 
             context.call_conv.return_user_exc(builder, ValueError, (msg,))
 
+    return tuple(builder.load(dest_shape_addr)
+                 for dest_shape_addr in dest_shape_addrs)
+
+
+def _build_array(context, builder, array_ty, input_types, inputs,
+                 reuse_slot=None):
+    """Utility function to handle allocation of an implicit output array
+    given the target context, builder, output array type, and a list of
+    _ArrayHelper instances.  If *reuse_slot* is given, it points to the
+    output array of the previous call, whose buffer is reused if it has the
+    right shape.
+    """
+    # First, strip optional types, ufunc loops are typed on concrete types
+    input_types = [x.type if isinstance(x, types.Optional) else x
+                   for x in input_types]
+
+    dest_shape_tup = _broadcast_shape(context, builder, array_ty.ndim, inputs)
+
     real_array_ty = array_ty.as_array
 
-    dest_shape_tup = tuple(builder.load(dest_shape_addr)
-                           for dest_shape_addr in dest_shape_addrs)
-    array_val = arrayobj._empty_nd_impl(context, builder, real_array_ty,
-                                        dest_shape_tup)
+    if reuse_slot is None:
+        array_val = arrayobj._empty_nd_impl(context, builder, real_array_ty,
+                                            dest_shape_tup)
+    else:
+        array_val = _reuse_or_empty_nd(context, builder, real_array_ty,
+                                       dest_shape_tup, reuse_slot)
 
     # Get the best argument to call __array_wrap__ on
     array_wrapper_index = select_array_wrapper(input_types)
@@ -480,7 +516,8 @@ def _pack_output_values(ufunc, context, builder, typ, values):
         return context.make_tuple(builder, typ, values)
 
 
-def numpy_ufunc_kernel(context, builder, sig, args, ufunc, kernel_class):
+def numpy_ufunc_kernel(context, builder, sig, args, ufunc, kernel_class,
+                       reuse_slot=None):
     # This is the code generator that builds all the looping needed
     # to execute a numpy functions over several dimensions (including
     # scalar cases).
@@ -491,6 +528,8 @@ def numpy_ufunc_kernel(context, builder, sig, args, ufunc, kernel_class):
     # args - the args to the ufunc
     # ufunc - the ufunc itself
     # kernel_class -  a code generating subclass of _Kernel that provides
+    # reuse_slot - optional pointer to the previous implicit output, whose
+    #              buffer can be reused
 
     arguments = [_prepare_argument(context, builder, arg, tyarg)
                  for arg, tyarg in zip(args, sig.args)]
@@ -504,7 +543,8 @@ def numpy_ufunc_kernel(context, builder, sig, args, ufunc, kernel_class):
         if ufunc.nin + out_i >= len(arguments):
             # this out argument is not provided
             if isinstance(ret_ty, types.ArrayCompatible):
-                output = _build_array(context, builder, ret_ty, sig.args, arguments)
+                output = _build_array(context, builder, ret_ty, sig.args,
+                                      arguments, reuse_slot=reuse_slot)
             else:
                 output = _prepare_argument(
                     context, builder,
@@ -0,0 +1,376 @@
+"""
+Stack allocation of small arrays that do not escape the function.
+
+Arrays created by ``np.empty``, ``np.zeros`` or ``np.ones`` with a shape
+known at compile time and a small enough size are lowered to an ``alloca``
+in the entry block of the function instead of an NRT allocation, when an
+escape analysis of the Numba IR proves that no reference to the array (or
+to a view of it) outlives the function.  Such arrays have a NULL meminfo,
+which makes the reference counting operations applied to them no-ops.
+
+As the buffer of an allocation site is reused by every execution of that
+site, e.g. across the iterations of a loop, an array is only placed on the
+stack if none of its aliases is still live when the site is reached again.
+"""
+import numpy as np
+from llvmlite import ir as llvmir
+
+from numba.core import analysis, cgutils, config, ir, ir_utils, types
+from numba.np.numpy_support import as_dtype
+
+
+# The functions whose result is placed on the stack
+_ALLOCATORS = {np.empty: 'empty', np.zeros: 'zeros', np.ones: 'ones'}
+
+# The total size of the arrays placed on the stack in a function
+_MAX_TOTAL_BYTES = 16 * 1024
+
+# Functions returning a new array, whatever the arrays given as their first
+# two arguments
+_FRESH_RESULT_FUNCTIONS = frozenset([
+    np.dot, np.vdot, np.inner, np.outer, np.cross, np.kron, np.copy,
+    np.empty_like, np.zeros_like, np.ones_like, np.full_like,
+    np.sort, np.cumsum, np.cumprod, np.diff, np.concatenate, np.stack,
+    np.hstack, np.vstack, np.linalg.inv, np.linalg.solve, np.linalg.pinv,
+    np.linalg.det, np.linalg.norm, np.linalg.eig, np.linalg.eigh,
+    np.linalg.eigvals, np.linalg.svd, np.linalg.qr, np.linalg.cholesky,
+    np.linalg.lstsq, np.linalg.matrix_power,
+])
+
+_FRESH_RESULT_METHODS = frozenset(["array.copy", "array.astype"])
+
+# Types whose values cannot refer to the buffer of an array
+_NO_REFERENCE_TYPES = (
+    types.Number, types.Boolean, types.NoneType, types.Omitted,
+    types.NPDatetime, types.NPTimedelta, types.EnumMember, types.UnicodeType,
+    types.StringLiteral, types.SliceType, types.RangeType, types.DType,
+    types.NumberClass, types.Function, types.Dispatcher,
+)
+
+
+def _refers_to_memory(ty):
+    """Whether values of type *ty* may hold a reference to an array.
+    """
+    if isinstance(ty, types.Optional):
+        return _refers_to_memory(ty.type)
+    if isinstance(ty, types.BaseTuple):
+        return any(_refers_to_memory(t) for t in ty)
+    return not isinstance(ty, _NO_REFERENCE_TYPES)
+
+
+def _can_capture(ty):
+    """Whether storing a reference into a value of type *ty*, e.g. by
+    passing both to a function, may make the reference outlive the call.
+    """
+    if isinstance(ty, types.Optional):
+        return _can_capture(ty.type)
+    if isinstance(ty, types.BaseTuple):
+        return any(_can_capture(t) for t in ty)
+    return not isinstance(ty, _NO_REFERENCE_TYPES + (types.Array,))
+
+
+def _const_shape(func_ir, typemap, var):
+    """Return the shape given by *var* as a tuple of ints, or None if it is
+    not known at compile time.
+    """
+    ty = typemap[var.name]
+    if isinstance(ty, types.IntegerLiteral):
+        return (ty.literal_value,)
+    defn = ir_utils.guard(ir_utils.get_definition, func_ir, var)
+    if isinstance(defn, (ir.Const, ir.Global, ir.FreeVar)):
+        value = defn.value
+        if isinstance(value, int):
+            return (value,)
+        if (isinstance(value, tuple)
+                and all(isinstance(v, int) for v in value)):
+            return value
+        return None
+    if isinstance(defn, ir.Expr) and defn.op == 'build_tuple':
+        shape = []
+        for item in defn.items:
+            value = ir_utils.guard(ir_utils.find_const, func_ir, item)
+            if not isinstance(value, int):
+                return None
+            shape.append(value)
+        return tuple(shape)
+    return None
+
+
+def _find_candidates(func_ir, typemap, max_bytes):
+    """Find the allocations of small arrays with a constant shape, return
+    a dict mapping the assignment statements to ``(kind, shape, nbytes)``.
+    """
+    candidates = {}
+    for block in func_ir.blocks.values():
+        for stmt in block.find_insts(ir.Assign):
+            expr = stmt.value
+            if not (isinstance(expr, ir.Expr) and expr.op == 'call'):
+                continue
+            fnty = typemap[expr.func.name]
+            if not isinstance(fnty, types.Function):
+                continue
+            kind = _ALLOCATORS.get(getattr(fnty, 'typing_key', None))
+            if kind is None:
+                continue
+            arrty = typemap[stmt.target.name]
+            if not (isinstance(arrty, types.Array) and arrty.layout == 'C'
+                    and isinstance(arrty.dtype, (types.Number,
+                                                 types.Boolean))):
+                continue
+            if expr.args:
+                shape_var = expr.args[0]
+            else:
+                shape_var = dict(expr.kws).get('shape')
+            if shape_var is None or expr.vararg is not None:
+                continue
+            shape = _const_shape(func_ir, typemap, shape_var)
+            if shape is None or len(shape) != arrty.ndim:
+                continue
+            if any(s < 0 for s in shape):
+                continue
+            nbytes = int(np.prod(shape)) * as_dtype(arrty.dtype).itemsize
+            if nbytes > max_bytes:
+                continue
+            candidates[stmt] = kind, shape, nbytes
+    return candidates
+
+
+class _AliasSet(object):
+    """Track the variables that may refer to the buffer of an array created
+    at a given allocation site, and whether the buffer escapes.  If
+    *allow_return* is true, returning the array is not considered an
+    escape.
+    """
+
+    def __init__(self, func_ir, typemap, name, allow_return=False):
+        self.func_ir = func_ir
+        self.typemap = typemap
+        self.allow_return = allow_return
+        self.names = {name}
+        # The aliases that are plain copies of the array
+        self.copies = {name}
+        self.escapes = False
+
+    def _uses(self, *vars):
+        return any(v.name in self.names for v in vars)
+
+    def _alias(self, target, refers=True):
+        if refers and _refers_to_memory(self.typemap[target.name]):
+            self.names.add(target.name)
+
+    def _call_result_is_fresh(self, expr, fnty):
+        args = list(expr.args)
+        if any(v.name in self.names for _, v in expr.kws):
+            return False
+        if isinstance(fnty, types.Function):
+            key = fnty.typing_key
+            if isinstance(key, np.ufunc):
+                return not self._uses(*args[key.nin:])
+            if key in _FRESH_RESULT_FUNCTIONS:
+                return not self._uses(*args[2:])
+        elif isinstance(fnty, types.BoundFunction):
+            if fnty.typing_key in _FRESH_RESULT_METHODS:
+                return True
+        return False
+
+    def _visit_call(self, target, expr):
+        fnty = self.typemap[expr.func.name]
+        vars = [expr.func] + list(expr.args) + [v for _, v in expr.kws]
+        if expr.vararg is not None:
+            vars.append(expr.vararg)
+        if not self._uses(*vars):
+            return
+        if (not isinstance(fnty, (types.Function, types.BoundFunction,
+                                  types.Dispatcher, types.NumberClass))
+                or isinstance(fnty, (types.ObjModeDispatcher,
+                                     types.ExternalFunction))):
+            self.escapes = True
+            return
+        # A reference may be stored into another argument
+        others = [v for v in vars[1:] if v.name not in self.names]
+        if isinstance(fnty, types.BoundFunction):
+            if expr.func.name not in self.names and _can_capture(fnty.this):
+                self.escapes = True
+                return
+        if any(_can_capture(self.typemap[v.name]) for v in others):
+            self.escapes = True
+            return
+        self._alias(target, not self._call_result_is_fresh(expr, fnty))
+
+    def _visit_expr(self, target, expr):
+        op = expr.op
+        if op == 'call':
+            self._visit_call(target, expr)
+        elif not self._uses(*expr.list_vars()):
+            return
+        elif op in ('make_function', 'yield'):
+            self.escapes = True
+        elif op == 'getattr' and expr.attr == 'ctypes':
+            # The data pointer can be extracted as an integer
+            self.escapes = True
+        elif op in ('binop', 'unary'):
+            # Operators on arrays return new arrays
+            ty = self.typemap[target.name]
+            self._alias(target, not isinstance(ty, types.Array))
+        elif op == 'inplace_binop':
+            if expr.lhs.name in self.names:
+                self._alias(target)
+            elif not isinstance(self.typemap[expr.lhs.name], types.Array):
+                self.escapes = True
+        elif op == 'arrayexpr':
+            # The result is a new array, unless evaluated into an output
+            out = expr._kws.get('out')
+            if out is not None and out.name in self.names:
+                self._alias(target)
+        else:
+            self._alias(target)
+
+    def _visit_stmt(self, stmt):
+        if isinstance(stmt, ir.Assign):
+            value = stmt.value
+            if isinstance(value, ir.Var):
+                if value.name in self.names:
+                    self._alias(stmt.target)
+                if value.name in self.copies:
+                    self.copies.add(stmt.target.name)
+            elif isinstance(value, ir.Expr):
+                self._visit_expr(stmt.target, value)
+        elif isinstance(stmt, (ir.SetItem, ir.StaticSetItem)):
+            if stmt.value.name in self.names:
+                if stmt.target.name not in self.names:
+                    targetty = self.typemap[stmt.target.name]
+                    if not isinstance(targetty, types.Array):
+                        self.escapes = True
+        elif isinstance(stmt, (ir.Del, ir.Jump, ir.Branch, ir.Print,
+                               ir.EnterWith, ir.PopBlock, ir.StaticRaise,
+                               ir.StaticTryRaise)):
+            pass
+        elif isinstance(stmt, ir.Return) and self.allow_return:
+            pass
+        elif self._uses(*stmt.list_vars()):
+            # Return, SetAttr, DynamicRaise, extension nodes (e.g. parfors)...
+            self.escapes = True
+
+    def run(self):
+        """Compute the aliases of the array, return whether it escapes.
+        """
+        size = None
+        while size != len(self.names) and not self.escapes:
+            size = len(self.names)
+            for block in self.func_ir.blocks.values():
+                for stmt in block.body:
+                    self._visit_stmt(stmt)
+                    if self.escapes:
+                        return True
+        return self.escapes
+
+
+def _live_around(func_ir, cfg, live_map, label, stmt):
+    """Return the variables live just before and just after *stmt* in the
+    block *label*.
+    """
+    block = func_ir.blocks[label]
+    live = set()
+    for succ, _ in cfg.successors(label):
+        live |= live_map[succ]
+    for inst in reversed(block.body):
+        if inst is stmt:
+            after = set(live)
+        if isinstance(inst, ir.Assign):
+            live.discard(inst.target.name)
+        live |= {v.name for v in inst.list_vars()
+                 if not (isinstance(inst, ir.Assign) and v is inst.target)}
+        if inst is stmt:
+            break
+    return live, after
+
+
+def find_stack_arrays(func_ir, typemap):
+    """Return a dict mapping the name of the variables assigned the
+    result of array allocations that can be placed on the stack to
+    ``(kind, shape)``, where *kind* is one of ``'empty'``, ``'zeros'`` and
+    ``'ones'``.
+    """
+    max_bytes = config.STACK_ARRAY_MAX_BYTES
+    if max_bytes <= 0 or func_ir.func_id.is_generator:
+        return {}
+    candidates = _find_candidates(func_ir, typemap, max_bytes)
+    if not candidates:
+        return {}
+
+    usedefs = analysis.compute_use_defs(func_ir.blocks)
+    cfg = analysis.compute_cfg_from_blocks(func_ir.blocks)
+    live_map = analysis.compute_live_map(cfg, func_ir.blocks,
+                                         usedefs.usemap, usedefs.defmap)
+    labels = {stmt: label for label, block in func_ir.blocks.items()
+              for stmt in block.body if stmt in candidates}
+    # The target of an allocation must be assigned once, so that the
+    # lowering of other assignments to it is not affected
+    assigned = {}
+    for block in func_ir.blocks.values():
+        for stmt in block.find_insts(ir.Assign):
+            name = stmt.target.name
+            assigned[name] = assigned.get(name, 0) + 1
+
+    stack_arrays = {}
+    total = 0
+    for stmt, (kind, shape, nbytes) in candidates.items():
+        name = stmt.target.name
+        if assigned[name] != 1 or total + nbytes > _MAX_TOTAL_BYTES:
+            continue
+        aliases = _AliasSet(func_ir, typemap, name)
+        if aliases.run():
+            continue
+        live, _ = _live_around(func_ir, cfg, live_map, labels[stmt], stmt)
+        if live & aliases.names:
+            continue
+        stack_arrays[name] = kind, shape
+        total += nbytes
+    return stack_arrays
+
+
+def make_stack_array(context, builder, arrtype, shape, kind):
+    """Create an array of type *arrtype* and constant *shape* in a buffer
+    allocated on the stack, return its LLVM value.  The buffer is zeroed or
+    filled with ones according to *kind*.
+    """
+    from numba.np.arrayobj import make_array, populate_array
+
+    dtype = context.get_data_type(arrtype.dtype)
+    itemsize = context.get_abi_sizeof(dtype)
+    nitems = 1
+    for s in shape:
+        nitems *= s
+    # Align the buffer as NRT allocations are
+    align = max(context.get_preferred_array_alignment(arrtype.dtype),
+                context.get_abi_alignment(dtype))
+    buf = cgutils.alloca_once(builder, llvmir.ArrayType(dtype, nitems),
+                              name='stackarr')
+    buf.align = align
+    data = builder.bitcast(buf, dtype.as_pointer())
+    if kind == 'zeros':
+        cgutils.memset(builder, data, context.get_constant(types.intp,
+                                                           nitems * itemsize),
+                       0)
+    elif kind == 'ones':
+        one = context.get_constant(arrtype.dtype, 1)
+        with cgutils.for_range(builder, context.get_constant(types.intp,
+                                                             nitems)) as loop:
+            builder.store(one, builder.gep(data, [loop.index]))
+
+    strides = []
+    stride = itemsize
+    for s in reversed(shape):
+        strides.append(stride)
+        stride *= s
+    strides.reverse()
+
+    intp = context.get_value_type(types.intp)
+    ary = make_array(arrtype)(context, builder)
+    populate_array(ary,
+                   data=data,
+                   shape=[intp(s) for s in shape],
+                   strides=[intp(s) for s in strides],
+                   itemsize=itemsize,
+                   meminfo=None)
+    return ary._getvalue()
@@ -7,7 +7,9 @@ from types import SimpleNamespace
 import numpy as np
 import operator
 
-from numba.core import types, targetconfig, ir, rewrites, compiler
+from numba.core import (analysis, cgutils, types, targetconfig, ir, ir_utils,
+                        rewrites, compiler)
+from numba.core.imputils import impl_ret_borrowed
 from numba.core.typing import npydecl
 from numba.np.ufunc.dufunc import DUFunc
 
@@ -29,6 +31,16 @@ class RewriteArrayExprs(rewrites.Rewrite):
         special_ops = state.targetctx.special_ops
         if 'arrayexpr' not in special_ops:
             special_ops['arrayexpr'] = _lower_array_expr
+        self.typingctx = state.typingctx
+        # Whether array expressions can be evaluated directly into an
+        # explicit output or a slice assignment target, or reduced without
+        # materializing them.  Parfors convert array expressions to loops
+        # writing into a new array instead, and fuse them with reductions.
+        # The rewrite may also be applied to a state without compiler flags,
+        # the array expressions are then left as they are.
+        flags = getattr(state, 'flags', None)
+        self.fuse_outputs = (flags is not None and
+                             not flags.auto_parallel.enabled)
 
     def match(self, func_ir, block, typemap, calltypes):
         """
@@ -41,10 +53,13 @@ class RewriteArrayExprs(rewrites.Rewrite):
         if len(calltypes) == 0:
             return False
 
+        self.func_ir = func_ir
         self.crnt_block = block
         self.typemap = typemap
         # { variable name: IR assignment (of a function call or operator) }
         self.array_assigns = OrderedDict()
+        # { variable name: explicit output variable of the ufunc call }
+        self.out_assigns = {}
         # { variable name: IR assignment (of a constant) }
         self.const_assigns = {}
 
@@ -92,6 +107,13 @@ class RewriteArrayExprs(rewrites.Rewrite):
                     if not self._has_explicit_output(expr, func_key):
                         # If not, match it as a (sub)expression.
                         array_assigns[target_name] = instr
+                    else:
+                        # If so, it can only be the root of an expression
+                        # evaluated into the output.
+                        out = self._get_explicit_output(expr, func_key)
+                        if out is not None:
+                            array_assigns[target_name] = instr
+                            self.out_assigns[target_name] = out
 
     def _has_explicit_output(self, expr, func):
         """
@@ -105,6 +127,25 @@ class RewriteArrayExprs(rewrites.Rewrite):
             return True
         return nargs > func.nin
 
+    def _get_explicit_output(self, expr, func):
+        """
+        Return the output array explicitly passed (positionally or as
+        ``out=``) to the *expr* call to *func* (a single output ufunc), or
+        None if there isn't one or the call cannot be fused.
+        """
+        if not self.fuse_outputs or func.nout != 1 or expr.vararg is not None:
+            return None
+        kws = dict(expr.kws)
+        if len(expr.args) == func.nin + 1 and not kws:
+            out = expr.args[-1]
+        elif len(expr.args) == func.nin and list(kws) == ['out']:
+            out = kws['out']
+        else:
+            return None
+        if not isinstance(self.typemap[out.name], types.Array):
+            return None
+        return out
+
     def _get_array_operator(self, ir_expr):
         ir_op = ir_expr.op
         if ir_op in ('unary', 'binop'):
@@ -125,7 +166,9 @@ class RewriteArrayExprs(rewrites.Rewrite):
         elif ir_op == 'unary':
             return ir_expr.list_vars()
         elif ir_op == 'call':
-            return ir_expr.args
+            # Leave out the explicit output, if any
+            func = self.typemap[ir_expr.func.name].typing_key
+            return ir_expr.args[:func.nin]
         raise NotImplementedError(
             "Don't know how to find the operands for '{0}' expressions.".format(
                 ir_op))
@@ -152,16 +195,21 @@ class RewriteArrayExprs(rewrites.Rewrite):
             expr = instr.value
             arr_inps = []
             arr_expr = self._get_array_operator(expr), arr_inps
+            kws = {}
+            if instr.target.name in self.out_assigns:
+                kws['out'] = self.out_assigns[instr.target.name]
             new_expr = ir.Expr(op='arrayexpr',
                                loc=expr.loc,
                                expr=arr_expr,
-                               ty=self.typemap[instr.target.name])
+                               ty=self.typemap[instr.target.name],
+                               **kws)
             new_instr = ir.Assign(new_expr, instr.target, instr.loc)
             replace_map[instr] = new_instr
             self.array_assigns[instr.target.name] = new_instr
             for operand in self._get_operands(expr):
                 operand_name = operand.name
-                if operand.is_temp and operand_name in self.array_assigns:
+                if (operand.is_temp and operand_name in self.array_assigns
+                        and operand_name not in self.out_assigns):
                     child_assign = self.array_assigns[operand_name]
                     child_expr = child_assign.value
                     child_operands = child_expr.list_vars()
@@ -228,8 +276,250 @@ class RewriteArrayExprs(rewrites.Rewrite):
         if delete_map:
             for instr in delete_map.values():
                 result.insert_before_terminator(instr)
+        if self.fuse_outputs:
+            self._fuse_consumers(result)
         return result
 
+    def _is_basic_index(self, ty):
+        '''Return whether indexing an array with an index of type *ty*
+        returns a view.
+        '''
+        if isinstance(ty, types.BaseTuple):
+            return all(self._is_basic_index(t) for t in ty)
+        return isinstance(ty, (types.Integer, types.SliceType,
+                               types.EllipsisType))
+
+    def _get_setitem_view(self, stmt):
+        '''Return the index of the *stmt* setitem if it stores into a view
+        of an array, None otherwise.
+        '''
+        if isinstance(stmt, ir.StaticSetItem):
+            index = stmt.index_var
+        else:
+            index = stmt.index
+        arrty = self.typemap[stmt.target.name]
+        if (index is None or not isinstance(arrty, types.Array)
+                or not arrty.mutable):
+            return None
+        indexty = self.typemap[index.name]
+        if not self._is_basic_index(indexty):
+            return None
+        sig = self.typingctx.resolve_function_type(operator.getitem,
+                                                   (arrty, indexty), {})
+        if sig is None or not isinstance(sig.return_type, types.Array):
+            return None
+        return index
+
+    def _is_pure(self, stmt):
+        '''Return whether *stmt* can be moved after the evaluation of array
+        expressions, i.e. it doesn't write to memory.
+        '''
+        if isinstance(stmt, ir.Del):
+            return True
+        if not isinstance(stmt, ir.Assign):
+            return False
+        value = stmt.value
+        if isinstance(value, (ir.Const, ir.Global, ir.FreeVar, ir.Var)):
+            return True
+        if not isinstance(value, ir.Expr):
+            return False
+        if value.op == 'arrayexpr':
+            return value._kws.get('out') is None
+        if value.op in ('build_tuple', 'static_getitem', 'getitem'):
+            return True
+        if value.op == 'getattr':
+            return isinstance(self.typemap[value.value.name], types.Array)
+        if value.op in ('binop', 'unary'):
+            return isinstance(self.typemap[stmt.target.name], types.Number)
+        if value.op == 'call':
+            fnty = self.typemap[value.func.name]
+            return (isinstance(fnty, types.Function)
+                    and fnty.typing_key is slice)
+        return False
+
+    def _fuse_setitem(self, stmt, pending, methods, uses):
+        """Return the array expression evaluated into the view stored into
+        by the *stmt* setitem, along with the assignments it replaces, or
+        None if its value is not a pending array expression.
+        """
+        assign = pending.get(stmt.value.name)
+        if assign is None or uses[stmt.value.name] != 2:
+            return None
+        index = self._get_setitem_view(stmt)
+        if index is None:
+            return None
+        expr = assign.value
+        out_var = ir.Var(stmt.target.scope,
+                         ir_utils.mk_unique_var("$arrayexpr_out"), stmt.loc)
+        self.typemap[out_var.name] = types.none
+        new_expr = ir.Expr(op='arrayexpr', loc=expr.loc, expr=expr.expr,
+                           ty=expr.ty, out=stmt.target, out_index=index)
+        return ir.Assign(new_expr, out_var, stmt.loc), [assign]
+
+    def _fuse_reduction(self, stmt, pending, methods, uses):
+        """Return the array expression reduced by the *stmt* call, along
+        with the assignments it replaces, or None if it isn't a supported
+        reduction of pending array expressions.
+        """
+        expr = stmt.value
+        if expr.kws or expr.vararg is not None:
+            return None
+        fnty = self.typemap[expr.func.name]
+        args = list(expr.args)
+        assigns = []
+        if isinstance(fnty, types.BoundFunction):
+            getattr_assign = methods.get(expr.func.name)
+            if (getattr_assign is None or args
+                    or uses[expr.func.name] != 2):
+                return None
+            reduction = getattr_assign.value.attr
+            if reduction not in _array_reduce_methods:
+                return None
+            args = [getattr_assign.value.value]
+            assigns.append(getattr_assign)
+        elif isinstance(fnty, types.Function):
+            reduction = _array_reduce_functions.get(fnty.typing_key)
+            if reduction is None or len(args) != (2 if reduction == 'dot'
+                                                  else 1):
+                return None
+        else:
+            return None
+
+        trees = []
+        for arg in args:
+            assign = pending.get(arg.name)
+            if assign is not None and uses[arg.name] == 2:
+                assigns.append(assign)
+                trees.append(assign.value.expr)
+            else:
+                trees.append(arg)
+        if all(isinstance(tree, ir.Var) for tree in trees):
+            # No array expression operand
+            return None
+
+        resty = self.typemap[stmt.target.name]
+        if reduction == 'dot':
+            # The inner product of two vectors
+            argtys = [self.typemap[arg.name] for arg in args]
+            if not all(isinstance(ty, types.Array) and ty.ndim == 1
+                       for ty in argtys):
+                return None
+            if not isinstance(resty, (types.Float, types.Complex)):
+                return None
+            tree = (operator.mul, trees)
+            ty = types.Array(resty, 1, 'C')
+        else:
+            tree, = trees
+            ty = pending[args[0].name].value.ty
+            if reduction in ('min', 'max') and not isinstance(
+                    ty.dtype, (types.Integer, types.Float, types.Boolean)):
+                return None
+        new_expr = ir.Expr(op='arrayexpr', loc=expr.loc, expr=tree, ty=ty,
+                           reduce=reduction, reduce_ty=resty)
+        return ir.Assign(new_expr, stmt.target, stmt.loc), assigns
+
+    def _fuse_consumers(self, block):
+        """Move the array expressions assigned to temporaries only used by
+        a store into a view of another array (as in ``x[1:-1] = a + b``)
+        or by a reduction (as in ``np.sum(a * b)``) to their consumer,
+        which is replaced by an array expression evaluated into the view
+        or reduced without materializing its result.
+        """
+        uses = defaultdict(int)
+        for other in self.func_ir.blocks.values():
+            if other is self.crnt_block:
+                continue
+            for stmt in other.body:
+                if not isinstance(stmt, ir.Del):
+                    for var in stmt.list_vars():
+                        uses[var.name] += 1
+        for stmt in block.body:
+            if not isinstance(stmt, ir.Del):
+                for var in stmt.list_vars():
+                    uses[var.name] += 1
+
+        # { temporary name: its array expression assignment }
+        pending = {}
+        # { bound method name: its getattr on a pending temporary }
+        methods = {}
+        # { consumer: (new assignment, replaced assignments) }
+        fused = {}
+        for stmt in block.body:
+            result = None
+            if isinstance(stmt, (ir.SetItem, ir.StaticSetItem)):
+                result = self._fuse_setitem(stmt, pending, methods, uses)
+            elif (isinstance(stmt, ir.Assign)
+                    and isinstance(stmt.value, ir.Expr)
+                    and stmt.value.op == 'call'):
+                result = self._fuse_reduction(stmt, pending, methods, uses)
+            if result is not None:
+                fused[stmt] = result
+            if result is not None or not self._is_pure(stmt):
+                # The stores may be read by the pending expressions
+                pending.clear()
+                methods.clear()
+                continue
+            if isinstance(stmt, ir.Assign):
+                # Operands must not be redefined before the evaluation
+                target = stmt.target.name
+                for name, assign in list(pending.items()):
+                    if any(var.name == target
+                           for var in assign.value.list_vars()):
+                        del pending[name]
+                value = stmt.value
+                if not isinstance(value, ir.Expr):
+                    continue
+                if value.op == 'arrayexpr' and stmt.target.is_temp:
+                    pending[target] = stmt
+                elif value.op == 'getattr' and value.value.name in pending:
+                    methods[target] = stmt
+        if not fused:
+            return
+
+        moved = set()
+        for _, assigns in fused.values():
+            moved.update(assigns)
+        moved_names = {assign.target.name for assign in moved}
+        # The number of moved assignments using each variable and not
+        # evaluated yet: their Dels are delayed until the evaluation.
+        open_uses = defaultdict(int)
+        delayed = {}
+        body = list(block.body)
+        block.clear()
+        for stmt in body:
+            if stmt in moved:
+                for var in stmt.value.list_vars():
+                    open_uses[var.name] += 1
+            elif stmt in fused:
+                new_assign, assigns = fused[stmt]
+                block.append(new_assign)
+                for assign in assigns:
+                    for var in assign.value.list_vars():
+                        open_uses[var.name] -= 1
+                        if not open_uses[var.name] and var.name in delayed:
+                            block.append(delayed.pop(var.name))
+            elif isinstance(stmt, ir.Del) and stmt.value in moved_names:
+                continue
+            elif isinstance(stmt, ir.Del) and open_uses[stmt.value]:
+                delayed[stmt.value] = stmt
+            else:
+                block.append(stmt)
+
+
+# Reductions of array expressions evaluated without materializing them
+_array_reduce_functions = {
+    np.sum: 'sum',
+    np.prod: 'prod',
+    np.min: 'min',
+    np.amin: 'min',
+    np.max: 'max',
+    np.amax: 'max',
+    np.mean: 'mean',
+    np.dot: 'dot',
+}
+
+_array_reduce_methods = frozenset(['sum', 'prod', 'min', 'max', 'mean'])
+
 
 _unaryops = {
     operator.pos: ast.UAdd,
@@ -351,12 +641,71 @@ def _fix_invalid_lineno_ranges(astree: ast.AST):
     ast.fix_missing_locations(astree)
 
 
+def find_reusable_array_exprs(func_ir, typemap):
+    """Find the array expressions in loops whose result can be written into
+    the buffer of the result of their previous execution, return their
+    assignment statements.
+
+    This holds when the previous result is dead when the expression is
+    executed again, i.e. no alias of the result is live at that point,
+    except for plain copies of it used as operands of the expression and
+    dying there (as in ``y = a * y + b``): the expression reads and writes
+    them at the same index.  As the buffer may still be referenced after
+    the function returns, the result may be returned but must not escape
+    otherwise.
+    """
+    from numba.np.stack_arrays import _AliasSet, _live_around
+
+    if func_ir.func_id.is_generator:
+        return []
+    cfg = analysis.compute_cfg_from_blocks(func_ir.blocks)
+    in_loops = set()
+    for loop in cfg.loops().values():
+        in_loops |= loop.body
+    candidates = []
+    for label in sorted(in_loops):
+        for stmt in func_ir.blocks[label].find_insts(ir.Assign):
+            expr = stmt.value
+            if (isinstance(expr, ir.Expr) and expr.op == 'arrayexpr'
+                    and expr._kws.get('out') is None
+                    and type(typemap[stmt.target.name]) is types.Array):
+                candidates.append((label, stmt))
+    if not candidates:
+        return []
+
+    assigned = defaultdict(int)
+    for block in func_ir.blocks.values():
+        for stmt in block.find_insts(ir.Assign):
+            assigned[stmt.target.name] += 1
+    usedefs = analysis.compute_use_defs(func_ir.blocks)
+    live_map = analysis.compute_live_map(cfg, func_ir.blocks,
+                                         usedefs.usemap, usedefs.defmap)
+    reusable = []
+    for label, stmt in candidates:
+        name = stmt.target.name
+        if assigned[name] != 1:
+            continue
+        aliases = _AliasSet(func_ir, typemap, name, allow_return=True)
+        if aliases.run():
+            continue
+        before, after = _live_around(func_ir, cfg, live_map, label, stmt)
+        operands = {var.name for var in stmt.value.list_vars()}
+        live_aliases = before & aliases.names
+        if not live_aliases <= (operands & aliases.copies) - after:
+            continue
+        if not (operands & aliases.names) <= aliases.copies:
+            continue
+        reusable.append(stmt)
+    return reusable
+
+
 def _lower_array_expr(lowerer, expr):
     '''Lower an array expression built by RewriteArrayExprs.
     '''
     expr_name = "__numba_array_expr_%s" % (hex(hash(expr)).replace("-", "_"))
     expr_filename = expr.loc.filename
-    expr_var_list = expr.list_vars()
+    # The variables of the expression tree, leaving out its destination
+    expr_var_list = expr._rec_list_vars(expr.expr)
     # The expression may use a given variable several times, but we
     # should only create one parameter for it.
     expr_var_unique = sorted(set(expr_var_list), key=lambda var: var.name)
@@ -403,6 +752,9 @@ def _lower_array_expr(lowerer, expr):
     # Follow the Numpy error model.  Note this also allows e.g. vectorizing
     # division (issue #1223).
     flags.error_model = 'numpy'
+    # The synthesized kernel has no source lines of its own, the line
+    # profiler attributes its time to the line of the expression.
+    flags.line_profile = False
     cres = context.compile_subroutine(builder, impl, inner_sig, flags=flags,
                                       caching=False)
 
@@ -424,5 +776,278 @@ def _lower_array_expr(lowerer, expr):
     ufunc.nargs = ufunc.nin + ufunc.nout
 
     args = [lowerer.loadvar(name) for name in expr_args]
+    if expr._kws.get('reduce') is not None:
+        return _lower_array_expr_reduce(lowerer, expr, outer_sig, args,
+                                        expr_args, ExprKernel)
+    if expr._kws.get('out') is not None:
+        return _lower_array_expr_into(lowerer, expr, outer_sig, args, ufunc,
+                                      ExprKernel)
+    reuse_slot = lowerer.array_reuse_slot(expr)
     return npyimpl.numpy_ufunc_kernel(
-        context, builder, outer_sig, args, ufunc, ExprKernel)
+        context, builder, outer_sig, args, ufunc, ExprKernel,
+        reuse_slot=reuse_slot)
+
+
+def _lower_array_expr_into(lowerer, expr, outer_sig, args, ufunc,
+                           kernel_class):
+    '''Lower an array expression evaluated into its explicit output
+    ``expr.out``, or the view ``expr.out[expr.out_index]`` of it.
+
+    The result is written directly into the destination if all the array
+    operands broadcast to its shape and either don't overlap it in memory
+    or are the destination itself.  Otherwise the result is computed into
+    a temporary array and copied (raising the usual error if the shapes
+    don't match).
+    '''
+    from numba.np import npyimpl, arrayobj
+
+    context = lowerer.context
+    builder = lowerer.builder
+    tyctx = context.typing_context
+    out = lowerer.loadvar(expr.out.name)
+    outty = lowerer.typeof(expr.out.name)
+    index_var = expr._kws.get('out_index')
+    if index_var is not None:
+        index = lowerer.loadvar(index_var.name)
+        indexty = lowerer.typeof(index_var.name)
+        fnop = tyctx.resolve_value_type(operator.getitem)
+        getitem_sig = fnop.get_call_type(tyctx, (outty, indexty), {})
+        getitem = context.get_function(fnop, getitem_sig)
+        dest = getitem(builder, (out, index))
+        destty = getitem_sig.return_type
+    else:
+        index = context.get_dummy_value()
+        indexty = types.ellipsis
+        dest, destty = out, outty
+
+    destary = context.make_array(destty)(context, builder, dest)
+    dest_shapes = cgutils.unpack_tuple(builder, destary.shape)
+    dest_strides = cgutils.unpack_tuple(builder, destary.strides)
+    dest_start, dest_end = arrayobj.get_array_memory_extents(
+        context, builder, destty, destary, dest_shapes, dest_strides,
+        destary.data)
+    intp_t = context.get_value_type(types.intp)
+    direct = cgutils.true_bit
+    for val, ty in zip(args, outer_sig.args):
+        if isinstance(ty, types.Optional):
+            direct = cgutils.false_bit
+            break
+        if not isinstance(ty, types.Array):
+            continue
+        if ty.ndim > destty.ndim:
+            direct = cgutils.false_bit
+            break
+        ary = context.make_array(ty)(context, builder, val)
+        shapes = cgutils.unpack_tuple(builder, ary.shape)
+        strides = cgutils.unpack_tuple(builder, ary.strides)
+        offset = destty.ndim - ty.ndim
+        same = builder.icmp_unsigned('==',
+                                     builder.ptrtoint(ary.data, intp_t),
+                                     builder.ptrtoint(destary.data, intp_t))
+        if ty.ndim != destty.ndim:
+            same = cgutils.false_bit
+        for i, (dim, stride) in enumerate(zip(shapes, strides)):
+            dest_dim = dest_shapes[offset + i]
+            broadcasts = builder.or_(
+                builder.icmp_signed('==', dim, dim.type(1)),
+                builder.icmp_signed('==', dim, dest_dim))
+            direct = builder.and_(direct, broadcasts)
+            same = builder.and_(same, builder.and_(
+                builder.icmp_signed('==', dim, dest_dim),
+                builder.icmp_signed('==', stride, dest_strides[offset + i])))
+        start, end = arrayobj.get_array_memory_extents(
+            context, builder, ty, ary, shapes, strides, ary.data)
+        overlaps = arrayobj.extents_may_overlap(context, builder, start, end,
+                                                dest_start, dest_end)
+        direct = builder.and_(direct,
+                              builder.or_(builder.not_(overlaps), same))
+
+    with builder.if_else(direct, likely=True) as (then, otherwise):
+        with then:
+            sig = destty(*outer_sig.args, destty)
+            res = npyimpl.numpy_ufunc_kernel(context, builder, sig,
+                                             list(args) + [dest], ufunc,
+                                             kernel_class)
+            context.nrt.decref(builder, destty, res)
+        with otherwise:
+            rettype = outer_sig.return_type
+            tmpty = types.Array(rettype.dtype, rettype.ndim, 'C')
+            tmp = npyimpl.numpy_ufunc_kernel(context, builder,
+                                             tmpty(*outer_sig.args), args,
+                                             ufunc, kernel_class)
+            # Store as ``out[index] = tmp`` (or ``out[...] = tmp``)
+            fnop = tyctx.resolve_value_type(operator.setitem)
+            setitem_sig = fnop.get_call_type(tyctx, (outty, indexty, tmpty),
+                                             {})
+            setitem = context.get_function(fnop, setitem_sig)
+            index = context.cast(builder, index, indexty,
+                                 setitem_sig.args[1])
+            setitem(builder, (out, index, tmp))
+            context.nrt.decref(builder, tmpty, tmp)
+
+    if index_var is not None:
+        context.nrt.decref(builder, destty, dest)
+        return context.get_dummy_value()
+    return impl_ret_borrowed(context, builder, outty, out)
+
+
+def _sum_step(acc, val):
+    return acc + val
+
+
+def _prod_step(acc, val):
+    return acc * val
+
+
+def _min_step(acc, val):
+    # NaNs propagate
+    if val < acc or val != val:
+        return val
+    return acc
+
+
+def _max_step(acc, val):
+    if val > acc or val != val:
+        return val
+    return acc
+
+
+def _mean_result(acc, count):
+    return acc / count
+
+
+def _reduction_init(reduction, ty):
+    """Return the initial value of the accumulator of type *ty* of a
+    reduction.
+    """
+    if reduction in ('sum', 'mean', 'dot'):
+        return 0
+    elif reduction == 'prod':
+        return 1
+    elif isinstance(ty, types.Float):
+        return np.inf if reduction == 'min' else -np.inf
+    elif isinstance(ty, types.Integer):
+        return ty.maxval if reduction == 'min' else ty.minval
+    else:
+        return reduction == 'min'
+
+
+_reduction_steps = {
+    'sum': _sum_step,
+    'mean': _sum_step,
+    'dot': _sum_step,
+    'prod': _prod_step,
+    'min': _min_step,
+    'max': _max_step,
+}
+
+
+def _lower_array_expr_reduce(lowerer, expr, outer_sig, args, expr_args,
+                             kernel_class):
+    '''Lower the reduction ``expr.reduce`` of an array expression in a
+    single loop, without materializing the expression.
+    '''
+    from numba.np import npyimpl
+
+    context = lowerer.context
+    builder = lowerer.builder
+    reduction = expr.reduce
+    resty = expr.reduce_ty
+    arrty = outer_sig.return_type
+    intp_t = context.get_value_type(types.intp)
+
+    inputs = [npyimpl._prepare_argument(context, builder, arg, ty)
+              for arg, ty in zip(args, outer_sig.args)]
+    if reduction == 'dot':
+        # Both vectors must have the same length
+        lengths = []
+        for tree in expr.expr[1]:
+            names = {var.name for var in expr._rec_list_vars(tree)}
+            operands = [inp for inp, name in zip(inputs, expr_args)
+                        if name in names]
+            lengths.extend(npyimpl._broadcast_shape(context, builder, 1,
+                                                    operands))
+        with cgutils.if_unlikely(builder,
+                                 builder.icmp_signed('!=', *lengths)):
+            context.call_conv.return_user_exc(
+                builder, ValueError,
+                ("incompatible array sizes for np.dot(a, b) "
+                 "(vector * vector)",))
+        shape = lengths[:1]
+    else:
+        shape = npyimpl._broadcast_shape(context, builder, arrty.ndim,
+                                         inputs)
+    count = intp_t(1)
+    for dim in shape:
+        count = builder.mul(count, dim)
+    if reduction in ('min', 'max'):
+        with cgutils.if_unlikely(builder,
+                                 builder.icmp_signed('==', count,
+                                                     count.type(0))):
+            name = 'minimum' if reduction == 'min' else 'maximum'
+            context.call_conv.return_user_exc(
+                builder, ValueError,
+                ("zero-size array to reduction operation %s which has no "
+                 "identity" % (name,),))
+
+    kernel = kernel_class(context, builder,
+                          arrty.dtype(*[inp.base_type for inp in inputs]))
+    init = context.get_constant_generic(builder, resty,
+                                        _reduction_init(reduction, resty))
+    acc = cgutils.alloca_once_value(builder, init)
+    step_sig = resty(resty, arrty.dtype)
+
+    def accumulate(vals_in):
+        val = kernel.generate(*vals_in)
+        res = context.compile_internal(builder, _reduction_steps[reduction],
+                                       step_sig, (builder.load(acc), val))
+        builder.store(res, acc)
+
+    def general_loop():
+        indices = [inp.create_iter_indices() for inp in inputs]
+        # Only choose F iteration order if more arrays are in F layout.
+        layouts = [inp.layout for inp in arrays]
+        num_c_layout = len([x for x in layouts if x == 'C'])
+        num_f_layout = len([x for x in layouts if x == 'F'])
+        order = 'F' if num_f_layout > num_c_layout else 'C'
+        with cgutils.loop_nest(builder, shape, intp=intp_t,
+                               order=order) as loop_indices:
+            vals_in = []
+            for i, (index, arg) in enumerate(zip(indices, inputs)):
+                index.update_indices(loop_indices, i)
+                vals_in.append(arg.load_data(index.as_values()))
+            accumulate(vals_in)
+
+    arrays = [inp for inp in inputs if isinstance(inp, npyimpl._ArrayHelper)]
+    if all(inp.layout == 'C' and inp.ndim == len(shape) for inp in arrays):
+        # When no operand is broadcast, iterate over the items of the
+        # contiguous operands in a flat loop, which can be vectorized
+        same_shapes = cgutils.true_bit
+        for inp in arrays:
+            for dim, size in zip(inp.shape, shape):
+                same_shapes = builder.and_(same_shapes,
+                                           builder.icmp_signed('==', dim,
+                                                               size))
+        with builder.if_else(same_shapes, likely=True) as (flat, general):
+            with flat:
+                with cgutils.for_range(builder, count, intp=intp_t) as loop:
+                    vals_in = []
+                    for inp in inputs:
+                        if inp in arrays:
+                            model = context.data_model_manager[inp.base_type]
+                            ptr = cgutils.gep(builder, inp.data, loop.index)
+                            vals_in.append(
+                                model.load_from_data_pointer(builder, ptr))
+                        else:
+                            vals_in.append(inp.load_data(None))
+                    accumulate(vals_in)
+            with general:
+                general_loop()
+    else:
+        general_loop()
+
+    res = builder.load(acc)
+    if reduction == 'mean':
+        res = context.compile_internal(builder, _mean_result,
+                                       resty(resty, types.intp), (res, count))
+    return res
@@ -11,6 +11,8 @@ ufunc
 import numpy as np
 import sys
 
+from numba.core import types, typing
+
 # this is lazily initialized to avoid circular imports
 IS_WIN32 = sys.platform.startswith('win32')
 numpy_version = tuple(map(int, np.__version__.split('.')[:2]))
@@ -45,6 +47,40 @@ def get_ufunc_info(ufunc_key):
     return _ufunc_db[ufunc_key]
 
 
+def _float16_loop_impl(impl):
+    """Make the implementation of a float16 loop out of the implementation
+    *impl* of the same float32 loop.  Like NumPy, the float16 operands are
+    computed in float32 and the float16 results are rounded from it.
+    """
+    def widen(ty):
+        return types.float32 if ty == types.float16 else ty
+
+    def float16_impl(context, builder, sig, args):
+        argtys = [widen(ty) for ty in sig.args]
+        args = [context.cast(builder, val, fromty, toty)
+                for val, fromty, toty in zip(args, sig.args, argtys)]
+        if isinstance(sig.return_type, types.BaseTuple):
+            restype = types.Tuple([widen(ty) for ty in sig.return_type])
+        else:
+            restype = widen(sig.return_type)
+        res = impl(context, builder, typing.signature(restype, *argtys), args)
+        return context.cast(builder, res, restype, sig.return_type)
+
+    return float16_impl
+
+
+def add_float16_loops(ufunc_db):
+    """Add to *ufunc_db* the float16 loops of its ufuncs, where NumPy has
+    them and *ufunc_db* has the float32 ones.
+    """
+    for ufunc, loops in ufunc_db.items():
+        for loop, impl in list(loops.items()):
+            float16_loop = loop.replace('f', 'e')
+            if (float16_loop != loop and float16_loop in ufunc.types
+                    and float16_loop not in loops):
+                loops[float16_loop] = _float16_loop_impl(impl)
+
+
 def _fill_ufunc_db(ufunc_db):
     # some of these imports would cause a problem of circular
     # imports if done at global scope when importing the numba
@@ -1011,11 +1047,13 @@ def _fill_ufunc_db(ufunc_db):
     }
 
     ufunc_db[np.nextafter] = {
+        'ee->e': npyfuncs.np_real_nextafter_impl,
         'ff->f': npyfuncs.np_real_nextafter_impl,
         'dd->d': npyfuncs.np_real_nextafter_impl,
     }
 
     ufunc_db[np.spacing] = {
+        'e->e': npyfuncs.np_real_spacing_impl,
         'f->f': npyfuncs.np_real_spacing_impl,
         'd->d': npyfuncs.np_real_spacing_impl,
     }
@@ -1209,3 +1247,5 @@ def _fill_ufunc_db(ufunc_db):
     ufunc_db[np.remainder].update({
         'mm->m': npdatetime.timedelta_mod_timedelta,
     })
+
+    add_float16_loops(ufunc_db)
@@ -53,6 +53,12 @@ class ParforLower(lowering.Lower):
         else:
             super().lower_inst(inst)
 
+    def lower_noalias_check(self):
+        # The gufuncs of parfor bodies are declared noalias following the
+        # alias analysis of the enclosing function, not by the user
+        if not parfor.sequential_parfor_lowering:
+            super().lower_noalias_check()
+
     @property
     def _disable_sroa_like_opt(self):
         """
@@ -1590,6 +1596,10 @@ def _create_gufunc_for_parfor_body(
         if config.DEBUG_ARRAY_OPT:
             print("No aliases found so adding noalias flag.")
         flags.noalias = True
+    else:
+        # The arguments of the enclosing function may be declared noalias,
+        # this does not carry to the arrays passed to the gufunc
+        flags.noalias = False
 
     fixup_var_define_in_scope(gufunc_ir.blocks)
 
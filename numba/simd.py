@@ -0,0 +1,824 @@
+"""
+Explicit SIMD vectors for the CPU target.
+
+The vector types of this module, e.g. ``float32x8`` or ``int64x4``, hold a
+fixed number of values of a scalar type (the lanes of the vector) and map
+to the LLVM vector types, which are compiled to the SIMD registers and
+instructions of the CPU.  They can only be used in compiled code:
+
+    from numba import njit, simd
+
+    @njit
+    def axpy(a, x, y):
+        for i in range(0, x.size - 7, 8):
+            v = simd.load(simd.float32x8, x, i)
+            w = simd.load(simd.float32x8, y, i)
+            simd.store(y, i, a * v + w)
+        ...
+
+Calling a vector type builds a vector from a scalar, which is broadcast to
+all the lanes, from one scalar per lane or from another vector with the
+same number of lanes, whose values are converted.  The vectors support the
+arithmetic, bitwise and comparison operators lane by lane, with scalars
+being broadcast, indexing and ``len()``.  The comparisons give vectors of
+booleans, the masks of ``select()``, ``masked_load()`` and
+``masked_store()``.
+"""
+
+import operator
+
+import numpy as np
+from llvmlite import ir
+
+from numba.core import cgutils, types
+from numba.core.datamodel import models
+from numba.core.errors import TypingError
+from numba.core.extending import intrinsic, overload, register_model
+from numba.core.imputils import (impl_ret_untracked, lower_builtin,
+                                 numba_typeref_ctor)
+from numba.core.typing.templates import (AbstractTemplate, AttributeTemplate,
+                                         infer_getattr, infer_global,
+                                         signature)
+from numba.np.numpy_support import from_dtype
+
+
+# The scalar types and the numbers of lanes of the vectors
+_SCALAR_TYPES = (types.boolean, types.int8, types.int16, types.int32,
+                 types.int64, types.uint8, types.uint16, types.uint32,
+                 types.uint64, types.float32, types.float64)
+_COUNTS = (2, 4, 8, 16, 32, 64)
+
+
+def vector_type(dtype, count):
+    """
+    Return the SIMD vector type of *count* values of the scalar type
+    *dtype*, which may be a Numba type or anything NumPy understands as a
+    dtype.  *count* must be a power of two between 2 and 64.
+    """
+    if not isinstance(dtype, types.Type):
+        dtype = from_dtype(np.dtype(dtype))
+    if dtype not in _SCALAR_TYPES:
+        raise TypeError("unsupported SIMD vector dtype: %s" % (dtype,))
+    if count not in _COUNTS:
+        raise ValueError("unsupported number of SIMD vector lanes: %s"
+                         % (count,))
+    return types.SIMDVector(dtype, count)
+
+
+__all__ = ['vector_type', 'load', 'store', 'masked_load', 'masked_store',
+           'gather', 'shuffle', 'select', 'reduce_add', 'reduce_mul',
+           'reduce_min', 'reduce_max', 'reduce_and', 'reduce_or']
+
+for _dtype in _SCALAR_TYPES:
+    for _count in _COUNTS:
+        _vecty = vector_type(_dtype, _count)
+        globals()[str(_vecty)] = _vecty
+        __all__.append(str(_vecty))
+
+del _dtype, _count, _vecty
+
+
+@register_model(types.SIMDVector)
+class SIMDVectorModel(models.PrimitiveModel):
+    def __init__(self, dmm, fe_type):
+        elemty = dmm.lookup(fe_type.dtype).get_value_type()
+        be_type = ir.VectorType(elemty, fe_type.count)
+        super(SIMDVectorModel, self).__init__(dmm, fe_type, be_type)
+
+
+def _mask_type(vecty):
+    return types.SIMDVector(types.boolean, vecty.count)
+
+
+def _is_scalar(ty):
+    return isinstance(ty, (types.Boolean, types.Integer, types.Float))
+
+
+def _can_broadcast(ty, vecty):
+    # Whether the scalar type *ty* can be broadcast to the lanes of *vecty*
+    # without losing the fractional part of floats
+    if isinstance(ty, types.Float):
+        return isinstance(vecty.dtype, types.Float)
+    return _is_scalar(ty)
+
+
+def _mangle(llty):
+    """
+    Return the suffix naming the LLVM type *llty* in the names of the
+    overloaded LLVM intrinsics.
+    """
+    if isinstance(llty, ir.VectorType):
+        return "v%d%s" % (llty.count, _mangle(llty.element))
+    if isinstance(llty, ir.PointerType):
+        if llty.is_opaque:
+            return "p%d" % llty.addrspace
+        return "p%d%s" % (llty.addrspace, _mangle(llty.pointee))
+    if isinstance(llty, ir.IntType):
+        return "i%d" % llty.width
+    if isinstance(llty, ir.FloatType):
+        return "f32"
+    if isinstance(llty, ir.DoubleType):
+        return "f64"
+    raise NotImplementedError(llty)
+
+
+def _call_intrinsic(builder, name, restype, args, fastmath=()):
+    """
+    Call the overloaded LLVM intrinsic *name*, mangled for the type of its
+    result and arguments.
+    """
+    argtys = [arg.type for arg in args]
+    fnty = ir.FunctionType(restype, argtys)
+    fn = cgutils.get_or_insert_function(builder.module, fnty, name)
+    return builder.call(fn, args, fastmath=fastmath)
+
+
+def _splat(builder, llvecty, value):
+    """
+    Broadcast the scalar *value* to all the lanes of a vector of type
+    *llvecty*.
+    """
+    undef = ir.Constant(llvecty, ir.Undefined)
+    vec = builder.insert_element(undef, value, ir.IntType(32)(0))
+    mask = ir.Constant(ir.VectorType(ir.IntType(32), llvecty.count),
+                       [0] * llvecty.count)
+    return builder.shuffle_vector(vec, undef, mask)
+
+
+def _as_vector(context, builder, ty, val, vecty):
+    """
+    Return the value *val* of type *ty*, which is either *vecty* or a
+    scalar type, as a vector of type *vecty*.
+    """
+    if ty == vecty:
+        return val
+    val = context.cast(builder, val, ty, vecty.dtype)
+    return _splat(builder, context.get_value_type(vecty), val)
+
+
+def _convert_vector(context, builder, val, fromty, toty):
+    """
+    Convert the lanes of the vector *val* of type *fromty* to the dtype of
+    the vector type *toty*, with the same number of lanes.
+    """
+    src, dst = fromty.dtype, toty.dtype
+    llty = context.get_value_type(toty)
+    if src == dst:
+        return val
+    if isinstance(dst, types.Boolean):
+        zero = ir.Constant(val.type, None)
+        if isinstance(src, types.Float):
+            return builder.fcmp_unordered('!=', val, zero)
+        return builder.icmp_unsigned('!=', val, zero)
+    if isinstance(src, types.Boolean):
+        if isinstance(dst, types.Float):
+            return builder.uitofp(val, llty)
+        return builder.zext(val, llty)
+    if isinstance(src, types.Float):
+        if isinstance(dst, types.Float):
+            if dst.bitwidth > src.bitwidth:
+                return builder.fpext(val, llty)
+            return builder.fptrunc(val, llty)
+        if dst.signed:
+            return builder.fptosi(val, llty)
+        return builder.fptoui(val, llty)
+    if isinstance(dst, types.Float):
+        if src.signed:
+            return builder.sitofp(val, llty)
+        return builder.uitofp(val, llty)
+    if dst.bitwidth < src.bitwidth:
+        return builder.trunc(val, llty)
+    if dst.bitwidth > src.bitwidth:
+        if src.signed:
+            return builder.sext(val, llty)
+        return builder.zext(val, llty)
+    return val
+
+
+# -----------------------------------------------------------------------------
+# Constructors
+
+@infer_getattr
+class SIMDVectorAttribute(AttributeTemplate):
+    key = types.SIMDVector
+
+    def resolve___call__(self, vecty):
+        """
+        Resolve the call of a vector type, e.g. ``float32x8(0.0)``.
+        """
+        class SIMDVectorConstructor(AbstractTemplate):
+            key = vecty
+
+            def generic(self, args, kws):
+                if kws:
+                    return
+                if len(args) == 1:
+                    arg, = args
+                    if isinstance(arg, types.SIMDVector):
+                        if arg.count == vecty.count:
+                            return signature(vecty, *args)
+                    elif _is_scalar(arg):
+                        return signature(vecty, *args)
+                elif len(args) == vecty.count:
+                    for arg in args:
+                        if not _is_scalar(arg):
+                            return
+                    return signature(vecty, *args)
+
+        return types.Function(SIMDVectorConstructor)
+
+
+@intrinsic
+def _build_vector(typingctx, cls, args):
+    vecty = cls.instance_type
+    sig = vecty(cls, args)
+
+    def codegen(context, builder, sig, llargs):
+        _, tup = llargs
+        values = cgutils.unpack_tuple(builder, tup, len(args))
+        if len(args) == 1:
+            argty, = args
+            if isinstance(argty, types.SIMDVector):
+                return _convert_vector(context, builder, values[0], argty,
+                                       vecty)
+            return _as_vector(context, builder, argty, values[0], vecty)
+        vec = ir.Constant(context.get_value_type(vecty), ir.Undefined)
+        for i, (argty, value) in enumerate(zip(args, values)):
+            value = context.cast(builder, value, argty, vecty.dtype)
+            vec = builder.insert_element(vec, value, ir.IntType(32)(i))
+        return vec
+
+    return sig, codegen
+
+
+@overload(numba_typeref_ctor)
+def ol_vector_ctor(cls, *args):
+    # Lowering of the calls of the vector types, see redirect_type_ctor()
+    if not isinstance(cls.instance_type, types.SIMDVector):
+        return
+
+    def impl(cls, *args):
+        return _build_vector(cls, args)
+
+    return impl
+
+
+# -----------------------------------------------------------------------------
+# Operators
+
+# operator -> (inplace operator, supported dtype classes, result is a mask)
+_BINOPS = {
+    operator.add: (operator.iadd, (types.Integer, types.Float), False),
+    operator.sub: (operator.isub, (types.Integer, types.Float), False),
+    operator.mul: (operator.imul, (types.Integer, types.Float), False),
+    operator.truediv: (operator.itruediv, (types.Float,), False),
+    operator.and_: (operator.iand, (types.Integer, types.Boolean), False),
+    operator.or_: (operator.ior, (types.Integer, types.Boolean), False),
+    operator.xor: (operator.ixor, (types.Integer, types.Boolean), False),
+    operator.lshift: (operator.ilshift, (types.Integer,), False),
+    operator.rshift: (operator.irshift, (types.Integer,), False),
+    operator.eq: (None, (types.Integer, types.Float, types.Boolean), True),
+    operator.ne: (None, (types.Integer, types.Float, types.Boolean), True),
+    operator.lt: (None, (types.Integer, types.Float), True),
+    operator.le: (None, (types.Integer, types.Float), True),
+    operator.gt: (None, (types.Integer, types.Float), True),
+    operator.ge: (None, (types.Integer, types.Float), True),
+}
+
+_CMPOPS = {operator.eq: '==', operator.ne: '!=', operator.lt: '<',
+           operator.le: '<=', operator.gt: '>', operator.ge: '>='}
+
+
+def _binop_vector_type(lhs, rhs):
+    """
+    Return the vector type of the operation between *lhs* and *rhs*, a
+    vector and a vector of the same type or a scalar, or None.
+    """
+    if isinstance(lhs, types.SIMDVector):
+        vecty, other = lhs, rhs
+    elif isinstance(rhs, types.SIMDVector):
+        vecty, other = rhs, lhs
+    else:
+        return None
+    if other == vecty or _can_broadcast(other, vecty):
+        return vecty
+    return None
+
+
+def _make_binop_template(op, dtype_classes, is_mask):
+    class SIMDVectorBinOp(AbstractTemplate):
+        def generic(self, args, kws):
+            if len(args) != 2 or kws:
+                return
+            vecty = _binop_vector_type(*args)
+            if vecty is None or not isinstance(vecty.dtype, dtype_classes):
+                return
+            restype = _mask_type(vecty) if is_mask else vecty
+            # The scalar operand is converted to the dtype of the vector
+            argtys = [ty if isinstance(ty, types.SIMDVector) else vecty.dtype
+                      for ty in args]
+            return signature(restype, *argtys)
+
+    return SIMDVectorBinOp
+
+
+def _lower_binop(op):
+    def imp(context, builder, sig, args):
+        vecty = [ty for ty in sig.args if isinstance(ty, types.SIMDVector)][0]
+        lhs, rhs = [_as_vector(context, builder, ty, val, vecty)
+                    for ty, val in zip(sig.args, args)]
+        dtype = vecty.dtype
+        if op in _CMPOPS:
+            cmpop = _CMPOPS[op]
+            if isinstance(dtype, types.Float):
+                if op is operator.ne:
+                    res = builder.fcmp_unordered(cmpop, lhs, rhs)
+                else:
+                    res = builder.fcmp_ordered(cmpop, lhs, rhs)
+            elif isinstance(dtype, types.Integer) and dtype.signed:
+                res = builder.icmp_signed(cmpop, lhs, rhs)
+            else:
+                res = builder.icmp_unsigned(cmpop, lhs, rhs)
+        elif isinstance(dtype, types.Float):
+            res = {operator.add: builder.fadd,
+                   operator.sub: builder.fsub,
+                   operator.mul: builder.fmul,
+                   operator.truediv: builder.fdiv}[op](lhs, rhs)
+        elif op is operator.rshift:
+            if dtype.signed:
+                res = builder.ashr(lhs, rhs)
+            else:
+                res = builder.lshr(lhs, rhs)
+        else:
+            res = {operator.add: builder.add,
+                   operator.sub: builder.sub,
+                   operator.mul: builder.mul,
+                   operator.and_: builder.and_,
+                   operator.or_: builder.or_,
+                   operator.xor: builder.xor,
+                   operator.lshift: builder.shl}[op](lhs, rhs)
+        return impl_ret_untracked(context, builder, sig.return_type, res)
+
+    return imp
+
+
+for _op, (_iop, _dtype_classes, _is_mask) in _BINOPS.items():
+    _template = _make_binop_template(_op, _dtype_classes, _is_mask)
+    infer_global(_op)(type("SIMDVector_%s" % _op.__name__, (_template,),
+                           dict(key=_op)))
+    if _iop is not None:
+        # The vectors are immutable, the inplace operators are lowered as
+        # the copying ones
+        infer_global(_iop)(type("SIMDVector_%s" % _iop.__name__,
+                                (_template,), dict(key=_iop)))
+    _imp = _lower_binop(_op)
+    lower_builtin(_op, types.SIMDVector, types.SIMDVector)(_imp)
+    for _scalar in (types.Boolean, types.Integer, types.Float):
+        lower_builtin(_op, types.SIMDVector, _scalar)(_imp)
+        lower_builtin(_op, _scalar, types.SIMDVector)(_imp)
+
+del _op, _iop, _dtype_classes, _is_mask, _template, _imp, _scalar
+
+
+class SIMDVectorUnaryOp(AbstractTemplate):
+    def generic(self, args, kws):
+        if len(args) != 1 or kws:
+            return
+        vecty, = args
+        if not isinstance(vecty, types.SIMDVector):
+            return
+        if self.key is operator.invert:
+            dtype_classes = (types.Integer, types.Boolean)
+        else:
+            dtype_classes = (types.Integer, types.Float)
+        if isinstance(vecty.dtype, dtype_classes):
+            return signature(vecty, vecty)
+
+
+for _op in (operator.neg, operator.pos, operator.invert):
+    infer_global(_op)(type("SIMDVector_%s" % _op.__name__,
+                           (SIMDVectorUnaryOp,), dict(key=_op)))
+
+del _op
+
+
+@lower_builtin(operator.neg, types.SIMDVector)
+def vector_neg_impl(context, builder, sig, args):
+    val, = args
+    if isinstance(sig.args[0].dtype, types.Float):
+        res = builder.fneg(val)
+    else:
+        res = builder.neg(val)
+    return impl_ret_untracked(context, builder, sig.return_type, res)
+
+
+@lower_builtin(operator.pos, types.SIMDVector)
+def vector_pos_impl(context, builder, sig, args):
+    return impl_ret_untracked(context, builder, sig.return_type, args[0])
+
+
+@lower_builtin(operator.invert, types.SIMDVector)
+def vector_invert_impl(context, builder, sig, args):
+    res = builder.not_(args[0])
+    return impl_ret_untracked(context, builder, sig.return_type, res)
+
+
+@infer_global(operator.getitem)
+class SIMDVectorGetItem(AbstractTemplate):
+    def generic(self, args, kws):
+        vecty, idx = args
+        if (isinstance(vecty, types.SIMDVector) and
+                isinstance(idx, types.Integer)):
+            return signature(vecty.dtype, vecty, types.intp)
+
+
+@lower_builtin(operator.getitem, types.SIMDVector, types.intp)
+def vector_getitem_impl(context, builder, sig, args):
+    vec, idx = args
+    count = idx.type(sig.args[0].count)
+    idx = builder.select(builder.icmp_signed('<', idx, idx.type(0)),
+                         builder.add(idx, count), idx)
+    if context.enable_boundscheck:
+        cgutils.do_boundscheck(context, builder, idx, count)
+    res = builder.extract_element(vec, idx)
+    return impl_ret_untracked(context, builder, sig.return_type, res)
+
+
+@infer_global(len)
+class SIMDVectorLen(AbstractTemplate):
+    def generic(self, args, kws):
+        if len(args) == 1 and isinstance(args[0], types.SIMDVector):
+            return signature(types.intp, *args)
+
+
+@lower_builtin(len, types.SIMDVector)
+def vector_len_impl(context, builder, sig, args):
+    res = context.get_constant(types.intp, sig.args[0].count)
+    return impl_ret_untracked(context, builder, sig.return_type, res)
+
+
+# -----------------------------------------------------------------------------
+# Memory accesses
+
+def _check_array(ary, dtype):
+    if not (isinstance(ary, types.Array) and ary.ndim == 1 and
+            ary.layout in 'CF'):
+        raise TypingError("expected a contiguous one-dimensional array, "
+                          "got %s" % (ary,))
+    if ary.dtype != dtype:
+        raise TypingError("array dtype %s does not match the vector dtype "
+                          "%s" % (ary.dtype, dtype))
+
+
+def _check_mask(mask, vecty):
+    if mask != _mask_type(vecty):
+        raise TypingError("expected a mask of type %s, got %s"
+                          % (_mask_type(vecty), mask))
+
+
+def _vector_pointer(context, builder, aryty, ary, idx, vecty, check):
+    """
+    Return a pointer to the vector of type *vecty* starting at index *idx*
+    of the one-dimensional array *ary*.  With bounds checking enabled and
+    *check* true, it is checked that the whole vector is within the array.
+    """
+    ary = context.make_array(aryty)(context, builder, ary)
+    if check and context.enable_boundscheck:
+        size, = cgutils.unpack_tuple(builder, ary.shape, 1)
+        last = builder.add(idx, idx.type(vecty.count - 1))
+        cgutils.do_boundscheck(context, builder, idx, size)
+        cgutils.do_boundscheck(context, builder, last, size)
+    ptr = builder.gep(ary.data, [idx])
+    return builder.bitcast(ptr, _memory_type(context, vecty).as_pointer())
+
+
+def _alignment(context, dtype):
+    # The accesses are only aligned on the items of the array
+    return context.get_abi_alignment(context.get_data_type(dtype))
+
+
+def _memory_type(context, vecty):
+    # The LLVM type of the vectors of type *vecty* in arrays, where the
+    # booleans are stored as bytes
+    return ir.VectorType(context.get_data_type(vecty.dtype), vecty.count)
+
+
+def _from_memory(builder, val, vecty):
+    if isinstance(vecty.dtype, types.Boolean):
+        return builder.icmp_unsigned('!=', val, ir.Constant(val.type, None))
+    return val
+
+
+def _to_memory(context, builder, val, vecty):
+    if isinstance(vecty.dtype, types.Boolean):
+        return builder.zext(val, _memory_type(context, vecty))
+    return val
+
+
+@intrinsic
+def load(typingctx, vectype, ary, index):
+    """
+    Load the vector of type *vectype* from the contiguous one-dimensional
+    array *ary*, starting at *index*.
+    """
+    if not isinstance(vectype, types.TypeRef):
+        return
+    vecty = vectype.instance_type
+    if not isinstance(vecty, types.SIMDVector):
+        return
+    _check_array(ary, vecty.dtype)
+    if not isinstance(index, types.Integer):
+        return
+    sig = vecty(vectype, ary, types.intp)
+
+    def codegen(context, builder, sig, args):
+        _, ary, idx = args
+        ptr = _vector_pointer(context, builder, sig.args[1], ary, idx, vecty,
+                              True)
+        val = builder.load(ptr, align=_alignment(context, vecty.dtype))
+        return _from_memory(builder, val, vecty)
+
+    return sig, codegen
+
+
+@intrinsic
+def store(typingctx, ary, index, vec):
+    """
+    Store the vector *vec* into the contiguous one-dimensional array *ary*,
+    starting at *index*.
+    """
+    if not isinstance(vec, types.SIMDVector):
+        return
+    _check_array(ary, vec.dtype)
+    if not isinstance(index, types.Integer):
+        return
+    sig = types.none(ary, types.intp, vec)
+
+    def codegen(context, builder, sig, args):
+        ary, idx, val = args
+        ptr = _vector_pointer(context, builder, sig.args[0], ary, idx, vec,
+                              True)
+        builder.store(_to_memory(context, builder, val, vec), ptr,
+                      align=_alignment(context, vec.dtype))
+        return context.get_dummy_value()
+
+    return sig, codegen
+
+
+@intrinsic
+def masked_load(typingctx, vectype, ary, index, mask):
+    """
+    Load the lanes of the vector of type *vectype* whose *mask* is true from
+    the contiguous one-dimensional array *ary*, starting at *index*.  The
+    other lanes are zero, their items are not accessed and need not be in
+    the array.
+    """
+    if not isinstance(vectype, types.TypeRef):
+        return
+    vecty = vectype.instance_type
+    if not isinstance(vecty, types.SIMDVector):
+        return
+    _check_array(ary, vecty.dtype)
+    _check_mask(mask, vecty)
+    if not isinstance(index, types.Integer):
+        return
+    sig = vecty(vectype, ary, types.intp, mask)
+
+    def codegen(context, builder, sig, args):
+        _, ary, idx, mask = args
+        ptr = _vector_pointer(context, builder, sig.args[1], ary, idx, vecty,
+                              False)
+        llvecty = _memory_type(context, vecty)
+        name = "llvm.masked.load.%s.%s" % (_mangle(llvecty),
+                                           _mangle(ptr.type))
+        align = ir.IntType(32)(_alignment(context, vecty.dtype))
+        zero = ir.Constant(llvecty, None)
+        val = _call_intrinsic(builder, name, llvecty,
+                              [ptr, align, mask, zero])
+        return _from_memory(builder, val, vecty)
+
+    return sig, codegen
+
+
+@intrinsic
+def masked_store(typingctx, ary, index, vec, mask):
+    """
+    Store the lanes of the vector *vec* whose *mask* is true into the
+    contiguous one-dimensional array *ary*, starting at *index*.  The items
+    of the other lanes are not accessed and need not be in the array.
+    """
+    if not isinstance(vec, types.SIMDVector):
+        return
+    _check_array(ary, vec.dtype)
+    _check_mask(mask, vec)
+    if not isinstance(index, types.Integer):
+        return
+    sig = types.none(ary, types.intp, vec, mask)
+
+    def codegen(context, builder, sig, args):
+        ary, idx, val, mask = args
+        ptr = _vector_pointer(context, builder, sig.args[0], ary, idx, vec,
+                              False)
+        val = _to_memory(context, builder, val, vec)
+        name = "llvm.masked.store.%s.%s" % (_mangle(val.type),
+                                            _mangle(ptr.type))
+        align = ir.IntType(32)(_alignment(context, vec.dtype))
+        _call_intrinsic(builder, name, ir.VoidType(), [val, ptr, align, mask])
+        return context.get_dummy_value()
+
+    return sig, codegen
+
+
+@intrinsic
+def gather(typingctx, ary, indices):
+    """
+    Return the vector of the items of the one-dimensional array *ary* at
+    the integer vector *indices*.
+    """
+    if not (isinstance(indices, types.SIMDVector) and
+            isinstance(indices.dtype, types.Integer)):
+        return
+    if not (isinstance(ary, types.Array) and ary.ndim == 1):
+        raise TypingError("expected a one-dimensional array, got %s"
+                          % (ary,))
+    vecty = vector_type(ary.dtype, indices.count)
+    sig = vecty(ary, indices)
+
+    def codegen(context, builder, sig, args):
+        aryty, _ = sig.args
+        ary, idx = args
+        ary = context.make_array(aryty)(context, builder, ary)
+        intpty = context.get_value_type(types.intp)
+        llidxty = ir.VectorType(intpty, indices.count)
+        idx = _convert_vector(context, builder, idx, indices,
+                              vector_type(types.intp, indices.count))
+        size, = cgutils.unpack_tuple(builder, ary.shape, 1)
+        # Wrap the negative indices around
+        idx = builder.select(
+            builder.icmp_signed('<', idx, ir.Constant(llidxty, None)),
+            builder.add(idx, _splat(builder, llidxty, size)), idx)
+        if context.enable_boundscheck:
+            for i in range(indices.count):
+                cgutils.do_boundscheck(context, builder,
+                                       builder.extract_element(idx, i), size)
+        stride, = cgutils.unpack_tuple(builder, ary.strides, 1)
+        offsets = builder.mul(idx, _splat(builder, llidxty, stride))
+        base = _splat(builder, llidxty,
+                      builder.ptrtoint(ary.data, intpty))
+        llvecty = _memory_type(context, vecty)
+        ptrs = builder.inttoptr(builder.add(base, offsets),
+                                ir.VectorType(ary.data.type, indices.count))
+        name = "llvm.masked.gather.%s.%s" % (_mangle(llvecty),
+                                             _mangle(ptrs.type))
+        align = ir.IntType(32)(_alignment(context, vecty.dtype))
+        mask = ir.Constant(ir.VectorType(ir.IntType(1), indices.count),
+                           [1] * indices.count)
+        zero = ir.Constant(llvecty, None)
+        val = _call_intrinsic(builder, name, llvecty,
+                              [ptrs, align, mask, zero])
+        return _from_memory(builder, val, vecty)
+
+    return sig, codegen
+
+
+# -----------------------------------------------------------------------------
+# Lane operations
+
+@intrinsic
+def shuffle(typingctx, a, b, indices):
+    """
+    Return the vector of the lanes of the concatenation of the vectors *a*
+    and *b* at the tuple of integers *indices*, taken modulo the number of
+    lanes of the concatenation.  The result has as many lanes as there are
+    indices.  When the indices are constants, which is the common case,
+    this compiles to a single shuffle instruction.
+    """
+    if not (isinstance(a, types.SIMDVector) and a == b):
+        return
+    if not (isinstance(indices, types.UniTuple) and
+            isinstance(indices.dtype, types.Integer)):
+        return
+    vecty = vector_type(a.dtype, indices.count)
+    sig = vecty(a, b, indices)
+
+    def codegen(context, builder, sig, args):
+        a, b, indices = args
+        i32 = ir.IntType(32)
+        concat_mask = ir.Constant(ir.VectorType(i32, 2 * a.type.count),
+                                  list(range(2 * a.type.count)))
+        concat = builder.shuffle_vector(a, b, concat_mask)
+        res = ir.Constant(context.get_value_type(vecty), ir.Undefined)
+        for i in range(vecty.count):
+            idx = builder.extract_value(indices, i)
+            idx = builder.and_(idx, idx.type(2 * a.type.count - 1))
+            val = builder.extract_element(concat, builder.trunc(idx, i32))
+            res = builder.insert_element(res, val, i32(i))
+        return res
+
+    return sig, codegen
+
+
+@intrinsic
+def select(typingctx, mask, a, b):
+    """
+    Return the vector taking its lanes from *a* where *mask* is true and
+    from *b* elsewhere.  *a* and *b* are vectors of the same type or
+    scalars, broadcast to all the lanes.
+    """
+    if not (isinstance(mask, types.SIMDVector) and
+            isinstance(mask.dtype, types.Boolean)):
+        return
+    vecty = _binop_vector_type(a, b)
+    if vecty is None:
+        if not (_is_scalar(a) and _is_scalar(b)):
+            return
+        dtype = typingctx.unify_pairs(a, b)
+        if dtype not in _SCALAR_TYPES:
+            return
+        vecty = vector_type(dtype, mask.count)
+    _check_mask(mask, vecty)
+    sig = vecty(mask, a, b)
+
+    def codegen(context, builder, sig, args):
+        mask, a, b = args
+        a, b = [_as_vector(context, builder, ty, val, vecty)
+                for ty, val in zip(sig.args[1:], (a, b))]
+        return builder.select(mask, a, b)
+
+    return sig, codegen
+
+
+def _make_reduction(name, doc, dtype_classes, ints, floats=None):
+    # *ints* and *floats* give the LLVM reduction intrinsics, as
+    # (unsigned, signed) pairs for the integers.  The float reductions of
+    # fadd and fmul take a start value and may be reassociated.
+    def reduction(typingctx, vec):
+        if not (isinstance(vec, types.SIMDVector) and
+                isinstance(vec.dtype, dtype_classes)):
+            return
+        sig = vec.dtype(vec)
+
+        def codegen(context, builder, sig, args):
+            val, = args
+            restype = val.type.element
+            dtype = vec.dtype
+            if isinstance(dtype, types.Float):
+                fn, start = floats
+                name = "llvm.vector.reduce.%s.%s" % (fn, _mangle(val.type))
+                if start is None:
+                    return _call_intrinsic(builder, name, restype, [val])
+                return _call_intrinsic(builder, name, restype,
+                                       [restype(start), val],
+                                       fastmath=('reassoc',))
+            fn = ints[getattr(dtype, 'signed', False)]
+            name = "llvm.vector.reduce.%s.%s" % (fn, _mangle(val.type))
+            return _call_intrinsic(builder, name, restype, [val])
+
+        return sig, codegen
+
+    reduction.__name__ = reduction.__qualname__ = name
+    reduction.__doc__ = doc
+    return intrinsic(reduction)
+
+
+reduce_add = _make_reduction(
+    'reduce_add', """
+    Return the sum of the lanes of the vector *vec*, added in an
+    unspecified order.
+    """,
+    (types.Integer, types.Float), ('add', 'add'), ('fadd', -0.0))
+
+reduce_mul = _make_reduction(
+    'reduce_mul', """
+    Return the product of the lanes of the vector *vec*, multiplied in an
+    unspecified order.
+    """,
+    (types.Integer, types.Float), ('mul', 'mul'), ('fmul', 1.0))
+
+reduce_min = _make_reduction(
+    'reduce_min', """
+    Return the minimum of the lanes of the vector *vec*.  The NaN lanes are
+    ignored, unless all the lanes are NaN.
+    """,
+    (types.Integer, types.Float), ('umin', 'smin'), ('fmin', None))
+
+reduce_max = _make_reduction(
+    'reduce_max', """
+    Return the maximum of the lanes of the vector *vec*.  The NaN lanes are
+    ignored, unless all the lanes are NaN.
+    """,
+    (types.Integer, types.Float), ('umax', 'smax'), ('fmax', None))
+
+reduce_and = _make_reduction(
+    'reduce_and', """
+    Return the bitwise and of the lanes of the vector *vec*, e.g. whether
+    all the lanes of a mask are true.
+    """,
+    (types.Integer, types.Boolean), ('and', 'and'))
+
+reduce_or = _make_reduction(
+    'reduce_or', """
+    Return the bitwise or of the lanes of the vector *vec*, e.g. whether
+    any lane of a mask is true.
+    """,
+    (types.Integer, types.Boolean), ('or', 'or'))
@@ -442,9 +442,6 @@ class TestDUFuncAt(TestCase):
 
         for dtype in dtypes:
 
-            if dtype in ('e',):  # skip float16 as we don't have an impl. for it
-                continue
-
             try:
                 from_dtype(np.dtype(dtype))
             except NumbaNotImplementedError:
@@ -8,8 +8,9 @@ from numba import typeof
 from numba.core import utils, types, typing, ir, compiler, cpu, cgutils
 from numba.core.compiler import Compiler, Flags
 from numba.core.registry import cpu_target
+from numba.core.runtime import rtsys
 from numba.tests.support import (MemoryLeakMixin, TestCase, temp_directory,
-                                 create_temp_module)
+                                 create_temp_module, needs_blas)
 from numba.extending import (
     overload,
     models,
@@ -25,6 +26,11 @@ import textwrap
 import unittest
 
 
+def copy_args(args):
+    return [arg.copy() if isinstance(arg, np.ndarray) else arg
+            for arg in args]
+
+
 class Namespace(dict):
     def __getattr__(s, k):
         return s[k] if k in s else super(Namespace, s).__getattr__(k)
@@ -382,11 +388,17 @@ class TestArrayExpressions(MemoryLeakMixin, TestCase):
 
     def test_explicit_output(self):
         """
-        Check that ufunc calls with explicit outputs are not rewritten.
+        Check that ufunc calls with explicit outputs are rewritten to array
+        expressions evaluated into the outputs.
         """
         ns = self._test_explicit_output_function(explicit_output)
-        self._assert_no_rewrite(ns.control_pipeline.state.func_ir.blocks,
-                                ns.test_pipeline.state.func_ir.blocks)
+        control_block = ns.control_pipeline.state.func_ir.blocks[0].body
+        test_block = ns.test_pipeline.state.func_ir.blocks[0].body
+        self._assert_array_exprs(control_block, 0)
+        exprs = [instr.value for instr in self._get_array_exprs(test_block)]
+        self.assertEqual(len(exprs), 2)
+        for expr in exprs:
+            self.assertEqual(expr.out.name, 'out')
 
 
 class TestRewriteIssues(MemoryLeakMixin, TestCase):
@@ -514,6 +526,248 @@ class TestSemantics(MemoryLeakMixin, unittest.TestCase):
         np.testing.assert_array_equal(expect, got)
 
 
+def time_steps(a, x, b, n):
+    for t in range(n):
+        y = a * x + b
+        x = y * 0.5
+    return x
+
+
+def relax(u, n):
+    for t in range(n):
+        u = 0.5 * u + np.sqrt(u)
+    return u
+
+
+def keep_previous(x, n):
+    prev = x
+    s = 0.0
+    for t in range(n):
+        y = x * t
+        s += y[1] - prev[1]
+        prev = y
+    return s
+
+
+def read_shifted(x, n):
+    for t in range(n):
+        y = x[::-1] + x
+        x = y
+    return x
+
+
+def growing(n):
+    s = 0.0
+    for t in range(n):
+        y = np.arange(t) + 1.0
+        s += y.sum()
+    return s
+
+
+class TestArrayExprReuse(MemoryLeakMixin, TestCase):
+    """Tests the reuse of the buffers of the array expressions in loops.
+    """
+
+    def count_allocations(self, cfunc, *args):
+        init_stats = rtsys.get_allocation_stats()
+        cfunc(*args)
+        return rtsys.get_allocation_stats().alloc - init_stats.alloc
+
+    def check(self, pyfunc, args, allocs):
+        cfunc = njit(pyfunc)
+        self.assertPreciseEqual(cfunc(*args), pyfunc(*args))
+        self.assertEqual(self.count_allocations(cfunc, *args), allocs)
+
+    def test_reuse(self):
+        x = np.arange(10.0)
+        # One allocation for the array argument, and one for each array
+        # expression
+        self.check(time_steps, (2.0, x, 1.0, 10), 3)
+        self.check(relax, (x, 10), 2)
+
+    def test_live_previous_value(self):
+        x = np.arange(4.0)
+        # The result of y - prev is reused, not y
+        n = 6
+        self.check(keep_previous, (x, n), 1 + n)
+        # The previous result is read at other indices than it is written
+        self.check(read_shifted, (x, n), 1 + n)
+
+    def test_shape_change(self):
+        # A new buffer is allocated when the shape of the result changes
+        n = 5
+        self.check(growing, (n,), 2 * n)
+
+
+def assign_slice(x, a, b):
+    x[1:-1] = a[2:] - 2.0 * a[1:-1] + a[:-2]
+    x[0] = x[-1] = 0.0
+    x[:] = x + b
+    return x
+
+
+def assign_rows(x, a):
+    for i in range(x.shape[0]):
+        x[i] = a * i + 1
+    return x
+
+
+def ufunc_out(a, b, out):
+    res = np.add(np.sqrt(a), b * 2.0, out=out)
+    np.negative(res, out)
+    return res
+
+
+def assign_overlap(x):
+    x[1:] = x[:-1] + 1.0
+    return x
+
+
+def assign_cast(x, a):
+    x[:] = a * 1.5
+    return x
+
+
+def assign_mismatch(x, a):
+    x[1:] = a + 1.0
+    return x
+
+
+class TestArrayExprOutput(MemoryLeakMixin, TestCase):
+    """Tests the evaluation of array expressions into slice assignment
+    targets and explicit outputs.
+    """
+
+    def count_allocations(self, cfunc, *args):
+        init_stats = rtsys.get_allocation_stats()
+        cfunc(*args)
+        return rtsys.get_allocation_stats().alloc - init_stats.alloc
+
+    def check(self, pyfunc, args, allocs):
+        cfunc = njit(pyfunc)
+        expected = pyfunc(*copy_args(args))
+        got = cfunc(*copy_args(args))
+        self.assertPreciseEqual(got, expected)
+        # One allocation per array argument
+        nargs = sum(isinstance(arg, np.ndarray) for arg in args)
+        self.assertEqual(self.count_allocations(cfunc, *args), nargs + allocs)
+        return cfunc
+
+    def test_slice_assignment(self):
+        a = np.arange(10.0) ** 2
+        self.check(assign_slice, (np.empty(10), a, 1.0), 0)
+        self.check(assign_rows, (np.zeros((4, 3)), np.arange(3.0)), 0)
+        self.check(assign_cast, (np.zeros(5, np.int32), np.arange(5.0)), 0)
+
+    def test_explicit_output(self):
+        a = np.arange(10.0)
+        out = np.zeros(10)
+        cfunc = self.check(ufunc_out, (a, a + 1, out), 0)
+        self.assertIs(cfunc(a, a, out), out)
+
+    def test_overlap(self):
+        # The operand overlaps the target, the result goes through a
+        # temporary
+        self.check(assign_overlap, (np.arange(6.0),), 1)
+
+    def test_shape_mismatch(self):
+        # Exceptions leak the live arrays
+        self.disable_leak_check()
+        cfunc = njit(assign_mismatch)
+        with self.assertRaises(ValueError) as raises:
+            cfunc(np.zeros(5), np.ones(5))
+        self.assertIn("cannot assign slice", str(raises.exception))
+
+    def test_parallel(self):
+        # Parfors convert the array expressions themselves
+        cfunc = njit(parallel=True)(assign_slice)
+        a = np.arange(10.0) ** 2
+        self.assertPreciseEqual(cfunc(np.empty(10), a, 1.0),
+                                assign_slice(np.empty(10), a, 1.0))
+
+
+def reduce_sum(a, b):
+    return np.sum(a * b + 1)
+
+
+def reduce_methods(x, y):
+    return ((x - y) ** 2).mean(), (x * 2 - y).sum(), (x + 1).prod()
+
+
+def reduce_min_max(a, b):
+    return np.min(a + b), np.amax(np.abs(a) - b)
+
+
+def reduce_dot(a, b):
+    return np.dot(a + 1.0, b * 2.0)
+
+
+class TestArrayExprReductions(MemoryLeakMixin, TestCase):
+    """Tests the fusion of reductions with the array expressions they
+    reduce.
+    """
+
+    def count_allocations(self, cfunc, *args):
+        init_stats = rtsys.get_allocation_stats()
+        cfunc(*args)
+        return rtsys.get_allocation_stats().alloc - init_stats.alloc
+
+    def check(self, pyfunc, *args):
+        cfunc = njit(pyfunc)
+        # The accumulation order differs from NumPy's pairwise summation
+        self.assertPreciseEqual(cfunc(*args), pyfunc(*args), prec='double',
+                                ulps=4)
+        # No allocation besides the unboxing of the array arguments
+        nargs = sum(isinstance(arg, np.ndarray) for arg in args)
+        self.assertEqual(self.count_allocations(cfunc, *args), nargs)
+        return cfunc
+
+    def test_float(self):
+        a = np.linspace(0.1, 1.0, 50)
+        b = np.sin(a) - 2.0
+        for args in ((a, b), (a.reshape((5, 10)), b.reshape((5, 10))),
+                     (a.reshape((5, 10)).T, b.reshape((10, 5))),
+                     (a[::2], b[::2]), (a, 2.5)):
+            self.check(reduce_sum, *args)
+            self.check(reduce_methods, *args)
+            self.check(reduce_min_max, *args)
+
+    def test_integer_and_bool(self):
+        a = np.arange(12, dtype=np.int32).reshape((3, 4))
+        b = np.arange(4, dtype=np.int32)
+        self.check(reduce_sum, a, b)
+        self.check(reduce_min_max, a, b)
+        self.check(reduce_sum, a > 3, b < 2)
+
+    def test_nan(self):
+        a = np.arange(6.0)
+        a[3] = np.nan
+        self.check(reduce_min_max, a, 1.0)
+
+    def test_empty(self):
+        cfunc = njit(reduce_sum)
+        self.assertPreciseEqual(cfunc(np.empty(0), 1.0), 0.0)
+        # Exceptions leak the live arrays
+        self.disable_leak_check()
+        cfunc = njit(reduce_min_max)
+        with self.assertRaises(ValueError) as raises:
+            cfunc(np.empty(0), 1.0)
+        self.assertIn("zero-size array to reduction operation",
+                      str(raises.exception))
+
+    @needs_blas
+    def test_dot(self):
+        a = np.linspace(-1.0, 1.0, 20)
+        self.check(reduce_dot, a, np.cos(a))
+
+    def test_parallel(self):
+        # Parfors fuse the array expressions into the reductions themselves
+        a = np.linspace(-1.0, 1.0, 50)
+        cfunc = njit(parallel=True)(reduce_methods)
+        self.assertPreciseEqual(cfunc(a, 2.0), reduce_methods(a, 2.0),
+                                prec='double', ulps=4)
+
+
 class TestOptionals(MemoryLeakMixin, unittest.TestCase):
     """ Tests the arrival and correct lowering of Optional types at a arrayexpr
     derived ufunc, see #3972"""
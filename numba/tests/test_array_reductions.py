@@ -658,6 +658,31 @@ class TestArrayReductions(MemoryLeakMixin, TestCase):
         self.check_aggregation_magnitude(array_std)
         self.check_aggregation_magnitude(array_std_global)
 
+    def test_pairwise_summation(self):
+        # Floating point sums are computed in the same order as NumPy's
+        # pairwise summation, hence give the same results
+        def check(pyfunc, arr):
+            cfunc = jit(nopython=True)(pyfunc)
+            self.assertPreciseEqual(cfunc(arr), pyfunc(arr))
+
+        for n in (7, 100, 129, 1000, 8193, 20000):
+            arr = np.random.random(n) - 0.3
+            carr = arr + 1j * arr[::-1]
+            for a in (arr, arr[::3], arr.astype(np.float32),
+                      carr, carr[::2]):
+                check(array_sum, a)
+                check(array_nansum, a)
+            for a in (arr, arr[::3], arr.reshape((1, n)),
+                      arr[:n // 2 * 2].reshape((2, -1), order='F')):
+                check(array_sum, a)
+                check(array_mean, a)
+                check(array_var, a)
+                check(array_std, a)
+            arr[::5] = np.nan
+            carr[::7] = np.nan
+            check(array_nansum, arr)
+            check(array_nansum, carr)
+
     def _do_check_nptimedelta(self, pyfunc, arr):
         arrty = typeof(arr)
         cfunc = jit(nopython=True)(pyfunc)
@@ -210,6 +210,93 @@ class TestBoundsCheckError(TestCase):
             boundscheck(a)
 
 
+def stencil(a, out):
+    for i in range(1, len(a) - 1):
+        out[i] = a[i - 1] + a[i] + a[i + 1]
+
+
+def axpy(x, y, n):
+    for i in range(n):
+        y[i] += 2.0 * x[i]
+
+
+def masked_copy(a, b, n):
+    for i in range(n):
+        if i < len(b):
+            b[i] = a[i]
+
+
+def trace_product(a, b):
+    s = 0.
+    for i in range(a.shape[0]):
+        for j in range(a.shape[1]):
+            s += a[i, j] * b[j, i] + b[j, 0]
+    return s
+
+
+class TestHoistedBoundsCheck(TestCase):
+    """
+    Test the bounds checks hoisted out of loops
+    """
+
+    def count_index_checks(self, cfunc):
+        # The number of exceptions raised by the compiled function
+        ir = cfunc.inspect_llvm(cfunc.signatures[0])
+        for defn in ir.split('\ndefine')[1:]:
+            header = defn.splitlines()[0]
+            if cfunc.__name__ in header and 'cpython' not in header:
+                return defn.count('!numba_exception_output')
+        self.fail("function definition not found")
+
+    @TestCase.run_test_in_subprocess(envvars={'NUMBA_BOUNDSCHECK': ''})
+    def test_folded_checks(self):
+        # The ranges are derived from the shapes of the arrays, no check is
+        # left
+        cfunc = njit(boundscheck=True)(stencil)
+        a = np.arange(10.)
+        out = np.zeros(10)
+        expected = np.zeros(10)
+        cfunc(a, out)
+        stencil(a, expected)
+        np.testing.assert_equal(out, expected)
+        # out is not known to have the shape of a
+        self.assertEqual(self.count_index_checks(cfunc), 1)
+
+        cfunc = njit(boundscheck=True)(trace_product)
+        a = np.arange(12.).reshape((3, 4))
+        b = np.arange(12.).reshape((4, 3))
+        self.assertPreciseEqual(cfunc(a, b), trace_product(a, b))
+        with self.assertRaises(IndexError):
+            cfunc(a, a)
+
+    @TestCase.run_test_in_subprocess(envvars={'NUMBA_BOUNDSCHECK': ''})
+    def test_failed_hoisted_checks(self):
+        # The accesses are checked when the hoisted checks fail, the
+        # iterations before the failing access are executed
+        cfunc = njit(boundscheck=True)(axpy)
+        x = np.arange(10.)
+        y = np.ones(5)
+        cfunc(x, y, 5)
+        np.testing.assert_equal(y, 1. + 2. * x[:5])
+        y = np.ones(5)
+        with self.assertRaises(IndexError):
+            cfunc(x, y, 7)
+        np.testing.assert_equal(y, 1. + 2. * x[:5])
+        with self.assertRaises(IndexError):
+            cfunc(x[:3], y, 5)
+        np.testing.assert_equal(y[3:], 1. + 2. * x[3:5])
+
+    @TestCase.run_test_in_subprocess(envvars={'NUMBA_BOUNDSCHECK': ''})
+    def test_conditional_access(self):
+        # An access that is not executed does not raise, even though the
+        # range of the loop exceeds the shape of the array
+        cfunc = njit(boundscheck=True)(masked_copy)
+        a = np.arange(10.)
+        b = np.zeros(5)
+        cfunc(a, b, 10)
+        np.testing.assert_equal(b, a[:5])
+
+
 class TestBoundsEnvironmentVariable(TestCase):
     def setUp(self):
         @njit
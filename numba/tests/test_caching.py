@@ -2,6 +2,7 @@ import importlib
 import inspect
 import multiprocessing
 import os
+import platform
 import shutil
 import stat
 import subprocess
@@ -893,6 +894,36 @@ class TestCacheWithCpuSetting(DispatcherCacheUsecasesTest):
         self.assertEqual(key_generic[1][2], my_cpu_features)
 
 
+class TestCacheCpuVariants(DispatcherCacheUsecasesTest):
+    # Disable parallel testing due to envvars modification
+    _numba_parallel_test_ = False
+
+    @unittest.skipIf(platform.machine() != 'x86_64', 'x86_64 only test')
+    def test_cpu_variants(self):
+        self.check_pycache(0)
+        with override_config('CACHE_CPU_NAMES', ('x86-64-v2',)):
+            mod = self.import_module()
+            mod.self_test()
+        cache_index = mod.add_usecase._cache._cache_file._load_index()
+        self.assertEqual(sorted(key[1][1:] for key in cache_index),
+                         sorted([(ll.get_host_cpu_name(),
+                                  codegen.get_host_cpu_features()),
+                                 ('x86-64-v2', '')]))
+
+        # Another CPU supporting the features of x86-64-v2 loads the code
+        # compiled for it instead of compiling and caching its own
+        mtimes = self.get_cache_mtimes()
+        features = '+cx16,+sahf,+popcnt,+sse3,+sse4.1,+sse4.2,+ssse3'
+        self.run_in_separate_process(envvars={
+            'NUMBA_CPU_NAME': 'nehalem', 'NUMBA_CPU_FEATURES': features})
+        self.assertEqual(self.get_cache_mtimes(), mtimes)
+
+        # Unless it doesn't support them
+        self.run_in_separate_process(envvars={
+            'NUMBA_CPU_NAME': 'nehalem', 'NUMBA_CPU_FEATURES': '-sse4.2'})
+        self.assertGreater(len(self.cache_contents()), len(mtimes))
+
+
 class TestMultiprocessCache(BaseCacheTest):
 
     # Nested multiprocessing.Pool raises AssertionError:
@@ -7,6 +7,7 @@ import warnings
 import base64
 import ctypes
 import pickle
+import platform
 import re
 import subprocess
 import sys
@@ -111,6 +112,26 @@ class JITCPUCodegenTestCase(TestCase):
         cg2 = JITCPUCodegen('xxx')
         self.assertEqual(cg2.magic_tuple(), tup)
 
+    @unittest.skipIf(platform.machine() != 'x86_64', 'x86_64 only test')
+    def test_portable_code_level(self):
+        v2 = JITCPUCodegen('v2', cpu_name='x86-64-v2')
+        v3 = JITCPUCodegen('v3', cpu_name='x86-64-v3')
+        triple = v2.magic_tuple()[0]
+        self.assertEqual(v3.magic_tuple(), (triple, 'x86-64-v3', ''))
+        # The code of the lower levels can be run
+        self.assertEqual(v3.portable_code_level(v2.magic_tuple()), 7)
+        self.assertEqual(v3.portable_code_level(v3.magic_tuple()), 16)
+        self.assertIsNone(v2.portable_code_level(v3.magic_tuple()))
+        # Additional features are required too
+        self.assertEqual(v2.portable_code_level((triple, 'generic', '')), 0)
+        self.assertEqual(v3.portable_code_level((triple, 'x86-64', '+avx')),
+                         1)
+        self.assertIsNone(v2.portable_code_level((triple, 'x86-64', '+avx')))
+        # Only the portable CPU models are considered
+        self.assertIsNone(v3.portable_code_level((triple, 'haswell', '')))
+        self.assertIsNone(v3.portable_code_level(('i386-pc-linux-gnu',
+                                                  'generic', '')))
+
     # Serialization tests.
 
     def _check_serialize_unserialize(self, state):
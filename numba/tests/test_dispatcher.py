@@ -11,7 +11,7 @@ import numpy as np
 from numba import njit, jit, typeof, vectorize
 from numba.core import types, errors
 from numba import _dispatcher
-from numba.tests.support import TestCase, captured_stdout
+from numba.tests.support import TestCase, captured_stdout, override_config
 from numba.np.numpy_support import as_dtype
 from numba.core.dispatcher import Dispatcher
 from numba.extending import overload
@@ -908,6 +908,140 @@ class TestDispatcherMethods(TestCase):
         self.assertEqual(exp_f, got_f)
 
 
+class TestLeanCompileResults(TestCase):
+
+    def compile_lean(self, *args):
+        @njit
+        def foo(a, b):
+            return a + b
+
+        with override_config('LEAN_COMPILE_RESULTS', 1):
+            foo(*args)
+        return foo
+
+    def test_lean_overload(self):
+        foo = self.compile_lean(1, 2)
+        [cres] = foo.overloads.values()
+        self.assertTrue(cres.is_lean)
+        self.assertIsNone(cres.type_annotation)
+        self.assertIsNone(cres.metadata)
+        self.assertIsNone(cres.fndesc.typemap)
+        self.assertIsNone(cres.fndesc.calltypes)
+        # The function is still usable, from Python and from other functions
+        self.assertPreciseEqual(foo(3, 4), 7)
+
+        @njit
+        def bar(a):
+            return foo(a, 1)
+
+        self.assertPreciseEqual(bar(2), 3)
+
+    def test_lean_inspection(self):
+        foo = self.compile_lean(1, 2)
+        sig = foo.signatures[0]
+        # Inspection data is recomputed on demand
+        self.assertIn("foo", foo.inspect_llvm(sig))
+        self.assertIn("foo", foo.inspect_asm(sig))
+        self.assertIsNotNone(foo.get_metadata(sig))
+        with captured_stdout() as out:
+            foo.inspect_types()
+        self.assertIn("int64", out.getvalue())
+        # ... but it is not retained
+        self.assertTrue(foo.overloads[sig].is_lean)
+        self.assertIsNone(foo.overloads[sig].type_annotation)
+
+    def test_not_lean_by_default(self):
+        @njit
+        def foo(a):
+            return a
+
+        foo(1)
+        [cres] = foo.overloads.values()
+        self.assertFalse(cres.is_lean)
+        self.assertIsNotNone(cres.type_annotation)
+
+
+class TestMaxOverloads(TestCase):
+
+    def test_lru_eviction(self):
+        @njit(max_overloads=2)
+        def foo(x):
+            return x
+
+        foo(1)
+        foo(1.5)
+        foo(1)
+        # float64 is the least recently used
+        foo(1j)
+        self.assertEqual(foo.signatures, [(types.int64,), (types.complex128,)])
+        self.assertEqual(foo.stats.evictions, {(types.float64,): 1})
+        # The evicted overload is compiled again when needed
+        self.assertPreciseEqual(foo(1.5), 1.5)
+        self.assertEqual(foo.signatures,
+                         [(types.complex128,), (types.float64,)])
+        self.assertEqual(foo.stats.evictions,
+                         {(types.float64,): 1, (types.int64,): 1})
+
+    def test_evicted_overload_released(self):
+        @njit(max_overloads=1)
+        def foo(x):
+            return x
+
+        foo(1)
+        cres = foo.overloads[foo.signatures[0]]
+        ref = weakref.ref(cres.library)
+        del cres
+        foo(1.5)
+        self.assertEqual(foo.signatures, [(types.float64,)])
+        self.assertIsNone(ref())
+
+    def test_callers_unaffected(self):
+        @njit(max_overloads=1)
+        def foo(x):
+            return x + 1
+
+        @njit
+        def bar(x):
+            return foo(x)
+
+        self.assertPreciseEqual(bar(1), 2)
+        self.assertPreciseEqual(foo(1.5), 2.5)
+        self.assertEqual(foo.signatures, [(types.float64,)])
+        # The caller linked the evicted overload
+        self.assertPreciseEqual(bar(1), 2)
+
+    def test_global_limit(self):
+        @njit
+        def foo(x):
+            return x
+
+        with override_config('MAX_OVERLOADS', 1):
+            foo(1)
+            foo(1.5)
+        self.assertEqual(foo.signatures, [(types.float64,)])
+
+    def test_set_max_overloads(self):
+        @njit
+        def foo(x):
+            return x
+
+        foo(1)
+        foo(1.5)
+        foo(1j)
+        foo.set_max_overloads(1)
+        self.assertEqual(foo.signatures, [(types.complex128,)])
+        with self.assertRaises(ValueError):
+            foo.set_max_overloads(-1)
+
+    def test_no_eviction_when_compile_disabled(self):
+        @njit(["int64(int64)", "float64(float64)"], max_overloads=1)
+        def foo(x):
+            return x
+
+        foo.set_max_overloads(1)
+        self.assertEqual(len(foo.signatures), 2)
+
+
 class TestDispatcherFunctionBoundaries(TestCase):
     def test_pass_dispatcher_as_arg(self):
         # Test that a Dispatcher object can be pass as argument
@@ -9,7 +9,8 @@ import gc
 from numba.core.errors import TypingError
 from numba import njit
 from numba.core import types, utils, config
-from numba.tests.support import MemoryLeakMixin, TestCase, tag, skip_if_32bit
+from numba.tests.support import (MemoryLeakMixin, TestCase, tag,
+                                 skip_if_32bit, override_config)
 import unittest
 
 
@@ -1334,6 +1335,50 @@ class TestNpyEmptyKeyword(TestCase):
             cfunc()
 
 
+class TestArrayAlignment(MemoryLeakMixin, TestCase):
+
+    def check_aligned(self, cfunc, align):
+        for n in range(1, 10):
+            for arr in cfunc(n):
+                self.assertEqual(arr.ctypes.data % align, 0)
+
+    def test_aligned(self):
+        def pyfunc(n):
+            a = np.empty(n)
+            b = np.zeros((n, 3), dtype=np.int8)
+            c = np.arange(n)
+            d = a[1:] * 2.0
+            return a, b, c, d
+
+        self.check_aligned(njit(pyfunc), config.ARRAY_ALIGNMENT)
+
+    def test_configured_alignment(self):
+        def pyfunc(n):
+            return np.ones(n, dtype=np.float32), np.full(n, 2j)
+
+        with override_config('ARRAY_ALIGNMENT', 256):
+            cfunc = njit(pyfunc)
+            cfunc.compile((types.intp,))
+        self.check_aligned(cfunc, 256)
+
+    def test_aligned_accesses(self):
+        # The accesses of the vectorized loop are aligned
+        @njit
+        def fill(n):
+            a = np.empty(n)
+            for i in range(n):
+                a[i] = i * 2.0
+            return a
+
+        self.assertPreciseEqual(fill(10), np.arange(10.0) * 2.0)
+        llvm_ir = fill.inspect_llvm(fill.signatures[0])
+        aligns = re.findall(r'store <\d+ x double> .*, align (\d+)',
+                            llvm_ir)
+        if not aligns:
+            self.skipTest("loop not vectorized")
+        self.assertGreater(max(int(a) for a in aligns), 8)
+
+
 class TestNpArray(MemoryLeakMixin, BaseTest):
 
     def test_0d(self):
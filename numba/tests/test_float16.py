@@ -0,0 +1,214 @@
+"""
+Tests for float16 support on the CPU target.
+"""
+
+import math
+import operator
+
+import numpy as np
+
+import llvmlite.binding as ll
+
+from numba import njit, types
+from numba.tests.support import TestCase
+import unittest
+
+
+def binop(op):
+    def fn(a, b):
+        return op(a, b)
+    return fn
+
+
+def math_sin(x):
+    return math.sin(x)
+
+
+def accumulate(arr):
+    acc = arr[0]
+    for i in range(1, arr.size):
+        acc += arr[i]
+    return acc
+
+
+def axpy(a, x, y):
+    for i in range(x.size):
+        y[i] = a * x[i] + y[i]
+
+
+def astype_float16(arr):
+    return arr.astype(np.float16)
+
+
+def astype_float32(arr):
+    return arr.astype(np.float32)
+
+
+def ufunc_call(ufunc, nin):
+    args = ', '.join('x%d' % i for i in range(nin))
+    ns = {'ufunc': ufunc}
+    exec('def fn(%s):\n    return ufunc(%s)' % (args, args), ns)
+    return ns['fn']
+
+
+class TestFloat16Scalars(TestCase):
+
+    values = [np.float16(v) for v in (2.7, -0.3, 0.0, 65504.0, 6e-8, 1.0)]
+
+    def test_arithmetic(self):
+        ops = [operator.add, operator.sub, operator.mul, operator.truediv,
+               operator.floordiv, operator.mod, operator.lt, operator.eq,
+               min, max]
+        for op in ops:
+            cfunc = njit(binop(op))
+            for a in self.values:
+                for b in self.values:
+                    if b == 0 and op in (operator.truediv, operator.floordiv,
+                                         operator.mod):
+                        continue
+                    with np.errstate(all='ignore'):
+                        expected = op(a, b)
+                    got = cfunc(a, b)
+                    self.assertPreciseEqual(got, expected.item(), prec='exact',
+                                            msg='%s%s' % (op, (a, b)))
+            self.assertIn(cfunc.nopython_signatures[0].return_type,
+                          (types.float16, types.boolean))
+
+    def test_divmod(self):
+        cfunc = njit(binop(divmod))
+        for a, b in [(2.7, 0.3), (-2.7, 0.3), (2.7, -0.7), (65504, 3)]:
+            a, b = np.float16(a), np.float16(b)
+            self.assertPreciseEqual(cfunc(a, b), tuple(x.item()
+                                                       for x in divmod(a, b)))
+
+    def test_mixed_types(self):
+        cfunc = njit(binop(operator.add))
+        x = np.float16(2.7)
+        cfunc(x, np.float32(1))
+        cfunc(x, 1.0)
+        cfunc(x, 1)
+        restypes = [sig.return_type for sig in cfunc.nopython_signatures]
+        self.assertEqual(restypes, [types.float32, types.float64,
+                                    types.float64])
+
+    def test_accumulate(self):
+        # Each operation is rounded to float16
+        arr = np.linspace(0, 10, 101).astype(np.float16)
+        cfunc = njit(accumulate)
+        self.assertPreciseEqual(cfunc(arr), accumulate(arr).item())
+        self.assertEqual(cfunc.nopython_signatures[0].return_type,
+                         types.float16)
+
+    def test_math(self):
+        # The math functions compute and return float32
+        cfunc = njit(math_sin)
+        x = np.float16(2.7)
+        self.assertPreciseEqual(cfunc(x), cfunc(np.float32(x)))
+        self.assertEqual(cfunc.nopython_signatures[0].return_type,
+                         types.float32)
+
+
+class TestFloat16Arrays(TestCase):
+
+    def check_astype_float16(self, arr):
+        with np.errstate(all='ignore'):
+            expected = arr.astype(np.float16)
+        got = njit(astype_float16)(arr)
+        self.assertPreciseEqual(got, expected)
+
+    def test_conversions(self):
+        # All the float16 values, and the rounding of wider types to float16
+        halves = np.arange(2 ** 16, dtype=np.uint16).view(np.float16)
+        halves = halves[~np.isnan(halves)]
+        self.assertPreciseEqual(njit(astype_float32)(halves),
+                                halves.astype(np.float32))
+        rng = np.random.default_rng(42)
+        doubles = np.concatenate([
+            # Values between float16 values, including the ties
+            halves[:-1].astype(np.float64) + np.diff(halves) / 2,
+            halves[:-1].astype(np.float64) + np.diff(halves) / 3,
+            rng.uniform(-70000, 70000, 10000),
+            np.exp(rng.uniform(-20, 12, 10000)),
+            [np.inf, -np.inf, 65519.99, 65520.0, 1e300, 5e-324, 2.0 ** -25],
+        ])
+        self.check_astype_float16(doubles)
+        self.check_astype_float16(doubles.astype(np.float32))
+        self.check_astype_float16(np.arange(-70000, 70000, 7))
+
+    @TestCase.run_test_in_subprocess(envvars={'NUMBA_CPU_NAME': 'generic'})
+    def test_conversions_without_f16c(self):
+        # The conversions are then made by calls to helper functions
+        self.test_conversions()
+        self.test_axpy()
+
+    def test_axpy(self):
+        x = np.linspace(-5, 5, 1001).astype(np.float16)
+        y = np.linspace(3, 7, 1001).astype(np.float16)
+        expected = y.copy()
+        axpy(np.float16(1.5), x, expected)
+        cfunc = njit(axpy)
+        cfunc(np.float16(1.5), x, y)
+        self.assertPreciseEqual(y, expected)
+
+    @unittest.skipUnless(ll.get_host_cpu_features().get('f16c'),
+                         "requires the F16C instructions")
+    def test_axpy_vectorized(self):
+        cfunc = njit(axpy)
+        x = np.ones(10, np.float16)
+        cfunc(np.float16(2), x, x)
+        llvm_ir = cfunc.inspect_llvm(cfunc.signatures[0])
+        self.assertRegex(llvm_ir, r'<\d+ x half>')
+
+
+class TestFloat16Ufuncs(TestCase):
+
+    ufuncs = [np.add, np.subtract, np.multiply, np.true_divide,
+              np.floor_divide, np.remainder, np.divmod, np.power,
+              np.maximum, np.fmin, np.less, np.arctan2, np.copysign,
+              np.nextafter, np.negative, np.absolute, np.sqrt, np.exp,
+              np.log, np.sin, np.floor, np.isnan, np.signbit, np.spacing]
+
+    def check_close(self, got, expected):
+        self.assertEqual(got.dtype, expected.dtype)
+        if expected.dtype != np.float16:
+            self.assertPreciseEqual(got, expected)
+            return
+        # The float32 math functions may round differently from NumPy's,
+        # allow for one ulp of difference
+        def ordered(arr):
+            bits = arr.view(np.int16).astype(np.int32)
+            return np.where(bits < 0, -0x8000 - bits, bits)
+        close = ((np.abs(ordered(got) - ordered(expected)) <= 1)
+                 | (np.isnan(got) & np.isnan(expected)))
+        self.assertTrue(close.all(), msg='%s != %s' % (got[~close],
+                                                       expected[~close]))
+
+    def test_ufuncs(self):
+        rng = np.random.default_rng(0)
+        # The float32 loops handle some infinite operands differently from
+        # NumPy, which is not specific to float16
+        special = [np.nan, 65504.0, 6e-8, 1.0, -1.0, 0.5]
+        a = np.concatenate([rng.uniform(-10, 10, 100), special, [0.0]])
+        b = np.concatenate([rng.uniform(-10, 10, 100), special[::-1], [3.0]])
+        args = (a.astype(np.float16), b.astype(np.float16))
+        for ufunc in self.ufuncs:
+            with self.subTest(ufunc=ufunc.__name__):
+                cfunc = njit(ufunc_call(ufunc, ufunc.nin))
+                got = cfunc(*args[:ufunc.nin])
+                with np.errstate(all='ignore'):
+                    expected = ufunc(*args[:ufunc.nin])
+                if ufunc.nout == 1:
+                    got, expected = (got,), (expected,)
+                for g, e in zip(got, expected):
+                    self.check_close(g, e)
+
+    def test_scalar(self):
+        cfunc = njit(ufunc_call(np.sqrt, 1))
+        self.assertPreciseEqual(cfunc(np.float16(2)),
+                                np.sqrt(np.float16(2)).item())
+        self.assertEqual(cfunc.nopython_signatures[0].return_type,
+                         types.float16)
+
+
+if __name__ == '__main__':
+    unittest.main()
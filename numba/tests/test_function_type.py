@@ -1329,6 +1329,60 @@ class TestInliningFunctionType(MemoryLeakMixin, TestCase):
         # than 1. See test_inlining_global_dispatcher().
         self.assertGreater(self.count_num_bb_in_cfg(callme), 1)
 
+    def count_indirect_calls(self, dispatcher, sig):
+        llvm_ir = dispatcher.inspect_llvm(sig)
+        return len(re.findall(r"call i32 %", llvm_ir))
+
+    def test_devirtualizing_selected_dispatcher(self):
+        @njit
+        def add(x, y):
+            return x + y
+
+        @njit
+        def sub(x, y):
+            return x - y
+
+        @njit
+        def foo(flag, x, y):
+            # fn has a function type unifying the two dispatchers
+            fn = add
+            if flag:
+                fn = sub
+            c = 0
+            for i in range(100):
+                c += fn(x, y)
+            return c
+
+        self.assertEqual(foo(False, 123, 321), 100 * (123 + 321))
+        self.assertEqual(foo(True, 123, 321), 100 * (123 - 321))
+        # The calls are made directly to add() or sub()
+        self.assertEqual(self.count_indirect_calls(foo, foo.signatures[0]),
+                         0)
+
+    def test_devirtualizing_with_unknown_function(self):
+        @njit
+        def add(x, y):
+            return x + y
+
+        @njit
+        def sub(x, y):
+            return x - y
+
+        fnty = types.FunctionType(int64(int64, int64))
+
+        @njit(int64(fnty, types.boolean, int64, int64))
+        def foo(fn, flag, x, y):
+            if flag:
+                fn = sub
+            return fn(x, y)
+
+        self.assertEqual(foo(add, False, 123, 321), 123 + 321)
+        self.assertEqual(foo(add, True, 123, 321), 123 - 321)
+        # sub() is called directly, the argument is still called through
+        # its address
+        self.assertEqual(self.count_indirect_calls(foo, foo.signatures[0]),
+                         1)
+
 
 class TestExceptionInFunctionType(MemoryLeakMixin, TestCase):
     def test_exception_raising(self):
@@ -269,12 +269,14 @@ class TestGenerators(MemoryLeakMixin, TestCase):
         self.check_gen9(**forceobj_flags)
 
     def check_consume_generator(self, gen_func):
-        cgen = jit(nopython=True)(gen_func)
-        cfunc = jit(nopython=True)(make_consumer(cgen))
         pyfunc = make_consumer(gen_func)
         expected = pyfunc(5)
-        got = cfunc(5)
-        self.assertPreciseEqual(got, expected)
+        # The generator is inlined into the consuming loop unless asked not to
+        for inline in ('never', None):
+            cgen = jit(nopython=True, inline=inline)(gen_func)
+            cfunc = jit(nopython=True)(make_consumer(cgen))
+            got = cfunc(5)
+            self.assertPreciseEqual(got, expected)
 
     def test_consume_gen1(self):
         self.check_consume_generator(gen1)
@@ -650,6 +652,106 @@ class TestGeneratorWithNRT(MemoryLeakMixin, TestCase):
         self.assertEqual(main(), magic)
 
 
+def gen_yields(x):
+    yield x
+    for i in range(x):
+        if i % 3:
+            yield i * 1.5
+    yield -1
+
+
+def make_nested_gen(gen_func):
+    def gen(x):
+        for y in gen_func(x):
+            yield y + 1
+        yield 10
+
+    return gen
+
+
+def make_break_consumer(gen_func):
+    def consumer(x):
+        res = 0.0
+        for y in gen_func(x):
+            if y > 4:
+                break
+            if y == 1.5:
+                continue
+            res = res * 2 + y
+        else:
+            res = -res
+        return res
+
+    return consumer
+
+
+def make_twice_consumer(gen_func):
+    def consumer(x):
+        res = 0.0
+        g = gen_func(x)
+        for y in g:
+            res += y
+            break
+        for y in g:
+            res = res * 2 + y
+        return res
+
+    return consumer
+
+
+def make_kwargs_consumer(gen_func):
+    def consumer(x):
+        res = 0
+        for y in gen_func(x, b=True):
+            res = res * 3 + y
+        return res
+
+    return consumer
+
+
+class TestInlineGenerators(MemoryLeakMixin, TestCase):
+    """
+    Tests for the inlining of generators into the for loops consuming them.
+    """
+
+    def check(self, make_consumer, gen_func, args, inlined=True,
+              **gen_options):
+        pyfunc = make_consumer(gen_func)
+        cfunc = njit(make_consumer(njit(**gen_options)(gen_func)))
+        for x in args:
+            self.assertPreciseEqual(cfunc(x), pyfunc(x))
+        cres = cfunc.overloads[cfunc.signatures[0]]
+        generators = [ty for ty in cres.type_annotation.typemap.values()
+                      if isinstance(ty, types.Generator)]
+        self.assertEqual(not generators, inlined)
+
+    def test_single_yield(self):
+        self.check(make_break_consumer, gen1, [0, 3, 10])
+
+    def test_multiple_yields(self):
+        self.check(make_break_consumer, gen_yields, [0, 1, 3, 10])
+        self.check(make_break_consumer, gen2, [0, 3, 10])
+
+    def test_default_args(self):
+        self.check(make_kwargs_consumer, gen8, [0, 1, 5])
+
+    def test_nested(self):
+        # gen1 is inlined into gen_nested, which is inlined into the consumer
+        self.check(make_break_consumer, make_nested_gen(njit(gen1)),
+                   [0, 3, 10])
+
+    def test_arrays(self):
+        self.check(make_consumer, nrt_gen0, [np.arange(10.0)])
+
+    def test_inline_never(self):
+        self.check(make_break_consumer, gen1, [0, 3, 10], inlined=False,
+                   inline='never')
+
+    def test_generator_reused(self):
+        # The generator object is used by two loops
+        self.check(make_twice_consumer, gen1, [0, 3, 10], inlined=False)
+
+
 class TestGeneratorModel(test_factory()):
     fe_type = types.Generator(gen_func=None, yield_type=types.int32,
                               arg_types=[types.int64, types.float32],
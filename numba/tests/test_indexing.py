@@ -1029,6 +1029,36 @@ class TestSetItem(TestCase):
                       str(raises.exception))
 
 
+class TestNoWraparound(TestCase):
+    """
+    Test array indexing with the wraparound option disabled.
+    """
+
+    def test_getitem(self):
+        a = np.arange(12).reshape((3, 4))
+        pyfunc = integer_indexing_2d_usecase
+        cfunc = njit(wraparound=False)(pyfunc)
+        self.assertEqual(cfunc(a, 2, 3), 11)
+        # Negative indices are out of bounds
+        cfunc = njit(wraparound=False, boundscheck=True)(pyfunc)
+        self.assertEqual(cfunc(a, 1, 2), 6)
+        for i, j in [(-1, 0), (0, -1)]:
+            with self.assertRaises(IndexError):
+                cfunc(a, i, j)
+        # Negative indices are wrapped around by default
+        cfunc = njit(boundscheck=True)(pyfunc)
+        self.assertEqual(cfunc(a, 0, -1), 3)
+
+    def test_setitem(self):
+        pyfunc = setitem_usecase.py_func
+        a = np.zeros(5)
+        cfunc = njit(wraparound=False, boundscheck=True)(pyfunc)
+        cfunc(a, 4, 1.)
+        np.testing.assert_equal(a, [0, 0, 0, 0, 1])
+        with self.assertRaises(IndexError):
+            cfunc(a, -1, 2.)
+
+
 class TestTyping(TestCase):
     """
     Check typing of basic indexing operations
@@ -0,0 +1,98 @@
+import unittest
+
+import numpy as np
+
+import numba
+from numba import njit
+from numba.core import event
+from numba.tests.support import TestCase, override_config
+
+
+class TestInstrumentation(TestCase):
+
+    def stats_of(self, stats, func):
+        # Stats are keyed by qualified name and signature
+        name = "%s.%s(" % (func.py_func.__module__, func.py_func.__qualname__)
+        [(key, value)] = [(k, v) for k, v in stats.items()
+                          if k.startswith(name)]
+        return value
+
+    def test_counters(self):
+        @njit(instrument=True)
+        def inner(a):
+            return a.sum()
+
+        @njit(instrument=True)
+        def outer(a, n):
+            s = 0.0
+            for i in range(n):
+                s += inner(a)
+            return s
+
+        a = np.arange(10.0)
+        outer(a, 5)
+        numba.runtime_stats(reset=True)
+
+        outer(a, 7)
+        outer(a, 3)
+        stats = numba.runtime_stats(reset=True)
+        inner_stats = self.stats_of(stats, inner)
+        outer_stats = self.stats_of(stats, outer)
+        # Calls between jitted functions are counted
+        self.assertEqual(inner_stats.calls, 10)
+        self.assertEqual(outer_stats.calls, 2)
+        # Cycles are inclusive
+        self.assertGreaterEqual(outer_stats.cycles, inner_stats.cycles)
+
+        stats = numba.runtime_stats()
+        self.assertEqual(self.stats_of(stats, inner).calls, 0)
+
+    def test_exception(self):
+        @njit(instrument=True)
+        def foo(x):
+            if x < 0:
+                raise ValueError("negative")
+            return x
+
+        foo(1)
+        numba.runtime_stats(reset=True)
+        with self.assertRaises(ValueError):
+            foo(-1)
+        self.assertEqual(self.stats_of(numba.runtime_stats(), foo).calls, 1)
+
+    def test_config(self):
+        with override_config('INSTRUMENT', 1):
+            @njit
+            def foo(x):
+                return x + 1
+
+            foo(1)
+        self.assertEqual(self.stats_of(numba.runtime_stats(), foo).calls, 1)
+
+    def test_not_instrumented(self):
+        @njit
+        def foo(x):
+            return x + 1
+
+        foo(1)
+        self.assertNotIn("readcyclecounter",
+                         foo.inspect_llvm(foo.signatures[0]))
+        with self.assertRaises(ValueError):
+            self.stats_of(numba.runtime_stats(), foo)
+
+    def test_event(self):
+        @njit(instrument=True)
+        def foo(x):
+            return x + 1
+
+        foo(1)
+        with event.install_recorder("numba:runtime_stats") as rec:
+            stats = numba.runtime_stats()
+        self.assertEqual(len(rec.buffer), 2)
+        _, evt = rec.buffer[-1]
+        self.assertTrue(evt.is_end)
+        self.assertEqual(evt.data, stats)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import sys
+import unittest
+
+import numpy as np
+
+from numba import njit
+from numba.misc import line_profiler
+from numba.misc.line_profiler import LineProfiler
+from numba.tests.support import TestCase, captured_stdout
+
+
+def lines_of(func):
+    code = func.py_func.__code__
+    return code.co_filename, code.co_firstlineno
+
+
+@unittest.skipIf(sys.platform.startswith('win32'), "SIGPROF not available")
+class TestLineProfiler(TestCase):
+
+    def run_profiled(self, func, *args):
+        prof = LineProfiler(interval=0.0005)
+        for _ in range(20):
+            with prof:
+                func(*args)
+            if prof.get_stats():
+                break
+        return prof
+
+    def check_lines(self, stats, filename, expected):
+        lines = {lineno for fname, lineno in stats if fname == filename}
+        self.assertTrue(lines)
+        self.assertLessEqual(lines, expected)
+
+    def test_line_key(self):
+        key = line_profiler.line_key("somefile.py", 42)
+        self.assertGreater(key, 0)
+        self.assertEqual(line_profiler.decode_line_key(key),
+                         ("somefile.py", 42))
+
+    def test_samples(self):
+        @njit(line_profile=True)
+        def foo(a, n):
+            s = 0.0
+            for i in range(n):
+                s += np.sin(a).sum()
+            return s
+
+        a = np.arange(10000.0)
+        foo(a, 1)
+        prof = self.run_profiled(foo, a, 200)
+        stats = prof.get_stats()
+        filename, firstlineno = lines_of(foo)
+        # All samples belong to the body of foo, and most of them to the
+        # line of the loop body
+        self.check_lines(stats, filename,
+                         set(range(firstlineno, firstlineno + 6)))
+        hot = max(stats, key=stats.get)
+        self.assertEqual(hot, (filename, firstlineno + 4))
+
+        with captured_stdout() as out:
+            prof.print_stats()
+        self.assertIn("s += np.sin(a).sum()", out.getvalue())
+
+    def test_parallel(self):
+        @njit(line_profile=True, parallel=True)
+        def foo(a):
+            out = np.empty_like(a)
+            for i in range(10):
+                out[:] = np.cos(a) ** 2
+            return out
+
+        a = np.arange(100000.0)
+        foo(a)
+        prof = self.run_profiled(foo, a)
+        stats = prof.get_stats()
+        filename, firstlineno = lines_of(foo)
+        self.assertIn((filename, firstlineno + 4), stats)
+
+    def test_not_instrumented(self):
+        @njit
+        def foo(x):
+            return x + 1
+
+        foo(1)
+        self.assertNotIn("numba_line_profiler_current",
+                         foo.inspect_llvm(foo.signatures[0]))
+
+    def test_already_running(self):
+        with LineProfiler():
+            with self.assertRaises(RuntimeError):
+                LineProfiler().start()
+
+    def test_invalid_interval(self):
+        with self.assertRaises(ValueError):
+            LineProfiler(interval=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@ Test problems in nested calls.
 Usually due to invalid type conversion between function boundaries.
 """
 
+import numpy as np
 
 from numba import int32, int64
 from numba import jit
@@ -149,5 +150,66 @@ class TestNestedCall(TestCase):
         self.assertPreciseEqual(cfunc(1j, 2), (1j + 5, 2))
 
 
+@jit(nopython=True)
+def square(x):
+    return x * x
+
+
+@jit(nopython=True)
+def sum_squares(x, y):
+    return square(x) + square(y)
+
+
+@jit(nopython=True)
+def floor_div(x, y):
+    return x // y
+
+
+@jit(nopython=True)
+def sum_squares_div(x, y):
+    return sum_squares(x, y) + floor_div(x, y)
+
+
+@jit(nopython=True)
+def array_squares(arr):
+    out = 0.0
+    for x in arr:
+        out += square(x)
+    return out
+
+
+class TestNounwindCall(TestCase):
+    """
+    Test the calls to the variants of the functions that cannot raise.
+    """
+
+    def get_fndesc(self, cfunc):
+        return cfunc.overloads[cfunc.signatures[-1]].fndesc
+
+    def test_nounwind_inference(self):
+        self.assertPreciseEqual(sum_squares_div(7, 2), 7 * 7 + 2 * 2 + 3)
+        # Functions calling only functions that cannot raise cannot raise
+        # either
+        self.assertTrue(self.get_fndesc(square).nounwind)
+        self.assertTrue(self.get_fndesc(sum_squares).nounwind)
+        self.assertFalse(self.get_fndesc(floor_div).nounwind)
+        self.assertFalse(self.get_fndesc(sum_squares_div).nounwind)
+
+        # The variants are defined next to the functions
+        fndesc = self.get_fndesc(sum_squares)
+        llvm_ir = sum_squares.inspect_llvm(sum_squares.signatures[-1])
+        self.assertIn('define i64 @%s(' % fndesc.llvm_nounwind_func_name,
+                      llvm_ir)
+
+    def test_exception_propagation(self):
+        with self.assertRaises(ZeroDivisionError):
+            sum_squares_div(1, 0)
+
+    def test_array_argument(self):
+        arr = np.arange(5.0)
+        self.assertPreciseEqual(array_squares(arr), np.sum(arr * arr))
+        self.assertTrue(self.get_fndesc(square).nounwind)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,95 @@
+"""
+Tests for the noalias option of the jit decorator.
+"""
+
+import re
+
+import numpy as np
+
+from numba import njit
+from numba.core import errors
+from numba.tests.support import TestCase
+import unittest
+
+
+def add_arrays(a, b, out):
+    for i in range(out.size):
+        out[i] = a[i] + b[i]
+
+
+class TestNoAlias(TestCase):
+
+    def get_noalias_args(self, cfunc):
+        # The names of the arguments marked noalias in the definition of
+        # the compiled function
+        ir = cfunc.inspect_llvm(cfunc.signatures[0])
+        for line in ir.splitlines():
+            if line.startswith('define') and cfunc.__name__ in line:
+                if 'cpython' in line or 'cfunc' in line:
+                    continue
+                return set(re.findall(r'noalias[^,%]*%"?arg\.(\w+)\.', line))
+        self.fail("function definition not found")
+
+    def test_attributes(self):
+        a = np.arange(10.)
+        b = np.arange(10.)
+        for value, expected in [(False, set()),
+                                (True, {'a', 'b', 'out'}),
+                                (('out',), {'out'}),
+                                (['a', 'out'], {'a', 'out'})]:
+            cfunc = njit(noalias=value)(add_arrays)
+            out = np.zeros(10)
+            cfunc(a, b, out)
+            np.testing.assert_equal(out, a + b)
+            self.assertEqual(self.get_noalias_args(cfunc), expected)
+
+    def test_no_runtime_alias_check(self):
+        # LLVM does not need to check for overlapping arrays to vectorize
+        # the loop
+        a = np.arange(10.)
+        cfunc = njit(noalias=True)(add_arrays)
+        cfunc(a, a, np.zeros(10))
+        self.assertNotIn('vector.memcheck',
+                         cfunc.inspect_llvm(cfunc.signatures[0]))
+
+    def test_overlap_check(self):
+        a = np.arange(10.)
+        cfunc = njit(noalias=('out',), boundscheck=True)(add_arrays)
+        # a and b may overlap
+        out = np.zeros(5)
+        cfunc(a[:5], a[:5], out)
+        np.testing.assert_equal(out, a[:5] * 2)
+        # Disjoint and empty views of the same array
+        cfunc(a[:5], a[:5], a[5:])
+        cfunc(a[:0], a[:0], a[:0])
+        with self.assertRaises(ValueError) as raises:
+            cfunc(a[:5], a[:5], a[4:9])
+        self.assertIn("noalias arguments a and out overlap in memory",
+                      str(raises.exception))
+        # The extents of strided arrays are checked
+        with self.assertRaises(ValueError):
+            cfunc(a[::2], a[:5], a[1::2])
+
+    def test_no_overlap_check(self):
+        # The check is only done with bounds checking enabled
+        a = np.arange(10.)
+        cfunc = njit(noalias=True, boundscheck=False)(add_arrays)
+        cfunc(a[:5], a[:5], a[5:])
+        np.testing.assert_equal(a[5:], np.arange(5.) * 2)
+
+    def test_unknown_argument(self):
+        a = np.arange(10.)
+        cfunc = njit(noalias=('out', 'c'))(add_arrays)
+        with self.assertRaises(errors.NumbaValueError) as raises:
+            cfunc(a, a, np.zeros(10))
+        self.assertIn("noalias names unknown arguments: c",
+                      str(raises.exception))
+
+    def test_invalid_option(self):
+        with self.assertRaises(ValueError) as raises:
+            njit(noalias=1)(add_arrays)(np.ones(1), np.ones(1), np.ones(1))
+        self.assertIn("Expected noalias option", str(raises.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,7 +7,7 @@ import re
 import numpy as np
 
 from numba import njit
-from numba.core import types
+from numba.core import config, types
 from numba.core.runtime import (
     rtsys,
     nrtopt,
@@ -853,5 +853,116 @@ class TestNrtStatistics(TestCase):
                 self.assertIn("NRT stats are disabled.", str(raises.exception))
 
 
+class TestNrtPoolAllocator(TestCase):
+
+    def test_pool_allocator(self):
+        src = """if 1:
+        import threading
+        import numpy as np
+        from numba import njit
+        from numba.core.runtime import rtsys, _nrt_python
+        from numba.core.registry import cpu_target
+
+        @njit
+        def temporaries(a, n):
+            s = 0.0
+            for i in range(n):
+                s += (a * i).sum()
+            return s
+
+        @njit
+        def make(n, size):
+            return [np.full(size, i) for i in range(n)]
+
+        @njit
+        def grow(n):
+            lst = []
+            for i in range(n):
+                lst.append(i)
+            return np.asarray(lst).sum()
+
+        rtsys.initialize(cpu_target.target_context)
+        assert _nrt_python.memsys_pool_allocator_enabled()
+        a = np.ones(16)
+        temporaries(a, 1)
+        before = rtsys.get_pool_stats()
+        assert temporaries(a, 1000) == a.sum() * 999 * 500
+        after = rtsys.get_pool_stats()
+        # All but the first temporary are served from the freelist
+        assert after.hits - before.hits >= 998, (before, after)
+
+        # Large blocks, and blocks resized by realloc
+        big = make(3, 100000)
+        assert [x[-1] for x in big] == [0, 1, 2]
+        assert grow(100000) == 100000 * 99999 // 2
+
+        # Arrays allocated by other threads and freed by this one
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(make(50, 8)))
+                   for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for arrs in results:
+            assert [x[0] for x in arrs] == list(range(50))
+        del results, arrs, big
+
+        stats = rtsys.get_allocation_stats()
+        assert stats.alloc == stats.free, stats
+        assert stats.mi_alloc == stats.mi_free, stats
+        """
+        env = os.environ.copy()
+        env['NUMBA_NRT_POOL_ALLOCATOR'] = "1"
+        env['NUMBA_NRT_STATS'] = "1"
+        run_in_subprocess(src, env=env)
+
+    def test_pool_allocator_config(self):
+        self.assertEqual(_nrt_python.memsys_pool_allocator_enabled(),
+                         bool(config.NRT_POOL_ALLOCATOR))
+
+
+class TestNrtAllocationSites(TestCase):
+
+    def test_allocation_sites(self):
+        from numba.misc.alloc_profiler import AllocationProfiler
+
+        @njit(line_profile=True)
+        def foo(a, n):
+            keep = []
+            for i in range(n):
+                t = a.copy()
+                keep.append(np.empty(4))
+            return t, keep
+
+        a = np.ones(100)
+        foo(a, 1)
+        with AllocationProfiler() as prof:
+            res = foo(a, 10)
+        stats = prof.get_stats()
+
+        code = foo.py_func.__code__
+        temp_site = (code.co_filename, code.co_firstlineno + 4)
+        kept_site = (code.co_filename, code.co_firstlineno + 5)
+        # The copies are freed as the loop iterates, one of them is
+        # returned
+        self.assertEqual(stats[temp_site].count, 10)
+        self.assertEqual(stats[temp_site].bytes, 10 * a.nbytes)
+        self.assertEqual(stats[temp_site].live, a.nbytes)
+        self.assertEqual(stats[temp_site].peak, 2 * a.nbytes)
+        # The small arrays are kept alive by the returned list
+        self.assertEqual(stats[kept_site].count, 10)
+        self.assertEqual(stats[kept_site].live, 10 * 4 * 8)
+        self.assertEqual(prof.dropped, 0)
+        del res
+
+    def test_already_running(self):
+        from numba.misc.alloc_profiler import AllocationProfiler
+
+        with AllocationProfiler():
+            with self.assertRaises(RuntimeError):
+                AllocationProfiler().start()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -10,7 +10,8 @@ import numpy as np
 import unittest
 from numba import njit
 from numba.core.runtime import rtsys
-from numba.tests.support import TestCase, EnableNRTStatsMixin
+from numba.tests.support import (TestCase, EnableNRTStatsMixin,
+                                 override_config)
 
 
 class TestNrtRefCt(EnableNRTStatsMixin, TestCase):
@@ -33,7 +34,9 @@ class TestNrtRefCt(EnableNRTStatsMixin, TestCase):
 
         n = 10
         init_stats = rtsys.get_allocation_stats()
-        foo(n)
+        # The temporary array would otherwise be allocated on the stack
+        with override_config('STACK_ARRAY_MAX_BYTES', 0):
+            foo(n)
         cur_stats = rtsys.get_allocation_stats()
         self.assertEqual(cur_stats.alloc - init_stats.alloc, n)
         self.assertEqual(cur_stats.free - init_stats.free, n)
@@ -1483,6 +1483,45 @@ class TestStaticPower(TestCase):
 
         self._check_pow(exponents, vals)
 
+class TestCDivision(TestCase):
+    """
+    Test integer division and modulo with the cdivision option.
+    """
+
+    @staticmethod
+    def divmod_usecase(x, y):
+        return x // y, x % y, divmod(x, y)
+
+    def test_signed(self):
+        cfunc = njit(cdivision=True)(self.divmod_usecase)
+        for x, y in itertools.product([7, -7, 0, 12], [2, -2, 5, -12]):
+            # C truncates the quotient towards zero
+            q = int(x / y)
+            r = x - q * y
+            self.assertEqual(cfunc(x, y), (q, r, (q, r)))
+        # The Python semantics are used by default
+        pyfunc = self.divmod_usecase
+        self.assertEqual(njit(pyfunc)(-7, 2), pyfunc(-7, 2))
+
+    def test_unsigned(self):
+        cfunc = njit(cdivision=True)(self.divmod_usecase)
+        x, y = np.uint32(7), np.uint32(2)
+        self.assertPreciseEqual(cfunc(x, y), self.divmod_usecase(x, y))
+
+    def test_not_inherited(self):
+        # The functions called by a function compiled with cdivision use
+        # the Python semantics
+        @njit
+        def callee(x, y):
+            return x % y
+
+        @njit(cdivision=True)
+        def caller(x, y):
+            return x % y, callee(x, y)
+
+        self.assertEqual(caller(-7, 2), (-1, 1))
+
+
 class TestStringConstComparison(TestCase):
     """
     Test comparison of string constants
@@ -0,0 +1,70 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+from numba import njit
+from numba.tests.support import TestCase, override_config
+from numba.misc import perf_map
+
+
+def read_entries(path, offset):
+    with open(path) as fin:
+        fin.seek(offset)
+        lines = fin.read().splitlines()
+    entries = []
+    for line in lines:
+        addr, size, name = line.split(" ", 2)
+        entries.append(perf_map.PerfMapEntry(int(addr, 16), int(size, 16),
+                                             name))
+    return entries
+
+
+@unittest.skipUnless(sys.platform.startswith('linux'), "Linux only")
+class TestPerfMap(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.path = perf_map.perf_map_path()
+        try:
+            self.offset = os.path.getsize(self.path)
+        except FileNotFoundError:
+            self.offset = 0
+
+    def test_entries(self):
+        @njit
+        def foo(a):
+            return a.sum()
+
+        with override_config('PERF_MAP', 1):
+            foo(np.arange(3.0))
+
+        entries = read_entries(self.path, self.offset)
+        by_name = {e.name: e for e in entries}
+        desc = __name__ + ".TestPerfMap.test_entries.<locals>.foo"
+        desc += "(array(float64, 1d, C))"
+        self.assertIn(desc, by_name)
+        self.assertIn(desc + " [cpython wrapper]", by_name)
+        cres = foo.overloads[foo.signatures[0]]
+        addr = cres.library.get_pointer_to_function(
+            cres.fndesc.llvm_func_name)
+        self.assertEqual(by_name[desc].address, addr)
+        self.assertGreater(by_name[desc].size, 0)
+
+    def test_disabled(self):
+        @njit
+        def foo(x):
+            return x + 1
+
+        foo(1)
+        if os.path.exists(self.path):
+            self.assertEqual(read_entries(self.path, self.offset), [])
+
+    def test_elf_function_symbols(self):
+        # Not an ELF file
+        self.assertEqual(list(perf_map.elf_function_symbols(b"\0" * 64)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
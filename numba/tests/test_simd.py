@@ -0,0 +1,245 @@
+"""
+Tests for the explicit SIMD vectors of numba.simd.
+"""
+
+import numpy as np
+
+from numba import njit, simd, types
+from numba.core import errors
+from numba.simd import (boolx4, float32x8, float64x4, int32x8, int64x4,
+                        uint8x16)
+from numba.tests.support import TestCase
+import unittest
+
+
+def axpy(a, x, y):
+    n = x.size - x.size % 8
+    for i in range(0, n, 8):
+        v = simd.load(float32x8, x, i)
+        w = simd.load(float32x8, y, i)
+        simd.store(y, i, a * v + w)
+    # The remaining items are handled with masks
+    lanes = int32x8(0, 1, 2, 3, 4, 5, 6, 7)
+    mask = lanes < x.size - n
+    v = simd.masked_load(float32x8, x, n, mask)
+    w = simd.masked_load(float32x8, y, n, mask)
+    simd.masked_store(y, n, a * v + w, mask)
+
+
+@njit
+def to_array(vec, out):
+    simd.store(out, 0, vec)
+    return out
+
+
+class TestSIMD(TestCase):
+
+    def test_vector_types(self):
+        self.assertIs(simd.float32x8, types.SIMDVector(types.float32, 8))
+        self.assertIs(simd.vector_type(np.int64, 4), int64x4)
+        self.assertIs(simd.vector_type(types.boolean, 4), boolx4)
+        self.assertEqual(str(uint8x16), "uint8x16")
+        with self.assertRaises(TypeError):
+            simd.vector_type(np.complex128, 2)
+        with self.assertRaises(ValueError):
+            simd.vector_type(np.float32, 3)
+
+    def test_constructors(self):
+        @njit
+        def build(out):
+            to_array(float64x4(1.5), out[0])
+            to_array(float64x4(1, 2, 3.5, True), out[1])
+            to_array(float64x4(int64x4(-2)), out[2])
+            to_array(float64x4(float64x4(3) > 2), out[3])
+            return out
+
+        expected = np.array([[1.5] * 4, [1, 2, 3.5, 1], [-2] * 4, [1] * 4])
+        self.assertPreciseEqual(build(np.zeros((4, 4))), expected)
+
+        @njit
+        def convert(x, out):
+            v = simd.load(float64x4, x, 0)
+            return to_array(int32x8(v, v, v, v, v, v, v, v) > 0, out)
+
+        with self.assertRaises(errors.TypingError):
+            convert(np.ones(4), np.zeros(8, np.bool_))
+
+    def test_arithmetic(self):
+        @njit
+        def ops(x, y, out):
+            a = simd.load(float64x4, x, 0)
+            b = simd.load(float64x4, y, 0)
+            to_array(a + b, out[0])
+            to_array(a - 1, out[1])
+            to_array(2 * a, out[2])
+            to_array(a / b, out[3])
+            to_array(-a, out[4])
+            a += b
+            to_array(a, out[5])
+            return out
+
+        x = np.array([1., -2., 3.5, 0.])
+        y = np.array([2., 4., -1., 3.])
+        expected = np.array([x + y, x - 1, 2 * x, x / y, -x, x + y])
+        self.assertPreciseEqual(ops(x, y, np.zeros((6, 4))), expected)
+
+        @njit
+        def intops(x, out):
+            a = simd.load(int64x4, x, 0)
+            to_array(a * 3 - a, out[0])
+            to_array((a & 6) | 1, out[1])
+            to_array(a ^ ~a, out[2])
+            to_array(a << 2, out[3])
+            to_array(a >> 1, out[4])
+            return out
+
+        x = np.array([1, -2, 7, 0])
+        expected = np.array([x * 3 - x, (x & 6) | 1, x ^ ~x, x << 2,
+                             x >> 1])
+        self.assertPreciseEqual(intops(x, np.zeros((5, 4), np.int64)),
+                                expected)
+
+        @njit
+        def truediv(x):
+            return simd.load(int64x4, x, 0) / 2
+
+        with self.assertRaises(errors.TypingError):
+            truediv(x)
+
+    def test_comparisons_and_select(self):
+        @njit
+        def compare(x, y, out, masks):
+            a = simd.load(float64x4, x, 0)
+            b = simd.load(float64x4, y, 0)
+            to_array(a < b, masks[0])
+            to_array(a != b, masks[1])
+            to_array(a >= 1, masks[2])
+            to_array((a < b) & (a > 0), masks[3])
+            to_array(simd.select(a < b, a, b), out[0])
+            to_array(simd.select(a < b, 0, a), out[1])
+            return out, masks
+
+        x = np.array([1., np.nan, 3., -4.])
+        y = np.array([2., 1., 3., -5.])
+        out, masks = compare(x, y, np.zeros((2, 4)),
+                             np.zeros((4, 4), np.bool_))
+        self.assertPreciseEqual(masks, np.array([x < y, x != y, x >= 1,
+                                                 (x < y) & (x > 0)]))
+        self.assertPreciseEqual(out, np.array([np.where(x < y, x, y),
+                                               np.where(x < y, 0, x)]))
+
+    def test_load_store(self):
+        cfunc = njit(axpy)
+        for n in (0, 5, 8, 21):
+            x = np.arange(n, dtype=np.float32)
+            y = np.ones(n + 3, dtype=np.float32)
+            expected = y.copy()
+            expected[:n] += 2 * x
+            cfunc(np.float32(2), x, y[:n])
+            # The items past the end are untouched
+            self.assertPreciseEqual(y, expected)
+
+    def test_load_store_errors(self):
+        @njit(boundscheck=True)
+        def load(x, i):
+            return simd.load(float64x4, x, i)[0]
+
+        self.assertEqual(load(np.arange(8.), 4), 4.)
+        with self.assertRaises(IndexError):
+            load(np.arange(8.), 5)
+        with self.assertRaises(IndexError):
+            load(np.arange(8.), -1)
+        # The dtype must match and the array must be contiguous
+        with self.assertRaises(errors.TypingError):
+            load(np.arange(8, dtype=np.float32), 0)
+        with self.assertRaises(errors.TypingError):
+            load(np.arange(16.)[::2], 0)
+
+    def test_gather(self):
+        @njit
+        def gather(x, idx, out):
+            return to_array(simd.gather(x, simd.load(int64x4, idx, 0)), out)
+
+        x = np.arange(10.) * 2
+        idx = np.array([9, 0, -1, 4])
+        self.assertPreciseEqual(gather(x, idx, np.zeros(4)), x[idx])
+        self.assertPreciseEqual(gather(x[::3], idx % 4, np.zeros(4)),
+                                x[::3][idx % 4])
+
+    def test_shuffle(self):
+        @njit
+        def shuffle(x, y, out):
+            a = simd.load(int64x4, x, 0)
+            b = simd.load(int64x4, y, 0)
+            to_array(simd.shuffle(a, b, (7, 0, 5, 2)), out[0])
+            to_array(simd.shuffle(a, a, (3, 2, 1, 0)), out[1])
+            # Taking half of the lanes
+            half = simd.shuffle(a, b, (4, -1))
+            out[2, 0] = half[0]
+            out[2, 1] = half[1]
+            return out
+
+        x = np.arange(4)
+        y = np.arange(4) + 10
+        expected = np.array([[13, 0, 11, 2], [3, 2, 1, 0], [10, 13, 0, 0]])
+        out = shuffle(x, y, np.zeros((3, 4), np.int64))
+        self.assertPreciseEqual(out, expected)
+
+    def test_reductions(self):
+        @njit
+        def reduce(x, i):
+            v = simd.load(int64x4, x, 0)
+            m = v > i
+            return (simd.reduce_add(v), simd.reduce_mul(v),
+                    simd.reduce_min(v), simd.reduce_max(v),
+                    simd.reduce_and(v), simd.reduce_or(v),
+                    simd.reduce_and(m), simd.reduce_or(m))
+
+        x = np.array([3, -2, 7, 5])
+        expected = (13, -210, -2, 7, 3 & -2 & 7 & 5, 3 | -2 | 7 | 5)
+        self.assertEqual(reduce(x, -3), expected + (True, True))
+        self.assertEqual(reduce(x, 3), expected + (False, True))
+        self.assertEqual(reduce(x, 7), expected + (False, False))
+
+        @njit
+        def freduce(x):
+            v = simd.load(float32x8, x, 0)
+            return (simd.reduce_add(v), simd.reduce_mul(v),
+                    simd.reduce_min(v), simd.reduce_max(v))
+
+        x = np.array([1.5, -2, 4, 8, 0.5, 1, -1, 3], dtype=np.float32)
+        self.assertEqual(freduce(x), (x.sum(), x.prod(), x.min(), x.max()))
+
+    def test_getitem(self):
+        @njit
+        def getitem(i):
+            v = int64x4(10, 11, 12, 13)
+            return v[i], len(v)
+
+        self.assertEqual(getitem(1), (11, 4))
+        self.assertEqual(getitem(-1), (13, 4))
+
+    def test_vector_code(self):
+        cfunc = njit(axpy)
+        cfunc(np.float32(2), np.ones(8, np.float32), np.ones(8, np.float32))
+        ir = cfunc.inspect_llvm(cfunc.signatures[0])
+        self.assertIn('fmul <8 x float>', ir)
+        self.assertIn('@llvm.masked.load.v8f32', ir)
+        self.assertIn('@llvm.masked.store.v8f32', ir)
+
+        # The shuffles with constant indices are single instructions
+        @njit
+        def reverse(x):
+            v = simd.load(int64x4, x, 0)
+            simd.store(x, 0, simd.shuffle(v, v, (3, 2, 1, 0)))
+
+        x = np.arange(4)
+        reverse(x)
+        self.assertPreciseEqual(x, np.arange(4)[::-1].copy())
+        ir = reverse.inspect_llvm(reverse.signatures[0])
+        self.assertIn('shufflevector', ir)
+        self.assertNotIn('extractelement', ir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+"""
+Tests for the stack allocation of small non-escaping arrays.
+"""
+
+import gc
+
+import numpy as np
+
+from numba import njit, typed
+from numba.core import config
+from numba.core.runtime import rtsys
+from numba.tests.support import (TestCase, EnableNRTStatsMixin,
+                                 override_config)
+import unittest
+
+
+def cross_sum(pts):
+    s = 0.0
+    for i in range(pts.shape[0] - 1):
+        a = np.empty(3)
+        b = np.empty(3)
+        for k in range(3):
+            a[k] = pts[i, k]
+            b[k] = pts[i + 1, k]
+        c = np.zeros(3)
+        c[0] = a[1] * b[2] - a[2] * b[1]
+        c[1] = a[2] * b[0] - a[0] * b[2]
+        c[2] = a[0] * b[1] - a[1] * b[0]
+        s += c.sum()
+    return s
+
+
+def fill_matrices(n):
+    s = 0.0
+    for i in range(n):
+        m = np.zeros((4, 4), dtype=np.int32)
+        ones = np.ones(4)
+        for j in range(4):
+            m[j, j] = i + j
+        row = m[1]
+        s += row.sum() + ones[i % 4] + m.T[2, 2]
+    return s
+
+
+def return_array():
+    a = np.zeros(3)
+    a[1] = 2
+    return a
+
+
+def return_view():
+    a = np.ones((2, 3))
+    return a[1]
+
+
+def return_in_tuple():
+    a = np.zeros(3)
+    return (a, 1)
+
+
+def loop_carried(n):
+    prev = np.zeros(2)
+    for i in range(n):
+        cur = np.zeros(2)
+        cur[0] = prev[0] + 1
+        cur[1] = prev[1] + i
+        prev = cur
+    return prev[0] + prev[1]
+
+
+def store_in_list(n):
+    lst = typed.List()
+    for i in range(n):
+        a = np.zeros(2)
+        a[0] = i
+        lst.append(a)
+    return lst[0][0] + lst[n - 1][0]
+
+
+def store_in_array(n):
+    out = np.empty((n, 2))
+    for i in range(n):
+        a = np.ones(2)
+        a[1] = i
+        out[i] = a
+    return out
+
+
+def fresh_result(n):
+    s = np.zeros(3)
+    for i in range(n):
+        a = np.ones(3)
+        b = a * i
+        s += b
+    return s
+
+
+def large_array():
+    a = np.zeros(100000)
+    return a.sum()
+
+
+class TestStackArrays(EnableNRTStatsMixin, TestCase):
+
+    def setUp(self):
+        # Clean up any NRT-backed objects hanging in a dead reference cycle
+        gc.collect()
+        super(TestStackArrays, self).setUp()
+
+    def count_allocations(self, cfunc, *args):
+        init_stats = rtsys.get_allocation_stats()
+        result = cfunc(*args)
+        del result
+        cur_stats = rtsys.get_allocation_stats()
+        alloc = cur_stats.alloc - init_stats.alloc
+        self.assertEqual(alloc, cur_stats.free - init_stats.free)
+        return alloc
+
+    def check(self, pyfunc, *args, **kwargs):
+        allocs = kwargs.pop("allocs")
+        cfunc = njit(pyfunc)
+        self.assertPreciseEqual(cfunc(*args), pyfunc(*args))
+        self.assertEqual(self.count_allocations(cfunc, *args), allocs)
+
+    def test_no_allocation(self):
+        pts = np.arange(30.0).reshape((10, 3)) % 7
+        # The only allocation is made by unboxing the argument
+        self.check(cross_sum, pts, allocs=1)
+        self.check(fill_matrices, 5, allocs=0)
+
+    def test_escaping(self):
+        self.check(return_array, allocs=1)
+        self.check(return_view, allocs=1)
+        self.check(return_in_tuple, allocs=1)
+        cfunc = njit(store_in_list)
+        self.assertEqual(cfunc(10), 9.0)
+        self.check(store_in_array, 4, allocs=1)
+
+    def test_loop_carried(self):
+        # The initial array is on the stack, the ones created in the loop
+        # are not as the previous one is live when the next one is created
+        self.check(loop_carried, 5, allocs=5)
+
+    def test_fresh_result(self):
+        # The results of array operators do not alias their operands: the
+        # result of the loop is on the heap, as is the one of a * i (whose
+        # buffer is reused across iterations)
+        self.check(fresh_result, 4, allocs=2)
+
+    def test_size_limit(self):
+        self.check(large_array, allocs=1)
+        with override_config('STACK_ARRAY_MAX_BYTES', 0):
+            self.check(cross_sum, np.ones((3, 3)), allocs=1 + 3 * 2)
+
+    def test_config_default(self):
+        self.assertGreater(config.STACK_ARRAY_MAX_BYTES, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
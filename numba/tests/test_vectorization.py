@@ -82,6 +82,29 @@ class TestVectorization(TestCase):
         self.assertIn("vector.body", llvm_ir)
         self.assertIn("llvm.loop.isvectorized", llvm_ir)
 
+    @TestCase.run_test_in_subprocess(envvars=_skylake_env)
+    def test_any_layout_loop(self):
+        # Loops over non-contiguous arrays are versioned for unit strides,
+        # the contiguous version is vectorized
+        def axpy(a, x, y):
+            for i in range(x.shape[0]):
+                y[i] += a * x[i]
+
+        arrty = types.float64[:]
+        llvm_ir = self.gen_ir(axpy, (types.float64, arrty, arrty))
+        self.assertIn("vector.body", llvm_ir)
+        self.assertIn("llvm.loop.isvectorized", llvm_ir)
+
+        cfunc = njit((types.float64, arrty, arrty))(axpy)
+        x = np.arange(20.)
+        for xs, ys in [(x[:10], np.ones(10)),
+                       (x[::2], np.ones(10)),
+                       (x[::-2], np.ones(20)[::2])]:
+            expected = ys.copy()
+            axpy(3., xs, expected)
+            cfunc(3., xs, ys)
+            np.testing.assert_equal(ys, expected)
+
 
 if __name__ == '__main__':
     unittest.main()
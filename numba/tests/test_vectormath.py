@@ -0,0 +1,141 @@
+import math
+
+import numpy as np
+
+from numba import njit
+from numba.core import config
+from numba.tests.support import TestCase
+import unittest
+
+
+def loop_exp(x, out):
+    for i in range(x.size):
+        out[i] = math.exp(x[i])
+
+
+def loop_log(x, out):
+    for i in range(x.size):
+        out[i] = math.log(x[i])
+
+
+def loop_sin(x, out):
+    for i in range(x.size):
+        out[i] = math.sin(x[i])
+
+
+def loop_cos(x, out):
+    for i in range(x.size):
+        out[i] = math.cos(x[i])
+
+
+def loop_pow(x, y, out):
+    for i in range(x.size):
+        out[i] = x[i] ** y[i]
+
+
+@unittest.skipIf(config.USING_SVML, "vectorized calls are mapped to SVML")
+class TestVectorMath(TestCase):
+    """
+    Tests for the vector implementations of the math functions used in the
+    vectorized loops compiled with fastmath.
+    """
+
+    # The maximum errors in ulps, as documented in numba.core.vectormath
+    max_ulps = {
+        ('exp', np.float64): 1, ('exp', np.float32): 1,
+        ('log', np.float64): 1, ('log', np.float32): 1,
+        ('sin', np.float64): 2, ('sin', np.float32): 1,
+        ('cos', np.float64): 2, ('cos', np.float32): 1,
+        ('pow', np.float32): 1,
+    }
+
+    def special_values(self, dtype):
+        tiny = np.finfo(dtype).smallest_subnormal
+        huge = np.finfo(dtype).max
+        return np.array([0.0, -0.0, np.inf, -np.inf, np.nan, 1.0, -1.0,
+                         tiny, huge, 2e6], dtype=dtype)
+
+    def check_ulps(self, got, expected, dtype, max_ulps):
+        # The expected values are computed in a wider type
+        with np.errstate(all='ignore'):
+            rounded = expected.astype(dtype)
+            same = (got == rounded) | (np.isnan(got) & np.isnan(rounded))
+            ulps = (np.abs(got.astype(expected.dtype) - expected)
+                    / np.spacing(np.abs(rounded)).astype(expected.dtype))
+        bad = ~same & ~(ulps <= max_ulps)
+        self.assertFalse(bad.any(),
+                         msg="inputs %s give %s instead of %s"
+                         % (np.flatnonzero(bad)[:5], got[bad][:5],
+                            expected[bad][:5]))
+
+    def check_unary(self, name, dtype, x):
+        pyfunc = globals()['loop_%s' % name]
+        cfunc = njit(fastmath=True)(pyfunc)
+        x = np.concatenate([x.astype(dtype), self.special_values(dtype)])
+        got = np.empty_like(x)
+        cfunc(x, got)
+        llvm_ir = cfunc.inspect_llvm(cfunc.signatures[0])
+        self.assertIn('numba.vectormath.%s' % name, llvm_ir)
+
+        wide = np.longdouble if dtype == np.float64 else np.float64
+        with np.errstate(all='ignore'):
+            expected = getattr(np, name)(x.astype(wide))
+        self.check_ulps(got, expected, dtype, self.max_ulps[name, dtype])
+
+    def test_exp(self):
+        rng = np.random.default_rng(0)
+        self.check_unary('exp', np.float64, rng.uniform(-750, 750, 10000))
+        self.check_unary('exp', np.float32, rng.uniform(-105, 90, 10000))
+
+    def test_log(self):
+        rng = np.random.default_rng(1)
+        self.check_unary('log', np.float64,
+                         np.exp(rng.uniform(-740, 709, 10000)))
+        self.check_unary('log', np.float32,
+                         np.exp(rng.uniform(-103, 88, 10000)))
+
+    def test_sin(self):
+        rng = np.random.default_rng(2)
+        for dtype in (np.float64, np.float32):
+            self.check_unary('sin', dtype, rng.uniform(-1e4, 1e4, 10000))
+
+    def test_cos(self):
+        rng = np.random.default_rng(3)
+        for dtype in (np.float64, np.float32):
+            self.check_unary('cos', dtype, rng.uniform(-1e4, 1e4, 10000))
+
+    def test_pow(self):
+        rng = np.random.default_rng(4)
+        x = rng.uniform(0, 10, 10000).astype(np.float32)
+        y = rng.uniform(-30, 30, 10000).astype(np.float32)
+        special_x = [0.0, -0.0, 1.0, -1.0, -1.0, -2.0, -2.0, -2.0, np.inf,
+                     -np.inf, -np.inf, np.nan, 2.0, np.nan, -8.0, -0.0, 0.5]
+        special_y = [-1.0, -3.0, np.nan, np.inf, -np.inf, 3.0, 2.0, 0.5,
+                     -2.0, 3.0, 0.5, 0.0, np.nan, 2.0, 1 / 3, -1.0, np.inf]
+        x = np.concatenate([x, np.array(special_x, dtype=np.float32)])
+        y = np.concatenate([y, np.array(special_y, dtype=np.float32)])
+        got = np.empty_like(x)
+        cfunc = njit(fastmath=True)(loop_pow)
+        cfunc(x, y, got)
+        llvm_ir = cfunc.inspect_llvm(cfunc.signatures[0])
+        self.assertIn('numba.vectormath.pow', llvm_ir)
+
+        with np.errstate(all='ignore'):
+            expected = np.power(x.astype(np.float64), y.astype(np.float64))
+        self.check_ulps(got, expected, np.float32,
+                        self.max_ulps['pow', np.float32])
+
+    def test_not_fastmath(self):
+        # Without the approximate function flag, the vectorized calls are
+        # left to the C library
+        cfunc = njit(loop_exp)
+        x = np.linspace(-10, 10, 100)
+        got = np.empty_like(x)
+        cfunc(x, got)
+        np.testing.assert_allclose(got, np.exp(x), rtol=1e-15)
+        llvm_ir = cfunc.inspect_llvm(cfunc.signatures[0])
+        self.assertNotIn('numba.vectormath', llvm_ir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -176,6 +176,7 @@ def get_ext_modules():
                                        "numba/_helperlib.c",
                                        "numba/_lapack.c",
                                        "numba/_random.c",
+                                       "numba/_lineprof.c",
                                        "numba/mathnames.inc",
                                        ],
                               **np_compile_args)